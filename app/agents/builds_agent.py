@@ -10,14 +10,17 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.prebuilt import create_react_agent
 from dotenv import load_dotenv
 
-from app.config import settings
+from app.config import get_prompt_token_budget, settings
 from app.utils.callbacks import ToolCallLogger
-from app.utils.formatters import format_match_for_llm
+from app.utils.token_budget import PromptBudget
+from app.utils.match_encoding import encode_match, match_aliases
 # Import the MCP functions
-from app.mcp.builds_mcp import get_champion_build, get_champion_stats
+from app.mcp.builds_mcp import get_champion_build, get_champion_stats, get_champions_builds
 
 load_dotenv()
 
+MODEL_NAME = "gemini-2.0-flash"
+
 # Set up logging
 logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -64,11 +67,29 @@ async def champion_stats_tool(champion: str) -> str:
     """
     return await get_champion_stats(champion)
 
+@tool
+async def champion_builds_batch_tool(champions: List[str], include: str = "both") -> str:
+    """Get OP.GG builds and meta statistics for several champions in one call.
+    
+    Prefer this over calling champion_build_tool / champion_stats_tool once per
+    champion, e.g. to look up the player's champion and all five enemies at once.
+    Champions are fetched concurrently; any that fail are reported with an error
+    line while the rest are still returned.
+    
+    Args:
+        champions: Champion names (e.g. ["jinx", "thresh", "lux"]), up to 10
+        include: "both" (default), "build" or "stats"
+    
+    Returns:
+        One section per champion with its build and/or statistics.
+    """
+    return await get_champions_builds(champions, include=include)
+
 class BuildsAgent:
     def __init__(self):
         # Initialize core components
         self.agent = None
-        self.tools = [champion_build_tool, champion_stats_tool]
+        self.tools = [champion_build_tool, champion_stats_tool, champion_builds_batch_tool]
         self.is_connected = False
         self.message_queue = queue.Queue()
         
@@ -79,7 +100,7 @@ class BuildsAgent:
         
         # Initialize LangChain model with Google Gemini
         self.model = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
+            model=MODEL_NAME,
             temperature=0,
             google_api_key=settings.gemini_api_key
         )
@@ -117,13 +138,14 @@ class BuildsAgent:
             match_to_use = match if match is not None else self.get_current_match()
             
             if match_to_use:
-                formatted_match = format_match_for_llm(match_to_use)
+                encoded_match = encode_match(match_to_use)
+                match_aliases.set(encoded_match.aliases)
                 enhanced_query = f"""CURRENT MATCH CONTEXT:
-{formatted_match}
+{encoded_match.text}
 
 USER QUERY: {query}
 
-Please analyze the above match context and recommend an optimal 6-item build for the player marked as (YOU). Consider the team compositions, enemy champions, and game situation when making your recommendation."""
+Please analyze the above match context and recommend an optimal 6-item build for the user's player. Consider the team compositions, enemy champions, and game situation when making your recommendation."""
             
             # Add the current query
             if not input_messages or input_messages[-1].content != enhanced_query:
@@ -181,6 +203,7 @@ You have access to real-time tools to check current best performing builds and d
 Available Tools:
 - champion_build_tool: Get detailed build information including core items, boots, situational items, build order, and win rates
 - champion_stats_tool: Get champion statistics including tier ranking, win rate, pick rate, ban rate, and patch information
+- champion_builds_batch_tool: Get builds and statistics for several champions at once (e.g. the player's champion and all enemies)
 
 Given the match context and current meta builds, you will need to recommend a 6 item build for the player. Include boots unless the champion does not need them.
 
@@ -212,6 +235,7 @@ Given the match context and current meta builds, you will need to recommend a 6
    - Consider early, mid, and late game priorities
 
 5. **Tool Usage:**
+   - Use champion_builds_batch_tool once to get builds and stats for the player's champion and the enemy champions together
    - Use champion_build_tool to get current meta builds for the player's champion
    - Use champion_stats_tool to check champion performance and tier rankings
    - Use tools for enemy champions to understand threats and counter-build accordingly
@@ -222,7 +246,10 @@ Always provide clear reasoning for your build recommendations, use the available
         self.agent = create_react_agent(
             model=self.model,
             tools=self.tools,  # Now includes champion build and stats tools
-            prompt=system_prompt,
+            # Every model call is measured and trimmed to the model's prompt token budget
+            prompt=PromptBudget(
+                "builds", get_prompt_token_budget(MODEL_NAME), settings.TOOL_RESULT_MAX_TOKENS
+            ).prompt(system_prompt),
             debug=True
         )
 
@@ -240,7 +267,7 @@ Always provide clear reasoning for your build recommendations, use the available
         
         return {
             "status": "✅ **Connected** - Builds Agent ready",
-            "tools": "OP.GG Integration: champion_build_tool, champion_stats_tool",
+            "tools": "OP.GG Integration: champion_build_tool, champion_stats_tool, champion_builds_batch_tool",
             "capabilities": """**Current Capabilities:**
             - Real-time champion build data from OP.GG
             - Champion statistics and meta analysis
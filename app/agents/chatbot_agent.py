@@ -5,20 +5,29 @@ import threading
 import queue
 
 from langchain_mcp_adapters.client import MultiServerMCPClient
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
 from langchain_core.tools import tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.prebuilt import create_react_agent
+from langgraph.prebuilt.chat_agent_executor import AgentState
 from dotenv import load_dotenv
 
-from app.config import settings
+from app.config import get_prompt_token_budget, settings
+from app.mcp.resource_cache import ResourceCache, ResourceNotFoundError, find_resource_uri
+from app.mcp.session_pool import MCPSessionPool
 from app.utils.callbacks import ToolCallLogger
-from app.utils.formatters import format_match_for_llm, match_data
+from app.utils.token_budget import PromptBudget
+from app.utils.checkpointer import SQLiteCheckpointSaver
+from app.utils.formatters import match_data
+from app.utils.match_encoding import encode_match, match_aliases
 # Import the MCP functions for builds
-from app.mcp.builds_mcp import get_champion_build, get_champion_stats
+from app.mcp.builds_mcp import get_champion_build, get_champion_stats, get_champions_builds
 
 load_dotenv()  # load environment variables from .env
 
+MODEL_NAME = "gemini-2.0-flash"
+
 # Set up logging - only show warnings and errors by default
 logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -26,6 +35,12 @@ logger = logging.getLogger(__name__)
 # Set specific loggers to show important info
 logging.getLogger(__name__).setLevel(logging.INFO)  # Allow INFO for our important logs
 
+class ChatbotState(AgentState):
+    """Graph state of the chatbot agent, checkpointed per thread."""
+    # Player alias -> PUUID map of the match the thread is about, so a resumed
+    # thread resolves the aliases in its messages on any worker
+    match_aliases: Dict[str, str]
+
 # Create LangChain tool wrappers for the builds MCP functions
 @tool
 async def champion_build_tool(champion: str) -> str:
@@ -67,10 +82,31 @@ async def champion_stats_tool(champion: str) -> str:
     """
     return await get_champion_stats(champion)
 
+@tool
+async def champion_builds_batch_tool(champions: List[str], include: str = "both") -> str:
+    """Get OP.GG builds and meta statistics for several champions in one call.
+    
+    Prefer this over calling champion_build_tool / champion_stats_tool once per
+    champion, e.g. to look up the player's champion and all five enemies at once.
+    Champions are fetched concurrently; any that fail are reported with an error
+    line while the rest are still returned.
+    
+    Args:
+        champions: Champion names (e.g. ["jinx", "thresh", "lux"]), up to 10
+        include: "both" (default), "build" or "stats"
+    
+    Returns:
+        One section per champion with its build and/or statistics.
+    """
+    return await get_champions_builds(champions, include=include)
+
 class ChatbotAgent:
     def __init__(self):
         # Initialize client objects
         self.mcp_client: Optional[MultiServerMCPClient] = None
+        self.session_pool: Optional[MCPSessionPool] = None
+        self.checkpointer: Optional[SQLiteCheckpointSaver] = None
+        self.resource_cache: Optional[ResourceCache] = None
         self.agent = None
         self.tools = []
         self.resources = []
@@ -85,7 +121,7 @@ class ChatbotAgent:
         
         # Initialize LangChain model with Google Gemini
         self.model = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
+            model=MODEL_NAME,
             temperature=0,
             google_api_key=settings.gemini_api_key
         )
@@ -97,12 +133,40 @@ class ChatbotAgent:
         """Get the default/constant match data for testing purposes"""
         return match_data
     
-    async def process_query_async(self, query: str, history: List[Dict] = None, match: Dict = None) -> str:
-        """Process a League-related query using LangChain ReAct agent with Gemini"""
+    async def process_query_async(
+        self,
+        query: str,
+        history: List[Dict] = None,
+        match: Dict = None,
+        callback_handler: Optional[BaseCallbackHandler] = None,
+        thread_id: Optional[str] = None
+    ) -> str:
+        """Process a League-related query using LangChain ReAct agent with Gemini
+        
+        Events of the run are published through ``callback_handler``; callers
+        serving concurrent requests pass a handler bound to their own channel.
+        The shared ``self.callback_handler`` is used otherwise (CLI path).
+        
+        With a checkpointer and a ``thread_id``, the thread's earlier messages
+        come from the checkpointed graph state, so only the new query is sent
+        and ``history`` is ignored.
+        """
         if not self.agent:
             return "❌ Agent not initialized. Please connect to the MCP server first."
         
         try:
+            config = {"callbacks": [callback_handler or self.callback_handler]}
+            resuming = False
+            aliases: Dict[str, str] = {}
+            if self.checkpointer is not None and thread_id:
+                config["configurable"] = {"thread_id": thread_id}
+                state = (await self.agent.aget_state(config)).values
+                resuming = bool(state)
+                history = None
+                if resuming:
+                    aliases = state.get("match_aliases") or {}
+                    await self._close_dangling_tool_calls(config, state.get("messages", []))
+            
             # Convert history to LangChain messages
             input_messages = []
             
@@ -130,14 +194,22 @@ class ChatbotAgent:
                     elif role == "assistant":
                         input_messages.append(AIMessage(content=content))
             
-            # Prepare the query with match context (use default if none provided)
+            # Prepare the query with match context (use default if none provided);
+            # a resumed thread already has it unless the client sends a match
             enhanced_query = query
-            match_to_use = match if match is not None else self.get_default_match_data()
+            agent_input = {}
+            if resuming:
+                match_to_use = match
+            else:
+                match_to_use = match if match is not None else self.get_default_match_data()
             
             if match_to_use:
-                formatted_match = format_match_for_llm(match_to_use)
+                encoded_match = encode_match(match_to_use)
+                aliases = encoded_match.aliases
+                # Checkpointed with the thread's state
+                agent_input["match_aliases"] = aliases
                 enhanced_query = f"""CURRENT MATCH CONTEXT:
-{formatted_match}
+{encoded_match.text}
 
 USER QUERY: {query}
 
@@ -147,12 +219,22 @@ Please analyze the above match context and respond to the user's query with rele
             if not input_messages or input_messages[-1].content != enhanced_query:
                 input_messages.append(HumanMessage(content=enhanced_query))
             
-            # Run the agent with callback for tool logging
-            result = await self.agent.ainvoke(
-                {"messages": input_messages},
-                config={"callbacks": [self.callback_handler]}
-            )
+            # Tool calls made during the run resolve player aliases to PUUIDs
+            match_aliases.set(aliases)
             
+            # Run the agent through the event stream so the model is called in
+            # streaming mode and the callback handler receives every token as
+            # it is produced; the final state arrives with the root run's end event
+            result = {}
+            agent_input["messages"] = input_messages
+            async for event in self.agent.astream_events(
+                agent_input,
+                config=config,
+                version="v2"
+            ):
+                if event["event"] == "on_chain_end" and not event.get("parent_ids"):
+                    result = event["data"].get("output") or {}
+
             # Extract the final message
             messages = result.get("messages", [])
             if messages:
@@ -167,6 +249,28 @@ Please analyze the above match context and respond to the user's query with rele
             logger.error(error_msg)
             return error_msg
 
+    async def _close_dangling_tool_calls(self, config: Dict, messages: List) -> None:
+        """Answer the tool calls a cancelled run left without results
+        
+        A run cancelled during a tool call (e.g. the client disconnected)
+        checkpoints the model's tool calls without their ToolMessages, and the
+        graph refuses to run on such a history. Each unanswered call gets a
+        synthetic result saying it was cancelled.
+        """
+        answered = {message.tool_call_id for message in messages if isinstance(message, ToolMessage)}
+        dangling = [
+            ToolMessage(
+                content="Tool call cancelled before it finished.",
+                tool_call_id=tool_call["id"],
+                name=tool_call["name"]
+            )
+            for message in messages if isinstance(message, AIMessage)
+            for tool_call in message.tool_calls if tool_call["id"] not in answered
+        ]
+        if dangling:
+            await self.agent.aupdate_state(config, {"messages": dangling}, as_node="tools")
+            logger.info(f"Closed {len(dangling)} cancelled tool calls of thread {config['configurable']['thread_id']}")
+
     def _start_event_loop(self):
         """Start the event loop in a background thread"""
         def run_loop():
@@ -205,11 +309,27 @@ Please analyze the above match context and respond to the user's query with rele
             }
         )
         
+        # Keep warm league-mcp sessions so tool calls, resources and prompts
+        # reuse a running server instead of spawning one per call
+        self.session_pool = MCPSessionPool(
+            self.mcp_client,
+            "league-mcp",
+            size=settings.MCP_POOL_SIZE,
+            health_check_interval=settings.MCP_HEALTH_CHECK_INTERVAL,
+            checkout_timeout=settings.MCP_CHECKOUT_TIMEOUT
+        )
+        await self.session_pool.start()
+        
+        # Static ddragon:// and constants:// resources are read once per patch,
+        # starting in the background now
+        self.resource_cache = ResourceCache(lambda uri: self._fetch_resource("league-mcp", uri))
+        self.resource_cache.schedule_preload()
+        
         # Get tools from MCP server
-        mcp_tools = await self.mcp_client.get_tools()
+        mcp_tools = await self.session_pool.get_tools()
         
         # Add builds tools to the tool list
-        builds_tools = [champion_build_tool, champion_stats_tool]
+        builds_tools = [champion_build_tool, champion_stats_tool, champion_builds_batch_tool]
         self.tools = mcp_tools + builds_tools
         
         # Note: Resources and prompts are available but not easily listable with MultiServerMCPClient
@@ -259,6 +379,10 @@ IMPORTANT PARAMETERS:
 - Platform regions: na1, euw1, eun1, kr, jp1, br1, la1, la2, oc1, tr1, ru (for game-specific tools)
 - Games: lol (League of Legends), tft (Teamfight Tactics), val (VALORANT), lor (Legends of Runeterra)
 
+PLAYER ALIASES:
+- In the match context players are named by alias (B1-B5 blue side, R1-R5 red side) instead of their PUUIDs
+- Pass the alias as the puuid argument of a tool (e.g. get_summoner_by_puuid(puuid="R2", region="euw1")); it is replaced by the real PUUID
+
 EXAMPLE WORKFLOW for "get puuid of Sneaky#NA1 then get match details":
 1. Call get_account_by_riot_id(game_name="Sneaky", tag_line="NA1", region="americas")
 2. Extract the puuid from the result
@@ -277,6 +401,8 @@ BUILD ANALYSIS TOOLS (for champion builds and itemization):
   * Tier ranking (1-5 scale), win/pick/ban rates
   * Patch version and position information
   * Performance metrics for strategic decisions
+- champion_builds_batch_tool(champions, include="both") - Builds and/or statistics for up to 10
+  champions in one call (e.g. the player's champion and the whole enemy team)
 
 WHEN TO USE BUILD TOOLS:
 - User asks for builds, items, or itemization advice
@@ -287,6 +413,7 @@ WHEN TO USE BUILD TOOLS:
 BUILD TOOL USAGE GUIDELINES:
 - Use champion_build_tool to get current meta builds with specific pick/win rates
 - Use champion_stats_tool to check champion tier rankings and performance
+- When several champions are needed (e.g. a whole match), call champion_builds_batch_tool once instead of one tool call per champion
 - For build recommendations, first get current meta data, then adapt to match context
 - Consider enemy champions when suggesting situational items
 - Always include boots in 6-item builds unless champion doesn't need them
@@ -337,10 +464,21 @@ If resources fail due to network issues, provide helpful fallback information.
 
 DO NOT generate Python code, print statements, or fake data. USE THE ACTUAL TOOLS."""
 
+        # Persist thread state so conversations survive restarts and any worker can resume them
+        if settings.CHECKPOINT_DB_PATH and self.checkpointer is None:
+            self.checkpointer = SQLiteCheckpointSaver(
+                settings.CHECKPOINT_DB_PATH, max_threads=settings.CHECKPOINT_MAX_THREADS
+            )
+        
         self.agent = create_react_agent(
             model=self.model,
             tools=self.tools,
-            prompt=system_prompt,
+            state_schema=ChatbotState,
+            # Every model call is measured and trimmed to the model's prompt token budget
+            prompt=PromptBudget(
+                "chatbot", get_prompt_token_budget(MODEL_NAME), settings.TOOL_RESULT_MAX_TOKENS
+            ).prompt(system_prompt),
+            checkpointer=self.checkpointer,
             debug=True  # Enable debug mode for more logging
         )
 
@@ -460,15 +598,13 @@ DO NOT generate Python code, print statements, or fake data. USE THE ACTUAL TOOL
             query_lower = query.lower()
             
             # Handle resource requests
-            if any(prefix in query_lower for prefix in ['ddragon://', 'constants://']):
-                for line in query.split():
-                    if '://' in line:
-                        resource_uri = line.strip()
-                        server_name = "league-mcp"
-                        print(f"🔍 Fetching resource: {resource_uri}")
-                        
-                        content = self._run_in_loop(self.get_resource_content(server_name, resource_uri))
-                        return content
+            resource_uri = find_resource_uri(query)
+            if resource_uri:
+                server_name = "league-mcp"
+                print(f"🔍 Fetching resource: {resource_uri}")
+                
+                content = self._run_in_loop(self.get_resource_content(server_name, resource_uri))
+                return content
             
             # Handle prompt requests
             prompt_keywords = ['find_player_stats', 'tournament_setup', 'champion_analysis', 'team_composition_analysis', 'player_improvement']
@@ -654,6 +790,24 @@ Please follow these instructions step by step and use the available tools to gat
 
     async def cleanup(self):
         """Clean up resources"""
+        if self.resource_cache:
+            self.resource_cache.close()
+            self.resource_cache = None
+        
+        if self.session_pool:
+            try:
+                await self.session_pool.close()
+            except Exception as e:
+                logger.warning(f"Error closing MCP session pool: {e}")
+            self.session_pool = None
+        
+        if self.checkpointer:
+            try:
+                self.checkpointer.close()
+            except Exception as e:
+                logger.warning(f"Error closing checkpointer: {e}")
+            self.checkpointer = None
+        
         if self.mcp_client:
             try:
                 # MultiServerMCPClient doesn't have a close method, so we'll just clean up references
@@ -667,24 +821,40 @@ Please follow these instructions step by step and use the available tools to gat
             if self.loop_thread:
                 self.loop_thread.join(timeout=5)
 
+    async def _fetch_resource(self, server_name: str, resource_uri: str) -> Optional[str]:
+        """Read a resource from the MCP server; None if it has no content"""
+        logger.info(f"Attempting to fetch resource: {resource_uri}")
+        if self.session_pool:
+            resources_request = self.session_pool.get_resources(uris=[resource_uri])
+        else:
+            resources_request = self.mcp_client.get_resources(server_name, uris=[resource_uri])
+        resources = await asyncio.wait_for(resources_request, timeout=30.0)
+        
+        if resources and len(resources) > 0:
+            content = resources[0].data
+            logger.info(f"Successfully fetched resource {resource_uri}, length: {len(content)}")
+            return content
+        return None
+
     async def get_resource_content(self, server_name: str, resource_uri: str) -> str:
-        """Get content from an MCP resource with enhanced error handling"""
+        """Get content from an MCP resource with enhanced error handling
+        
+        Static resources are served from the resource cache; they are only
+        read from the server once per patch.
+        """
         if not self.mcp_client:
             return "❌ MCP client not connected"
         
         try:
-            logger.info(f"Attempting to fetch resource: {resource_uri}")
-            
-            # Add timeout and better error handling
-            import asyncio
-            resources = await asyncio.wait_for(
-                self.mcp_client.get_resources(server_name, uris=[resource_uri]),
-                timeout=30.0
-            )
+            if self.resource_cache and self.resource_cache.is_cacheable(resource_uri):
+                try:
+                    content = await self.resource_cache.get(resource_uri)
+                except ResourceNotFoundError:
+                    content = None
+            else:
+                content = await self._fetch_resource(server_name, resource_uri)
             
-            if resources and len(resources) > 0:
-                content = resources[0].data
-                logger.info(f"Successfully fetched resource {resource_uri}, length: {len(content)}")
+            if content:
                 return content
             else:
                 error_msg = f"❌ Resource {resource_uri} not found or empty"
@@ -779,7 +949,10 @@ This resource provides League of Legends game constants and reference data.
             return "❌ MCP client not connected"
         
         try:
-            messages = await self.mcp_client.get_prompt(server_name, prompt_name, arguments=kwargs)
+            if self.session_pool:
+                messages = await self.session_pool.get_prompt(prompt_name, arguments=kwargs)
+            else:
+                messages = await self.mcp_client.get_prompt(server_name, prompt_name, arguments=kwargs)
             if messages:
                 # Combine all message contents
                 content = "\n".join([msg.content for msg in messages])
@@ -2,7 +2,7 @@ from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 import os
 from enum import Enum
-from typing import Optional
+from typing import Dict, Optional
 
 # Load .env file
 load_dotenv()
@@ -38,10 +38,50 @@ class Settings(BaseSettings):
     MAX_WORKERS: int = 10
     TIMEOUT_SECONDS: int = 30
     
+    # MCP session pool (league-mcp stdio server)
+    MCP_POOL_SIZE: int = 2
+    MCP_HEALTH_CHECK_INTERVAL: float = 30.0
+    MCP_CHECKOUT_TIMEOUT: float = 30.0
+    
+    # Conversation memory (per thread_id); persisted to SQLite when a path is set
+    THREAD_STORE_MAX_THREADS: int = 1000
+    THREAD_STORE_MAX_TURNS: int = 100
+    THREAD_STORE_PATH: Optional[str] = None
+    THREAD_HISTORY_MAX_TOKENS: int = 3000
+    
+    # LangGraph thread state (shared by workers on one host); disabled if no path is set
+    CHECKPOINT_DB_PATH: Optional[str] = None
+    CHECKPOINT_MAX_THREADS: int = 1000
+    
+    # Prompt token budgets per model (PROMPT_TOKEN_BUDGET for models not listed)
+    PROMPT_TOKEN_BUDGET: int = 24000
+    MODEL_PROMPT_TOKEN_BUDGETS: Dict[str, int] = {}
+    TOOL_RESULT_MAX_TOKENS: int = 2000
+    
+    # Data Dragon static data snapshot (champion, item, rune and spell names);
+    # synced at startup when missing or older than the current patch
+    STATIC_DATA_PATH: str = "data/ddragon_static.json"
+    STATIC_DATA_AUTO_SYNC: bool = True
+    
+    # Seconds between checks of Data Dragon for a new patch (0 to only check at startup)
+    PATCH_REFRESH_INTERVAL: float = 3600.0
+    
     class Config:
         env_file = ".env"
         case_sensitive = False  # Allow case-insensitive environment variable names
 
+def get_prompt_token_budget(model: str) -> int:
+    """
+    Get the prompt token budget of a model.
+    
+    Args:
+        model: Model name (e.g. "gemini-2.0-flash")
+        
+    Returns:
+        The model's budget from MODEL_PROMPT_TOKEN_BUDGETS, or PROMPT_TOKEN_BUDGET
+    """
+    return settings.MODEL_PROMPT_TOKEN_BUDGETS.get(model, settings.PROMPT_TOKEN_BUDGET)
+
 def get_settings():
     """
     Factory function to get settings for the current environment.
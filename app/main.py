@@ -4,6 +4,10 @@ from app.routers import chatbot, tips, followups, game_overview
 from app.utils.error_handler import setup_error_handlers
 from app.utils.logger import get_logger
 from app.config import settings
+from app.utils.metrics import metrics
+from app.utils.http_client import close_http_clients
+from app.mcp.patch_registry import patch_registry
+from app.utils.static_data import static_data_store
 from app.services.chatbot_services import startup_mcp_connection, shutdown_mcp_connection
 import asyncio
 import platform
@@ -21,10 +25,28 @@ if platform.system() == "Windows":
 # Get logger for main module
 logger = get_logger("main")
 
+async def refresh_patch_periodically(interval: float) -> None:
+    """
+    Check Data Dragon for a new patch every `interval` seconds, until cancelled.
+    
+    A new patch runs the patch registry's rollover listeners (dropping and
+    re-warming champion data, preloading MCP resources again) and, when enabled,
+    syncs the static data snapshot.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        previous_patch = patch_registry.current
+        current_patch = await patch_registry.refresh_from_ddragon()
+        if current_patch != previous_patch and settings.STATIC_DATA_AUTO_SYNC:
+            await static_data_store.sync_if_outdated(current_patch)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle application lifespan events."""
     # Startup
+    # Key champion data and MCP resource caches by the current patch from the start
+    await patch_registry.refresh_from_ddragon()
+    
     logger.info("Application startup: Initializing MCP connection...")
     try:
         await startup_mcp_connection()
@@ -32,8 +54,23 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to initialize MCP connection during startup: {e}")
     
+    # Name champions, items, runes and spells locally; synced in the background
+    # so a slow Data Dragon never delays startup
+    static_data_sync = None
+    if settings.STATIC_DATA_AUTO_SYNC:
+        static_data_sync = asyncio.create_task(static_data_store.sync_if_outdated(patch_registry.current))
+    
+    # Pick up patches released while the app is running
+    patch_refresh = None
+    if settings.PATCH_REFRESH_INTERVAL > 0:
+        patch_refresh = asyncio.create_task(refresh_patch_periodically(settings.PATCH_REFRESH_INTERVAL))
+    
     yield
     
+    for task in (static_data_sync, patch_refresh):
+        if task is not None and not task.done():
+            task.cancel()
+    
     # Shutdown
     logger.info("Application shutdown: Closing MCP connection...")
     try:
@@ -41,6 +78,9 @@ async def lifespan(app: FastAPI):
         logger.info("MCP connection shutdown completed")
     except Exception as e:
         logger.error(f"Failed to close MCP connection during shutdown: {e}")
+    
+    # Close pooled outbound HTTP connections (OP.GG scraping)
+    await close_http_clients()
 
 def create_app() -> FastAPI:
     """
@@ -86,6 +126,14 @@ def create_app() -> FastAPI:
         """
         return {"status": "ok", "message": "Welcome to the League of Legends Assistant API!"}
     
+    # Metrics endpoint
+    @app.get("/metrics", tags=["Health"])
+    def get_metrics():
+        """
+        Endpoint exposing the in-process service counters.
+        """
+        return metrics.snapshot()
+    
     logger.info("Application initialization complete")
     return app
 
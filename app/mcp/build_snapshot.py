@@ -0,0 +1,195 @@
+"""
+Champion Build Snapshots
+
+A snapshot is a versioned SQLite file holding the builds and stats of every
+champion, written by the bulk crawl in `cli/builds_mcp_cli.py --snapshot`.
+The builds MCP tools read it before going to OP.GG, so interactive lookups
+become local reads and only missing or expired champions are scraped live.
+
+- Snapshots are written to a temporary file and atomically renamed into
+  place, so readers never see a partial snapshot
+- `SnapshotStore` loads the snapshot into memory once and reloads it when
+  the file is replaced, so lookups are dictionary reads
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+from app.models.builds import ChampionBuild, ChampionStats
+from app.utils.logger import get_logger
+
+logger = get_logger("build_snapshot")
+
+# Bump when the file layout or the payload models change incompatibly
+SNAPSHOT_SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE champions (
+    champion TEXT PRIMARY KEY,
+    patch TEXT,
+    fetched_at REAL NOT NULL,
+    build_json TEXT,
+    stats_json TEXT
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class SnapshotEntry:
+    """Builds and stats of one champion in a snapshot."""
+    champion: str
+    patch: Optional[str]
+    fetched_at: float
+    build_json: Optional[str] = None
+    stats_json: Optional[str] = None
+    _build: Optional[ChampionBuild] = field(default=None, repr=False)
+    _stats: Optional[ChampionStats] = field(default=None, repr=False)
+
+    @property
+    def build(self) -> Optional[ChampionBuild]:
+        if self._build is None and self.build_json:
+            self._build = ChampionBuild.model_validate_json(self.build_json)
+        return self._build
+
+    @property
+    def stats(self) -> Optional[ChampionStats]:
+        if self._stats is None and self.stats_json:
+            self._stats = ChampionStats.model_validate_json(self.stats_json)
+        return self._stats
+
+
+@dataclass
+class BuildSnapshot:
+    """An in-memory copy of a snapshot file."""
+    path: str
+    patch: Optional[str]
+    created_at: float
+    entries: Dict[str, SnapshotEntry]
+
+    def get(self, champion: str) -> Optional[SnapshotEntry]:
+        return self.entries.get(champion)
+
+    @classmethod
+    def load(cls, path: str) -> "BuildSnapshot":
+        """Read a snapshot file.
+
+        Raises:
+            ValueError: If the file was written with another schema version
+        """
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            meta = dict(connection.execute("SELECT key, value FROM meta"))
+            if int(meta.get("schema_version", 0)) != SNAPSHOT_SCHEMA_VERSION:
+                raise ValueError(f"unsupported snapshot schema version {meta.get('schema_version')}")
+
+            entries = {
+                row[0]: SnapshotEntry(*row)
+                for row in connection.execute(
+                    "SELECT champion, patch, fetched_at, build_json, stats_json FROM champions"
+                )
+            }
+        finally:
+            connection.close()
+
+        return cls(path, meta.get("patch"), float(meta.get("created_at", 0)), entries)
+
+
+def write_snapshot(path: str, entries: Iterable[SnapshotEntry], patch: Optional[str]) -> int:
+    """Write a snapshot file atomically.
+
+    Returns:
+        The number of champions written
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.executescript(SCHEMA)
+        rows = [
+            (entry.champion, entry.patch, entry.fetched_at, entry.build_json, entry.stats_json)
+            for entry in entries
+        ]
+        connection.executemany("INSERT INTO champions VALUES (?, ?, ?, ?, ?)", rows)
+        connection.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("schema_version", str(SNAPSHOT_SCHEMA_VERSION)),
+            ("patch", patch or ""),
+            ("created_at", str(time.time())),
+        ])
+        connection.commit()
+    finally:
+        connection.close()
+
+    os.replace(temp_path, path)
+    return len(rows)
+
+
+class SnapshotStore:
+    """
+    Serves the snapshot at a path, reloading it when the file is replaced.
+
+    The file is checked for changes at most every `check_interval` seconds,
+    so lookups stay in-memory reads.
+    """
+
+    def __init__(self, path: str, check_interval: float = 30.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._snapshot: Optional[BuildSnapshot] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = float("-inf")
+
+    def current(self) -> Optional[BuildSnapshot]:
+        """Get the current snapshot, or None if there is no usable snapshot file."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._snapshot
+        self._checked_at = now
+
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            self._snapshot, self._mtime = None, None
+            return None
+
+        if mtime != self._mtime:
+            try:
+                self._snapshot = BuildSnapshot.load(self.path)
+                logger.info(f"Loaded build snapshot {self.path} ({len(self._snapshot.entries)} champions, patch {self._snapshot.patch})")
+            except Exception as e:
+                logger.warning(f"Could not load build snapshot {self.path}: {e}")
+                self._snapshot = None
+            self._mtime = mtime
+        return self._snapshot
+
+    def get(self, champion: str) -> Optional[SnapshotEntry]:
+        """Get a champion's snapshot entry, if there is one."""
+        snapshot = self.current()
+        return snapshot.get(champion) if snapshot else None
+
+
+class RateLimiter:
+    """Spaces out operations so at most one starts every `interval` seconds."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_start - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start = loop.time() + self.interval
+
+
@@ -5,31 +5,191 @@ This module provides Model Context Protocol (MCP) tools for fetching and analyzi
 League of Legends champion builds and statistics from OP.GG.
 
 Tools provided:
-- get_champion_build: Comprehensive build analysis with item combinations, pick rates, 
-  win rates, and strategic recommendations
+- get_champion_build: Starter, core, boots and situational item options with pick rates,
+  win rates and games played
 - get_champion_stats: Current meta statistics including tier rankings, performance metrics,
   and patch information
+- get_champions_builds: Builds and stats for several champions (or every champion of a
+  match) in one call, fetched concurrently
 
-The tools use web scraping combined with Gemini AI analysis to extract detailed,
-structured information from OP.GG's champion pages, providing data-driven insights
-for optimal champion itemization and meta understanding.
+Both tools build typed payloads (app/models/builds.py) and render them either as
+compact text for the LLM or as JSON for API clients.
+
+The tools scrape OP.GG's champion pages and parse the item build tables directly
+into structured data, providing data-driven insights for optimal champion itemization
+and meta understanding. Gemini AI analysis is only used as a fallback when the parsed
+build fails its confidence check.
+
+Results are cached per champion and patch: fresh entries are served instantly, stale entries
+are served while they are refreshed in the background, and the caches are bounded
+with LRU eviction. Identical concurrent OP.GG requests and Gemini extractions are
+coalesced so they run once and share their result. Both tools read from the same
+page, which is downloaded and parsed once per champion within a short window.
+When a new patch is seen (on OP.GG or Data Dragon), everything cached for the old
+patch is dropped at once and the most popular champions are re-fetched in the
+background.
+
+A nightly snapshot of every champion (see app/mcp/build_snapshot.py and
+`cli/builds_mcp_cli.py --snapshot`) is read before all of this, so OP.GG is only
+scraped live for champions that are missing from the snapshot or have expired.
+
+When a chat request arrives with a match, the builds and stats of its champions are
+prefetched in the background (`prefetch_match`) at a lower priority than lookups the
+agent is waiting on, so they are usually cached by the time the agent asks.
 """
 
-from typing import Any
-import httpx
+import asyncio
+import time
+import tracemalloc
+from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 from mcp.server.fastmcp import FastMCP
 from bs4 import BeautifulSoup
 import re
+import weakref
 from langchain_google_genai import ChatGoogleGenerativeAI
 import os
 
+from app.mcp.build_snapshot import RateLimiter, SnapshotEntry, SnapshotStore, write_snapshot
+from app.mcp.patch_registry import patch_registry
+from app.mcp.opgg_parser import is_confident_build, parse_champion_build, parse_page_regions
+from app.models.builds import ChampionBuild, ChampionReport, ChampionStats, ItemBuildOption
+from app.utils.cache import AsyncTTLCache
+from app.utils.html_compaction import compact_html
+from app.utils.http_client import ManagedHTTPClient, close_http_clients
+from app.utils.logger import get_logger, log_to_stderr
+from app.utils.match_encoding import unwrap_match
+from app.utils.metrics import metrics
+from app.utils.singleflight import SingleFlight
+from app.utils.name_resolver import resolve_champion, resolve_item, suggest_champions
+from app.utils.static_data import static_data_store
+from app.utils.tokens import count_tokens, truncate_to_tokens
+
+# As a stdio MCP server, stdout carries the JSON-RPC stream, so logs go to stderr
+if __name__ == "__main__":
+    log_to_stderr()
+
+logger = get_logger("builds_mcp")
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Look up the current patch when the MCP server starts and close the pooled OP.GG connections when it stops."""
+    await patch_registry.refresh_from_ddragon()
+    try:
+        yield
+    finally:
+        await close_http_clients()
+
+
 # Initialize FastMCP server
-mcp = FastMCP("builds")
+mcp = FastMCP("builds", lifespan=server_lifespan)
 
 # Constants
-OPGG_BASE = "https://op.gg"
+OPGG_BASE = os.getenv("OPGG_BASE_URL", "https://op.gg")
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
+# Shared HTTP client - keeps connections to OP.GG warm between lookups
+opgg_http = ManagedHTTPClient(
+    "opgg",
+    headers={
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.5",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+    },
+    timeout=30.0,
+    http2=os.getenv("OPGG_HTTP2", "true").lower() == "true",
+    max_connections=int(os.getenv("OPGG_HTTP_MAX_CONNECTIONS", 20)),
+    max_keepalive_connections=int(os.getenv("OPGG_HTTP_MAX_KEEPALIVE", 10)),
+    max_per_host=int(os.getenv("OPGG_HTTP_MAX_PER_HOST", 8))
+)
+
+# Tool output renderings: compact text for the LLM, typed JSON for API clients
+OUTPUT_FORMATS = ("text", "json")
+
+# Cache settings - build and stats data only change meaningfully between patches, and
+# cache keys include the patch, so entries can live long and are dropped on rollover
+CACHE_TTL_SECONDS = float(os.getenv("OPGG_CACHE_TTL_SECONDS", 24 * 60 * 60))
+CACHE_STALE_SECONDS = float(os.getenv("OPGG_CACHE_STALE_SECONDS", 7 * 24 * 60 * 60))
+CACHE_MAX_ENTRIES = int(os.getenv("OPGG_CACHE_MAX_ENTRIES", 512))
+
+# OP.GG can lag behind a new patch for a while - data from an older patch is rechecked sooner
+LAGGING_PATCH_TTL_SECONDS = float(os.getenv("OPGG_LAGGING_PATCH_TTL_SECONDS", 15 * 60))
+
+# Number of most looked-up champions re-fetched in the background after a patch rollover
+REWARM_CHAMPIONS = int(os.getenv("OPGG_REWARM_CHAMPIONS", 20))
+REWARM_CONCURRENCY = 2
+
+# Bulk snapshot read before the caches - entries older than the max age, or from an
+# older patch than the current one, are fetched live instead
+SNAPSHOT_PATH = os.getenv("OPGG_SNAPSHOT_PATH", "data/opgg_snapshot.sqlite")
+SNAPSHOT_MAX_AGE_SECONDS = float(os.getenv("OPGG_SNAPSHOT_MAX_AGE_SECONDS", 36 * 60 * 60))
+
+snapshot_store = SnapshotStore(SNAPSHOT_PATH)
+
+# Bulk lookups - champions fetched at once, and the most accepted in one call (a full match)
+BATCH_CONCURRENCY = int(os.getenv("OPGG_BATCH_CONCURRENCY", 5))
+MAX_BATCH_CHAMPIONS = 10
+
+# Parts of a bulk lookup
+BATCH_INCLUDES = ("both", "build", "stats")
+
+# Match prefetching - runs a few champions at a time, and pauses while interactive
+# lookups are loading so it never competes with a lookup the agent is waiting on
+PREFETCH_ENABLED = os.getenv("OPGG_PREFETCH", "true").lower() == "true"
+PREFETCH_CONCURRENCY = int(os.getenv("OPGG_PREFETCH_CONCURRENCY", 2))
+PREFETCH_MAX_TRACKED = 1024
+
+# Number of lookups currently loading for an interactive caller
+_interactive_loads = 0
+
+# Set while no interactive lookup is loading, one per event loop
+_interactive_idle: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Event]" = weakref.WeakKeyDictionary()
+
+# Prefetched (kind, cache key) entries not looked up yet, oldest first
+_prefetched: dict[tuple[str, tuple[str, str]], None] = {}
+
+# Background prefetch tasks, kept so they are not garbage collected mid-flight
+_prefetch_tasks: set[asyncio.Task] = set()
+
+
+def _payload_ttl(payload: "ChampionBuild | ChampionStats") -> float | None:
+    return LAGGING_PATCH_TTL_SECONDS if patch_registry.is_outdated(payload.patch) else None
+
+
+build_cache: AsyncTTLCache[ChampionBuild] = AsyncTTLCache(
+    "champion_build", maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, stale_ttl=CACHE_STALE_SECONDS,
+    ttl_for=_payload_ttl
+)
+stats_cache: AsyncTTLCache[ChampionStats] = AsyncTTLCache(
+    "champion_stats", maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, stale_ttl=CACHE_STALE_SECONDS,
+    ttl_for=_payload_ttl
+)
+
+# Background re-warming tasks, kept so they are not garbage collected mid-flight
+_rewarm_tasks: set[asyncio.Task] = set()
+
+# Parsed pages are only shared between tool calls made close together
+PAGE_TTL_SECONDS = float(os.getenv("OPGG_PAGE_TTL_SECONDS", 5 * 60))
+
+page_cache: "AsyncTTLCache[ChampionPage]" = AsyncTTLCache(
+    "champion_page", maxsize=64, ttl=PAGE_TTL_SECONDS, stale_ttl=0
+)
+
+# In-flight deduplication - concurrent callers share one page fetch / one LLM extraction
+opgg_requests: SingleFlight[str | None] = SingleFlight("opgg_request")
+gemini_extractions: SingleFlight[ChampionBuild] = SingleFlight("gemini_extraction")
+
+# Record the peak memory of each page parse (tracemalloc slows everything down while on)
+TRACE_PARSE_MEMORY = os.getenv("OPGG_TRACE_PARSE_MEMORY", "false").lower() == "true"
+
+# Upper bound on the page content sent to Gemini when the parser falls back to it
+LLM_MAX_CONTENT_TOKENS = int(os.getenv("OPGG_LLM_MAX_CONTENT_TOKENS", 6000))
+
 # Initialize Gemini model for HTML parsing
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if GEMINI_API_KEY:
@@ -42,90 +202,124 @@ else:
     gemini_model = None
 
 
-async def extract_build_info_with_gemini(html_content: str, champion: str) -> str:
-    """Extract detailed build information from HTML using Gemini AI analysis.
-    
-    This function processes OP.GG HTML content to extract comprehensive build data
-    including item combinations, pick rates, win rates, and strategic recommendations.
-    """
-    if not gemini_model:
-        return f"Error: Gemini API key not configured. Cannot extract build information for {champion}."
-    
-    prompt = f"""You are analyzing League of Legends champion build data from OP.GG for {champion}. 
+class ChampionDataError(Exception):
+    """Raised when champion data cannot be fetched from OP.GG or extracted from it."""
 
-Extract and format comprehensive build information with the following structure:
 
-## {champion.title()} Build Analysis from OP.GG
+def normalize_champion_name(champion: str) -> str:
+    """Normalize a champion name into the slug used in OP.GG URLs and cache keys."""
+    # Names, nicknames and typos map to the ids OP.GG uses ("Wukong" -> "monkeyking", "yasou" -> "yasuo")
+    resolution = resolve_champion(champion)
+    return resolution.key if resolution else champion.lower().replace(' ', '').replace("'", "")
 
-**1. Core Items**
-List the most popular core item builds with exact pick rates and win rates:
-- Format: "Item1 -> Item2 -> Item3 (XX.XX% pick rate, XX.XX% win rate)"
-- Include at least 4-5 core combinations
-- Order by popularity (highest pick rate first)
 
-**2. Boots**
-- Primary boot choice with pick rate and win rate
-- Alternative boot options if available
-- Format: "Boot Name (XX.XX% pick rate, XX.XX% win rate)"
+def validate_champion(champion: str) -> str:
+    """Get a champion's slug, failing without a request to OP.GG if Data Dragon does not know the name."""
+    if static_data_store.current() is not None and resolve_champion(champion) is None:
+        metrics.increment("builds.unknown_champions")
+        suggestions = suggest_champions(champion)
+        hint = f" Did you mean {' or '.join(suggestions)}?" if suggestions else " Please check the champion name and try again."
+        raise ChampionDataError(f"Unknown champion {champion!r}.{hint}")
+    return normalize_champion_name(champion)
 
-**3. Situational Items**
-Categorize items by their purpose:
-- Anti-tank items (armor penetration)
-- Anti-heal items
-- Defensive items
-- Damage items
-- Include win rates for each when used in specific slots
 
-**4. Item Build Order**
-Provide step-by-step build progression:
-1. Starting Items
-2. First Back
-3. Core Item 1
-4. Core Item 2
-5. Situational Items
-6. Late Game Options
+async def extract_build_info_with_gemini(html_content: str, champion: str) -> ChampionBuild:
+    """Extract structured build information from HTML using Gemini AI analysis.
+    
+    This function processes OP.GG HTML content into the same typed build the parser
+    produces: item combinations with their pick rates, win rates and game counts.
+    The HTML is compacted to text and capped at LLM_MAX_CONTENT_TOKENS before it is sent.
+    Concurrent extractions of the same content for the same champion share one model call.
+    Raises ChampionDataError if the model is not configured or the extraction fails.
+    """
+    page_content = compact_prompt_content(html_content)
+    key = (normalize_champion_name(champion), hash(page_content))
+    return await gemini_extractions.do(key, lambda: _extract_build_info_with_gemini(page_content, champion))
 
-**5. Win Rates**
-Highlight key performance metrics for different builds and items.
 
-**6. Key Statistics**
-Summarize the strategic priorities this build focuses on (damage, survivability, utility, etc.).
+def compact_prompt_content(html_content: str) -> str:
+    """Compact HTML into token-lean text for the extraction prompt and cap its size."""
+    page_content = compact_html(html_content)
+    content_tokens = count_tokens(page_content)
+    if content_tokens > LLM_MAX_CONTENT_TOKENS:
+        page_content = truncate_to_tokens(page_content, LLM_MAX_CONTENT_TOKENS)
+        metrics.increment("builds.llm_prompts_truncated")
+        content_tokens = LLM_MAX_CONTENT_TOKENS
+    
+    metrics.increment("builds.llm_html_chars", len(html_content))
+    metrics.increment("builds.llm_prompt_content_tokens", content_tokens)
+    return page_content
+
+
+async def _extract_build_info_with_gemini(page_content: str, champion: str) -> ChampionBuild:
+    if not gemini_model:
+        raise ChampionDataError(f"Error: Gemini API key not configured. Cannot extract build information for {champion}.")
+    
+    prompt = f"""You are analyzing League of Legends champion build data from OP.GG for {champion}.
 
-Focus on extracting specific percentages, item names, and statistical data. Be precise with numbers.
+Extract the item builds listed on the page:
+- starter_items: starting item sets
+- core_items: core item builds (the 3-item combinations), most popular first
+- boots: boot options
+- situational_items: 4th, 5th and last item options
 
-HTML Content:
-{html_content}
+For every option give the item names in build order, the pick rate and win rate as numbers
+(e.g. 34.19 for "34.19%") and the number of games when shown. Only use builds, items and
+numbers that appear on the page; leave a list empty if the page does not show it.
 
-Please extract and format the build information:"""
+Page Content (text extracted from the OP.GG page; item icons appear as [Item Name], table rows as cells separated by |):
+{page_content}"""
 
     try:
-        response = await gemini_model.ainvoke(prompt)
-        return response.content
+        build = await gemini_model.with_structured_output(ChampionBuild).ainvoke(prompt)
     except Exception as e:
-        return f"Error extracting build information with Gemini: {str(e)}"
+        raise ChampionDataError(f"Error extracting build information with Gemini: {str(e)}") from e
+    
+    if build is None:
+        raise ChampionDataError(f"Error extracting build information with Gemini: no build found for {champion}")
+    return resolve_build_items(build.model_copy(update={"champion": champion, "source": "gemini"}))
+
+
+def resolve_build_items(build: ChampionBuild) -> ChampionBuild:
+    """Fill in the item ids (and Data Dragon names) of build options listed by name only.
+    
+    The LLM fallback returns item names as it read them, possibly misspelled and
+    without ids. An option is only updated when every one of its items resolves.
+    """
+    updates = {}
+    for category in ("starter_items", "core_items", "boots", "situational_items"):
+        options = []
+        for option in getattr(build, category):
+            resolutions = [resolve_item(item) for item in option.items] if not option.item_ids else []
+            if resolutions and all(resolutions):
+                option = option.model_copy(update={
+                    "items": [resolution.name for resolution in resolutions],
+                    "item_ids": [int(resolution.key) for resolution in resolutions],
+                })
+                metrics.increment("builds.llm_items_resolved", len(resolutions))
+            options.append(option)
+        updates[category] = options
+    return build.model_copy(update=updates)
+
 
 async def make_opgg_request(url: str) -> str | None:
     """Make a request to OP.GG with proper headers and error handling.
     
     Uses appropriate headers to mimic a real browser request and avoid being blocked.
-    Includes timeout and error handling for robust web scraping.
+    Includes timeout and error handling for robust web scraping. Concurrent requests
+    for the same URL share one underlying fetch.
     """
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-    }
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            return response.text
-        except Exception as e:
-            print(f"Error fetching {url}: {e}")
-            return None
+    return await opgg_requests.do(url, lambda: _fetch_opgg_page(url))
+
+
+async def _fetch_opgg_page(url: str) -> str | None:
+    try:
+        response = await opgg_http.get(url)
+        response.raise_for_status()
+        return response.text
+    except Exception as e:
+        logger.warning(f"Error fetching {url}: {e}")
+        return None
 
 
 def extract_build_data(html_content: str) -> dict[str, Any]:
@@ -247,7 +441,7 @@ def extract_build_data(html_content: str) -> dict[str, Any]:
             build_data["counters"] = counters["default"]
     
     except Exception as e:
-        print(f"Error parsing HTML: {e}")
+        logger.error(f"Error parsing HTML: {e}")
     
     return build_data
 
@@ -285,87 +479,612 @@ Weak Against: {', '.join(build_data['counters']['weak_against'][:5])}
     return output.strip()
 
 
-@mcp.tool()
-async def get_champion_build(champion: str) -> str:
-    """Get comprehensive build information for a League of Legends champion from OP.GG.
+@dataclass
+class ChampionPage:
+    """The parts of a champion's OP.GG build page used by the build and stats tools."""
+    item_builds_html: str
+    stats: ChampionStats
+    build: ChampionBuild
+    parse_seconds: float = 0.0
+    parse_peak_bytes: int | None = None
 
-    This tool provides detailed build analysis including:
-    - Core item combinations with pick rates and win rates
-    - Recommended boots with usage statistics
-    - Situational items for different game scenarios
-    - Complete 6-item build order progression
-    - Performance metrics for each item choice
-    - Strategic itemization guidance
 
-    Args:
-        champion: Champion name (e.g. jinx, yasuo, ahri)
+def find_item_builds_html(soup: BeautifulSoup, html_content: str) -> str:
+    """Find the Item Builds section of a parsed OP.GG page, falling back to larger parts of the page."""
+    # Look for the Item Builds section within the content-container
+    content_container = soup.find(id='content-container')
+    if not content_container:
+        # Fallback to the entire HTML if no content-container found
+        return html_content
+    
+    # Look for the specific "Item builds" link and get its containing section
+    for element in content_container.find_all('a'):
+        if 'items' in element.get('href', '') and 'Item builds' in element.get_text():
+            # Find the section containing this link
+            section = element.find_parent('section')
+            if section:
+                return str(section)
+    
+    # If no specific Item Builds section found, look for any element containing "Item builds"
+    for element in content_container.find_all(string=True):
+        if 'Item builds' in element:
+            # Find the section containing this text
+            section = element.find_parent('section')
+            if section:
+                return str(section)
+    
+    # Final fallback: use the content-container
+    return str(content_container)
+
+
+# Stats patterns - the rate patterns only look a short distance past their label
+PATCH_PATTERN = re.compile(r'Version: (\d+\.\d+)')
+POSITION_PATTERN = re.compile(r'for (Bottom|Top|Mid|Jungle|Support)')
+GAMES_PATTERN = re.compile(r'(\d{1,3}(?:,\d{3})*)\s+games')
+TIER_PATTERN = re.compile(r'(\d+)\s+Tier')
+WIN_RATE_PATTERN = re.compile(r'Win rate.{0,80}?(\d+\.\d+)%')
+PICK_RATE_PATTERN = re.compile(r'Pick rate.{0,80}?(\d+\.\d+)%')
+BAN_RATE_PATTERN = re.compile(r'Ban rate.{0,80}?(\d+\.\d+)%')
+
+
+def extract_champion_stats(soup: BeautifulSoup, champion: str) -> ChampionStats:
+    """Extract tier, rates, patch and position statistics from a parsed OP.GG page."""
+    stats = ChampionStats(champion=champion.title())
+    
+    try:
+        # Extract champion name
+        title_elem = soup.find('h1')
+        if title_elem and title_elem.get_text().strip():
+            stats.champion = title_elem.get_text().strip()
         
-    Returns:
-        Detailed build analysis containing:
-        * **Core Items**: Most popular item combinations with pick/win rates
-        * **Boots**: Recommended boot choices with statistics
-        * **Situational Items**: Context-dependent item options
-        * **Item Build Order**: Step-by-step build progression
-        * **Win Rates**: Performance data for different builds
-        * **Key Statistics**: Strategic priorities and itemization focus
+        # Extract detailed stats from text
+        stats_text = soup.get_text()
+        
+        # Extract patch version
+        patch_match = PATCH_PATTERN.search(stats_text)
+        if patch_match:
+            stats.patch = patch_match.group(1)
+        
+        # Extract position
+        position_match = POSITION_PATTERN.search(stats_text)
+        if position_match:
+            stats.position = position_match.group(1)
         
-    Example output format:
-        - Core item builds with percentages (e.g., "Yun Tal -> IE -> Hurricane: 34.19% pick, 60.58% win")
-        - Situational recommendations based on enemy composition
-        - Complete 6-item build suggestions with reasoning
+        # Look for games played
+        games_match = GAMES_PATTERN.search(stats_text)
+        if games_match:
+            stats.games_played = int(games_match.group(1).replace(',', ''))
+        
+        # Extract tier
+        tier_match = TIER_PATTERN.search(stats_text)
+        if tier_match:
+            tier_num = int(tier_match.group(1))
+            # Fix the tier number if it's too large (like 141)
+            if tier_num > 5:
+                tier_num = 1  # Default to tier 1 if parsing error
+            stats.tier = tier_num
+        
+        # Extract win/pick/ban rates
+        win_rate_match = WIN_RATE_PATTERN.search(stats_text)
+        if win_rate_match:
+            stats.win_rate = float(win_rate_match.group(1))
+        
+        pick_rate_match = PICK_RATE_PATTERN.search(stats_text)
+        if pick_rate_match:
+            stats.pick_rate = float(pick_rate_match.group(1))
+        
+        ban_rate_match = BAN_RATE_PATTERN.search(stats_text)
+        if ban_rate_match:
+            stats.ban_rate = float(ban_rate_match.group(1))
+    
+    except Exception as e:
+        logger.error(f"Error parsing stats: {e}")
+    
+    return stats
+
+
+def parse_champion_page(html_content: str, champion: str) -> ChampionPage:
+    """Parse an OP.GG champion build page once and extract everything both tools need.
+    
+    Only the page regions the tools read are parsed. The parse time, and the peak memory
+    when tracemalloc is tracing (see OPGG_TRACE_PARSE_MEMORY), are recorded on the page.
     """
+    trace_memory = TRACE_PARSE_MEMORY or tracemalloc.is_tracing()
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    
+    soup = parse_page_regions(html_content)
+    stats = extract_champion_stats(soup, champion)
+    build = parse_champion_build(soup, champion)
+    build.patch = stats.patch
+    page = ChampionPage(
+        item_builds_html=find_item_builds_html(soup, html_content),
+        stats=stats,
+        build=build
+    )
+    
+    page.parse_seconds = time.perf_counter() - started
+    if trace_memory:
+        page.parse_peak_bytes = tracemalloc.get_traced_memory()[1] - memory_before
+    
+    metrics.increment("builds.pages_parsed")
+    metrics.increment("builds.page_parse_seconds", page.parse_seconds)
+    return page
+
+
+async def fetch_champion_page(champion: str) -> ChampionPage:
+    """Fetch and parse a champion's OP.GG build page.
+    
+    Parsed pages are kept for a short window so the build and stats tools, which are
+    usually called together, share one download and one parse.
+    Raises ChampionDataError if the page cannot be fetched.
+    """
+    return await page_cache.get_or_load(
+        normalize_champion_name(champion),
+        lambda: _load_champion_page(champion)
+    )
+
+
+async def _load_champion_page(champion: str) -> ChampionPage:
     # Normalize champion name for URL
-    champion_lower = champion.lower().replace(' ', '').replace("'", "")
+    champion_lower = normalize_champion_name(champion)
     url = f"{OPGG_BASE}/lol/champions/{champion_lower}/build"
     
     html_content = await make_opgg_request(url)
     
     if not html_content:
-        return f"Unable to fetch build data for {champion}. Please check the champion name and try again."
+        raise ChampionDataError(f"Unable to fetch OP.GG data for {champion}. Please check the champion name and try again.")
     
-    # Parse the HTML and find the Item Builds section
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Parsing is CPU bound; keep it off the event loop
+    page = await asyncio.to_thread(parse_champion_page, html_content, champion)
+    patch_registry.observe(page.stats.patch, source="opgg")
+    return page
+
+
+async def fetch_champion_build(champion: str) -> ChampionBuild:
+    """Extract the typed build from a champion's OP.GG page, bypassing the build cache.
     
-    # Look for the Item Builds section within the content-container
-    content_container = soup.find(id='content-container')
-    if content_container:
-        # Search for sections containing "Item Builds" text
-        item_builds_section = None
+    The item build tables are parsed directly; Gemini is only asked to extract the
+    build when the parsed result fails its confidence check.
+    Raises ChampionDataError if the page cannot be fetched or the extraction fails.
+    """
+    page = await fetch_champion_page(champion)
+    
+    if is_confident_build(page.build):
+        metrics.increment("builds.parsed")
+        return page.build
+    
+    # Fall back to extracting the information with Gemini
+    metrics.increment("builds.llm_fallbacks")
+    build = await extract_build_info_with_gemini(page.item_builds_html, champion)
+    build.patch = page.stats.patch
+    return build
+
+
+async def fetch_champion_stats(champion: str) -> ChampionStats:
+    """Get the typed statistics from a champion's OP.GG page, bypassing the stats cache.
+    
+    Raises ChampionDataError if the page cannot be fetched.
+    """
+    page = await fetch_champion_page(champion)
+    return page.stats
+
+
+def _is_snapshot_fresh(entry: SnapshotEntry) -> bool:
+    """Check whether a snapshot entry is recent enough and from the current patch."""
+    return time.time() - entry.fetched_at <= SNAPSHOT_MAX_AGE_SECONDS and not patch_registry.is_outdated(entry.patch)
+
+
+def _snapshot_entry(champion_key: str) -> SnapshotEntry | None:
+    """Get a champion's snapshot entry if it is fresh, counting misses and expired entries."""
+    entry = snapshot_store.get(champion_key)
+    if entry is None:
+        metrics.increment("builds.snapshot_misses")
+        return None
+    if not _is_snapshot_fresh(entry):
+        metrics.increment("builds.snapshot_expired")
+        return None
+    return entry
+
+
+def _interactive_idle_event() -> asyncio.Event:
+    """Get the running event loop's event that is set while no interactive lookup is loading."""
+    loop = asyncio.get_running_loop()
+    event = _interactive_idle.get(loop)
+    if event is None:
+        event = _interactive_idle[loop] = asyncio.Event()
+        if not _interactive_loads:
+            event.set()
+    return event
+
+
+async def _interactive_load(fetch, champion: str):
+    """Run a cache loader for an interactive caller, holding back prefetching meanwhile."""
+    global _interactive_loads
+    idle = _interactive_idle_event()
+    _interactive_loads += 1
+    idle.clear()
+    try:
+        return await fetch(champion)
+    finally:
+        _interactive_loads -= 1
+        if not _interactive_loads:
+            idle.set()
+
+
+def _record_prefetch_use(kind: str, cache_key: tuple[str, str]) -> None:
+    if (kind, cache_key) in _prefetched:
+        del _prefetched[(kind, cache_key)]
+        metrics.increment("builds.prefetch.used")
+        metrics.set("builds.prefetch.use_ratio", metrics.ratio("builds.prefetch.used", "builds.prefetch.scheduled"))
+
+
+async def get_cached_build(champion: str) -> ChampionBuild:
+    """Get a champion's build for the current patch from the snapshot or the cache, fetching it on a miss."""
+    champion_key = validate_champion(champion)
+    entry = _snapshot_entry(champion_key)
+    if entry is not None and entry.build is not None:
+        metrics.increment("builds.snapshot_hits")
+        patch_registry.record_lookup(champion_key)
+        return entry.build
+    
+    cache_key = patch_registry.cache_key(champion_key)
+    _record_prefetch_use("build", cache_key)
+    payload = await build_cache.get_or_load(
+        cache_key,
+        lambda: _interactive_load(fetch_champion_build, champion)
+    )
+    # Only count champions that exist, so failed lookups are never re-warmed
+    patch_registry.record_lookup(champion_key)
+    return payload
+
+
+async def get_cached_stats(champion: str) -> ChampionStats:
+    """Get a champion's stats for the current patch from the snapshot or the cache, fetching them on a miss."""
+    champion_key = validate_champion(champion)
+    entry = _snapshot_entry(champion_key)
+    if entry is not None and entry.stats is not None:
+        metrics.increment("builds.snapshot_hits")
+        patch_registry.record_lookup(champion_key)
+        return entry.stats
+    
+    cache_key = patch_registry.cache_key(champion_key)
+    _record_prefetch_use("stats", cache_key)
+    payload = await stats_cache.get_or_load(
+        cache_key,
+        lambda: _interactive_load(fetch_champion_stats, champion)
+    )
+    # Only count champions that exist, so failed lookups are never re-warmed
+    patch_registry.record_lookup(champion_key)
+    return payload
+
+
+def invalidate_outdated_patches(current_patch: str) -> int:
+    """Drop every cached build, stats entry and parsed page that is not from `current_patch`."""
+    dropped = sum(
+        cache.invalidate_where(lambda key: key[0] != current_patch)
+        for cache in (build_cache, stats_cache)
+    )
+    page_cache.clear()
+    return dropped
+
+
+async def rewarm_popular_champions(limit: int = REWARM_CHAMPIONS) -> None:
+    """Re-fetch the builds and stats of the most looked-up champions for the current patch."""
+    semaphore = asyncio.Semaphore(REWARM_CONCURRENCY)
+    
+    async def rewarm(champion: str) -> None:
+        async with semaphore:
+            for cache, fetch in ((build_cache, fetch_champion_build), (stats_cache, fetch_champion_stats)):
+                try:
+                    await cache.get_or_load(patch_registry.cache_key(champion), lambda fetch=fetch: fetch(champion))
+                except ChampionDataError as e:
+                    logger.warning(f"Error re-warming {champion}: {e}")
+        metrics.increment("builds.rewarmed_champions")
+    
+    await asyncio.gather(*(rewarm(champion) for champion in patch_registry.popular_champions(limit)))
+
+
+def _on_patch_rollover(previous_patch: str | None, current_patch: str) -> None:
+    dropped = invalidate_outdated_patches(current_patch)
+    metrics.increment("builds.rollover_invalidations", dropped)
+    
+    try:
+        task = asyncio.get_running_loop().create_task(rewarm_popular_champions())
+    except RuntimeError:
+        # No running loop (e.g. a synchronous caller) - entries are fetched on demand instead
+        return
+    _rewarm_tasks.add(task)
+    task.add_done_callback(_rewarm_tasks.discard)
+
+
+patch_registry.on_rollover(_on_patch_rollover)
+
+
+def champions_in_match(match: dict[str, Any]) -> list[str]:
+    """Get the champion names of every participant of a match, in participant order."""
+    match = unwrap_match(match)
+    
+    # Spectator payloads without champion names are resolved through Data Dragon
+    data = static_data_store.current()
+    champions = []
+    for participant in match.get('participants', []):
+        name = participant.get('championName')
+        if not name and data is not None:
+            name = data.champion_name(participant.get('championId'))
+        if name:
+            champions.append(name)
+    return champions
+
+
+async def fetch_champion_reports(
+    champions: list[str],
+    include: str = "both",
+    concurrency: int = BATCH_CONCURRENCY
+) -> list[ChampionReport]:
+    """Get the builds and/or stats of several champions concurrently.
+    
+    Champions are fetched at most `concurrency` at a time, duplicates are looked up
+    once, and a failure only affects its own champion: each report holds whatever
+    could be fetched plus the errors of the parts that failed.
+    """
+    unique: dict[str, str] = {}
+    for champion in champions:
+        unique.setdefault(normalize_champion_name(champion), champion.strip())
+    
+    lookups = []
+    if include in ("both", "build"):
+        lookups.append(("build", get_cached_build))
+    if include in ("both", "stats"):
+        lookups.append(("stats", get_cached_stats))
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def fetch_report(champion: str) -> ChampionReport:
+        report = ChampionReport(champion=champion)
+        async with semaphore:
+            results = await asyncio.gather(
+                *(fetch(champion) for _, fetch in lookups),
+                return_exceptions=True
+            )
         
-        # Look for the specific "Item builds" link and get its containing section
-        for element in content_container.find_all('a'):
-            if 'items' in element.get('href', '') and 'Item builds' in element.get_text():
-                # Find the section containing this link
-                section = element.find_parent('section')
-                if section:
-                    item_builds_section = section
-                    break
+        for (part, _), result in zip(lookups, results):
+            if isinstance(result, ChampionDataError):
+                report.errors.append(str(result))
+            elif isinstance(result, BaseException):
+                report.errors.append(f"Error fetching {part} for {champion}: {result}")
+            else:
+                setattr(report, part, result)
+        return report
+    
+    reports = await asyncio.gather(*(fetch_report(champion) for champion in unique.values()))
+    metrics.increment("builds.batch_requests")
+    metrics.increment("builds.batch_champions", len(reports))
+    return list(reports)
+
+
+async def prefetch_champions(champions: list[str]) -> None:
+    """Warm the build and stats caches for champions at background priority.
+    
+    Prefetching is best-effort: a prefetch waits until no interactive lookup is
+    loading before it starts, but once started it runs to completion even if an
+    interactive lookup comes in meanwhile, and failures are only logged.
+    
+    Champions with a fresh snapshot entry or a cached entry are skipped. Each
+    prefetched entry is tracked until it is looked up, so `builds.prefetch.used` /
+    `builds.prefetch.scheduled` tells how much of the prefetching pays off.
+    """
+    semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+    
+    async def prefetch(champion: str, kind: str, cache: AsyncTTLCache, fetch) -> None:
+        champion_key = normalize_champion_name(champion)
+        cache_key = patch_registry.cache_key(champion_key)
+        snapshot_entry = snapshot_store.get(champion_key)
+        if (snapshot_entry is not None and _is_snapshot_fresh(snapshot_entry)) or cache.get(cache_key, allow_stale=True) is not None:
+            metrics.increment("builds.prefetch.skipped")
+            return
         
-        if item_builds_section:
-            # Extract information using Gemini instead of returning raw HTML
-            html_content = item_builds_section.prettify()
-            return await extract_build_info_with_gemini(html_content, champion)
-        else:
-            # If no specific Item Builds section found, try to extract just the section with "Item builds"
-            # Look for any element containing "Item builds" and get its containing section
-            for element in content_container.find_all(text=True):
-                if 'Item builds' in element:
-                    # Find the section containing this text
-                    section = element.find_parent('section')
-                    if section:
-                        html_content = section.prettify()
-                        return await extract_build_info_with_gemini(html_content, champion)
+        async with semaphore:
+            # Interactive lookups go first
+            idle = _interactive_idle_event()
+            while _interactive_loads:
+                await idle.wait()
             
-            # Final fallback: try to extract from content-container
-            html_content = content_container.prettify()
-            return await extract_build_info_with_gemini(html_content, champion)
-    else:
-        # Fallback to the entire HTML if no content-container found
-        return await extract_build_info_with_gemini(html_content, champion)
+            _prefetched[(kind, cache_key)] = None
+            while len(_prefetched) > PREFETCH_MAX_TRACKED:
+                del _prefetched[next(iter(_prefetched))]
+                metrics.increment("builds.prefetch.unused")
+            metrics.increment("builds.prefetch.scheduled")
+            
+            try:
+                await cache.get_or_load(cache_key, lambda: fetch(champion))
+            except Exception as e:
+                _prefetched.pop((kind, cache_key), None)
+                metrics.increment("builds.prefetch.failed")
+                logger.warning(f"Error prefetching {kind} for {champion}: {e}")
+    
+    unique = list(dict.fromkeys(champions))
+    await asyncio.gather(*(
+        prefetch(champion, kind, cache, fetch)
+        for champion in unique
+        for kind, cache, fetch in (
+            ("build", build_cache, fetch_champion_build),
+            ("stats", stats_cache, fetch_champion_stats),
+        )
+    ))
+
+
+def prefetch_match(match: dict[str, Any] | None) -> asyncio.Task | None:
+    """Start prefetching the champions of a match in the background.
+    
+    Returns the prefetch task, or None if prefetching is disabled or the match
+    has no champions.
+    """
+    if not PREFETCH_ENABLED or not match:
+        return None
+    champions = champions_in_match(match)
+    if not champions:
+        return None
+    
+    task = asyncio.get_running_loop().create_task(prefetch_champions(champions))
+    _prefetch_tasks.add(task)
+    task.add_done_callback(_prefetch_tasks.discard)
+    return task
+
+
+async def crawl_snapshot(
+    champions: list[str],
+    path: str = SNAPSHOT_PATH,
+    concurrency: int = 4,
+    delay: float = 1.0
+) -> tuple[int, dict[str, str]]:
+    """Fetch the build and stats of every champion from OP.GG and write them to a snapshot.
+    
+    At most `concurrency` champions are fetched at once, and page fetches start at
+    least `delay` seconds apart so the crawl stays polite to OP.GG. Champions whose
+    build or stats cannot be fetched are left out of the snapshot (or written with
+    whatever could be fetched) and reported.
+    Returns the number of champions written and the error for each failed champion.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    rate_limiter = RateLimiter(delay)
+    entries: list[SnapshotEntry] = []
+    errors: dict[str, str] = {}
+    
+    async def crawl(champion: str) -> None:
+        champion_key = normalize_champion_name(champion)
+        async with semaphore:
+            await rate_limiter.wait()
+            try:
+                stats = await fetch_champion_stats(champion)
+            except ChampionDataError as e:
+                errors[champion_key] = str(e)
+                return
+            try:
+                build = await fetch_champion_build(champion)
+            except Exception as e:
+                errors[champion_key] = f"Build unavailable: {e}"
+                build = None
+        
+        entries.append(SnapshotEntry(
+            champion=champion_key,
+            patch=stats.patch,
+            fetched_at=time.time(),
+            build_json=build.model_dump_json(exclude_none=True) if build is not None else None,
+            stats_json=stats.model_dump_json(exclude_none=True)
+        ))
+        metrics.increment("builds.snapshot_crawled")
+    
+    await asyncio.gather(*(crawl(champion) for champion in champions))
+    
+    written = write_snapshot(path, sorted(entries, key=lambda entry: entry.champion), patch_registry.current)
+    return written, errors
+
+
+def _format_rate(value: float | None) -> str:
+    return f"{value:.2f}%" if value is not None else "n/a"
+
+
+def _format_option(option: ItemBuildOption) -> str:
+    games = f", {option.games:,} games" if option.games else ""
+    return f"{' > '.join(option.items)} ({option.pick_rate:.2f}% pick, {option.win_rate:.2f}% win{games})"
+
+
+def format_build_text(build: ChampionBuild) -> str:
+    """Render a build as compact text for the LLM, one line per option."""
+    source = "extracted by Gemini" if build.source == "gemini" else "OP.GG"
+    lines = [f"{build.champion.title()} build | patch {build.patch or 'unknown'} | {source}"]
+    
+    for title, options in [
+        ("Starter", build.starter_items),
+        ("Core", build.core_items),
+        ("Boots", build.boots),
+        ("Situational", build.situational_items),
+    ]:
+        if options:
+            lines.append(f"{title}:")
+            lines.extend(f"- {_format_option(option)}" for option in options)
+    
+    return "\n".join(lines)
+
+
+def format_stats_text(stats: ChampionStats) -> str:
+    """Render champion statistics as compact text for the LLM."""
+    games = f"{stats.games_played:,}" if stats.games_played is not None else "n/a"
+    tier = stats.tier if stats.tier is not None else "n/a"
+    return (
+        f"{stats.champion} stats | patch {stats.patch or 'unknown'} | {stats.position or 'unknown position'}\n"
+        f"Tier {tier} | Win {_format_rate(stats.win_rate)} | Pick {_format_rate(stats.pick_rate)} | "
+        f"Ban {_format_rate(stats.ban_rate)} | {games} games"
+    )
+
+
+def render_payload(payload: ChampionBuild | ChampionStats, output_format: str) -> str:
+    """Render a build or stats payload as compact text ("text") or JSON ("json")."""
+    if output_format == "json":
+        return payload.model_dump_json(exclude_none=True)
+    if isinstance(payload, ChampionBuild):
+        return format_build_text(payload)
+    return format_stats_text(payload)
+
+
+def format_reports_text(reports: list[ChampionReport]) -> str:
+    """Render bulk lookup reports as compact text, one section per champion."""
+    sections = []
+    for report in reports:
+        lines = []
+        if report.build is not None:
+            lines.append(format_build_text(report.build))
+        if report.stats is not None:
+            lines.append(format_stats_text(report.stats))
+        lines.extend(f"Error: {error}" for error in report.errors)
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections)
+
+
+@mcp.tool()
+async def get_champion_build(champion: str, output_format: str = "text") -> str:
+    """Get comprehensive build information for a League of Legends champion from OP.GG.
+
+    This tool provides detailed build analysis including:
+    - Starting items
+    - Core item combinations with pick rates and win rates
+    - Recommended boots with usage statistics
+    - Situational 4th/5th/last items
+    - Games played for each option
+
+    Args:
+        champion: Champion name (e.g. jinx, yasuo, ahri)
+        output_format: "text" for a compact summary (default) or "json" for the
+            typed build payload
+        
+    Returns:
+        Build data containing, per category (Starter, Core, Boots, Situational),
+        the item options in build order with pick rate, win rate and games played.
+        
+    Example output:
+        "Jinx build | patch 14.23 | OP.GG
+         Core:
+         - Yun Tal Wildarrows > Infinity Edge > Phantom Dancer (34.19% pick, 60.58% win, 15,044 games)
+         Boots:
+         - Berserker's Greaves (89.70% pick, 52.40% win, 39,210 games)"
+    """
+    if output_format not in OUTPUT_FORMATS:
+        return f"Unsupported output_format {output_format!r}. Use one of: {', '.join(OUTPUT_FORMATS)}."
+    
+    try:
+        build = await get_cached_build(champion)
+    except ChampionDataError as e:
+        return str(e)
+    return render_payload(build, output_format)
 
 
 @mcp.tool()
-async def get_champion_stats(champion: str) -> str:
+async def get_champion_stats(champion: str, output_format: str = "text") -> str:
     """Get detailed performance statistics for a League of Legends champion from OP.GG.
 
     This tool provides current meta statistics and performance metrics including:
@@ -377,6 +1096,8 @@ async def get_champion_stats(champion: str) -> str:
 
     Args:
         champion: Champion name (e.g. jinx, yasuo, ahri)
+        output_format: "text" for a compact summary (default) or "json" for the
+            typed stats payload
         
     Returns:
         Statistical overview containing:
@@ -389,105 +1110,60 @@ async def get_champion_stats(champion: str) -> str:
         * **Ban Rate**: How often the champion is banned
         
     Example output:
-        "=== Jinx Statistics ===
-         Patch: Version: 14.23
-         Position: Bottom
-         Tier: 1 Tier
-         Games Played: 125,847
-         Win Rate: 52.97%
-         Pick Rate: 8.45%
-         Ban Rate: 2.1%"
+        "Jinx stats | patch 14.23 | Bottom
+         Tier 1 | Win 52.97% | Pick 8.45% | Ban 2.10% | 125,847 games"
     """
-    # Normalize champion name for URL
-    champion_lower = champion.lower().replace(' ', '').replace("'", "")
-    url = f"{OPGG_BASE}/lol/champions/{champion_lower}/build"
-    
-    html_content = await make_opgg_request(url)
-    
-    if not html_content:
-        return f"Unable to fetch stats for {champion}. Please check the champion name and try again."
-    
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Extract more detailed statistics
-    stats_info = {
-        "champion_name": "",
-        "tier": "",
-        "win_rate": "",
-        "pick_rate": "",
-        "ban_rate": "",
-        "patch_version": "",
-        "games_played": "",
-        "position": ""
-    }
+    if output_format not in OUTPUT_FORMATS:
+        return f"Unsupported output_format {output_format!r}. Use one of: {', '.join(OUTPUT_FORMATS)}."
     
     try:
-        # Extract champion name
-        title_elem = soup.find('h1')
-        if title_elem:
-            stats_info["champion_name"] = title_elem.get_text().strip()
-        
-        # Extract detailed stats from text
-        stats_text = soup.get_text()
-        
-        # Extract patch version
-        patch_match = re.search(r'Version: (\d+\.\d+)', stats_text)
-        if patch_match:
-            stats_info["patch_version"] = f"Version: {patch_match.group(1)}"
-        
-        # Extract position
-        position_match = re.search(r'for (Bottom|Top|Mid|Jungle|Support)', stats_text)
-        if position_match:
-            stats_info["position"] = position_match.group(1)
-        
-        # Look for games played
-        games_match = re.search(r'(\d{1,3}(?:,\d{3})*)\s+games', stats_text)
-        if games_match:
-            stats_info["games_played"] = games_match.group(1)
-        
-        # Extract tier
-        tier_match = re.search(r'(\d+)\s+Tier', stats_text)
-        if tier_match:
-            tier_num = tier_match.group(1)
-            # Fix the tier number if it's too large (like 141)
-            if int(tier_num) > 5:
-                tier_num = "1"  # Default to tier 1 if parsing error
-            stats_info["tier"] = f"{tier_num} Tier"
-        
-        # Extract win/pick/ban rates
-        win_rate_match = re.search(r'Win rate.*?(\d+\.\d+)%', stats_text)
-        if win_rate_match:
-            stats_info["win_rate"] = win_rate_match.group(1) + "%"
-        
-        pick_rate_match = re.search(r'Pick rate.*?(\d+\.\d+)%', stats_text)
-        if pick_rate_match:
-            stats_info["pick_rate"] = pick_rate_match.group(1) + "%"
-        
-        ban_rate_match = re.search(r'Ban rate.*?(\d+\.\d+)%', stats_text)
-        if ban_rate_match:
-            stats_info["ban_rate"] = ban_rate_match.group(1) + "%"
-    
-    except Exception as e:
-        print(f"Error parsing stats: {e}")
-    
-    # Format the statistics
-    if not stats_info["champion_name"]:
-        stats_info["champion_name"] = champion.title()
-    
-    output = f"""
-=== {stats_info['champion_name']} Statistics ===
+        stats = await get_cached_stats(champion)
+    except ChampionDataError as e:
+        return str(e)
+    return render_payload(stats, output_format)
 
-Patch: {stats_info['patch_version']}
-Position: {stats_info['position']}
-Tier: {stats_info['tier']}
-Games Played: {stats_info['games_played']}
 
-Win Rate: {stats_info['win_rate']}
-Pick Rate: {stats_info['pick_rate']}
-Ban Rate: {stats_info['ban_rate']}
-"""
+@mcp.tool()
+async def get_champions_builds(
+    champions: list[str] | None = None,
+    match: dict[str, Any] | None = None,
+    include: str = "both",
+    output_format: str = "text"
+) -> str:
+    """Get builds and statistics for several League of Legends champions from OP.GG at once.
+
+    Use this instead of calling get_champion_build / get_champion_stats once per
+    champion, e.g. for the player's champion and the enemy team. All champions are
+    fetched concurrently; if some cannot be found, the others are still returned
+    along with an error line for each failure.
+
+    Args:
+        champions: Champion names (e.g. ["jinx", "thresh", "lux"]), up to 10
+        match: A match payload; every participant's champion is looked up
+            (used when `champions` is not given)
+        include: "both" (default), "build" or "stats"
+        output_format: "text" for compact summaries (default) or "json" for a list
+            of typed reports with "champion", "build", "stats" and "errors"
+        
+    Returns:
+        One section per champion with its build and/or stats, in the order given.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        return f"Unsupported output_format {output_format!r}. Use one of: {', '.join(OUTPUT_FORMATS)}."
+    if include not in BATCH_INCLUDES:
+        return f"Unsupported include {include!r}. Use one of: {', '.join(BATCH_INCLUDES)}."
     
-    return output.strip()
+    if not champions and match:
+        champions = champions_in_match(match)
+    if not champions:
+        return "No champions given. Pass a list of champion names or a match."
+    if len(champions) > MAX_BATCH_CHAMPIONS:
+        return f"Too many champions ({len(champions)}). Ask for at most {MAX_BATCH_CHAMPIONS} at once."
+    
+    reports = await fetch_champion_reports(champions, include)
+    if output_format == "json":
+        return "[" + ",".join(report.model_dump_json(exclude_none=True) for report in reports) + "]"
+    return format_reports_text(reports)
 
 
 if __name__ == "__main__":
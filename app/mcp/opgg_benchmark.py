@@ -0,0 +1,128 @@
+"""
+OP.GG Benchmark Corpus
+
+A corpus is a directory of OP.GG build pages (<champion>.html) with golden
+outputs (<champion>.golden.json), used to test and benchmark the builds MCP
+scraping pipeline without network access. Callers pass the corpus directory;
+the pages checked in under tests/fixtures/opgg are synthetic, hand-made in
+OP.GG's markup, until real pages are recorded with the benchmark CLI.
+
+- The corpus can be served to httpx through `fixture_transport`, a local
+  stand-in for OP.GG's build page URLs
+- `score_extraction` compares a parsed page with its golden output
+- `benchmark_champion` reports parse latency, peak parse memory, accuracy
+  and the prompt tokens the Gemini fallback would send
+"""
+
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.mcp.builds_mcp import ChampionPage, compact_prompt_content, parse_champion_page
+from app.mcp.opgg_parser import is_confident_build
+from app.utils.tokens import count_tokens
+
+# Build categories compared against the golden outputs
+BUILD_CATEGORIES = ["starter_items", "core_items", "boots", "situational_items"]
+
+
+def load_corpus(fixtures_dir: Path) -> Dict[str, str]:
+    """Load the recorded pages of the corpus, keyed by champion slug."""
+    return {
+        path.stem: path.read_text(encoding="utf-8")
+        for path in sorted(fixtures_dir.glob("*.html"))
+    }
+
+
+def load_golden(champion: str, fixtures_dir: Path) -> Optional[Dict[str, Any]]:
+    """Load the golden output for a champion, if one was recorded."""
+    path = fixtures_dir / f"{champion}.golden.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def page_to_golden(page: ChampionPage) -> Dict[str, Any]:
+    """Convert a parsed page into the golden output format."""
+    return {
+        "confident": is_confident_build(page.build),
+        "stats": page.stats.model_dump(),
+        "build": page.build.model_dump(),
+    }
+
+
+def score_extraction(page: ChampionPage, golden: Dict[str, Any]) -> float:
+    """Score a parsed page against its golden output as the fraction of matching fields.
+
+    Every stats field counts once, and so does every build option, matched by position
+    within its category. Missing and extra options both count as mismatches.
+    """
+    parsed = page_to_golden(page)
+    matched = total = 0
+
+    for field, expected in golden["stats"].items():
+        total += 1
+        matched += parsed["stats"].get(field) == expected
+
+    for category in BUILD_CATEGORIES:
+        expected_options = golden["build"][category]
+        parsed_options = parsed["build"][category]
+        total += max(len(expected_options), len(parsed_options))
+        matched += sum(expected == actual for expected, actual in zip(expected_options, parsed_options))
+
+    total += 1
+    matched += parsed["confident"] == golden["confident"]
+
+    return matched / total if total else 1.0
+
+
+def benchmark_champion(champion: str, html_content: str, golden: Optional[Dict[str, Any]], runs: int = 5) -> Dict[str, Any]:
+    """Benchmark the parsing pipeline on one recorded page."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        page = parse_champion_page(html_content, champion)
+        timings.append(time.perf_counter() - started)
+
+    # Measure memory on a separate run, since tracing slows parsing down
+    tracemalloc.start()
+    try:
+        page = parse_champion_page(html_content, champion)
+    finally:
+        tracemalloc.stop()
+
+    prompt_content = compact_prompt_content(page.item_builds_html)
+    return {
+        "champion": champion,
+        "page_kb": round(len(html_content.encode("utf-8")) / 1024, 1),
+        "parse_ms": round(statistics.median(timings) * 1000, 2),
+        "peak_kb": round((page.parse_peak_bytes or 0) / 1024, 1),
+        "confident": is_confident_build(page.build),
+        "accuracy": round(score_extraction(page, golden), 3) if golden else None,
+        "raw_tokens": count_tokens(page.item_builds_html),
+        "prompt_tokens": count_tokens(prompt_content),
+    }
+
+
+def fixture_transport(fixtures_dir: Path) -> httpx.MockTransport:
+    """Create an httpx transport serving the corpus at OP.GG's build page URLs."""
+    corpus = load_corpus(fixtures_dir)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.strip("/").split("/")
+        if len(parts) == 4 and parts[:2] == ["lol", "champions"] and parts[3] == "build" and parts[2] in corpus:
+            return httpx.Response(200, text=corpus[parts[2]], headers={"Content-Type": "text/html; charset=utf-8"})
+        return httpx.Response(404, text="Not Found")
+
+    return httpx.MockTransport(handler)
+
+
+def write_golden(champion: str, page: ChampionPage, fixtures_dir: Path) -> None:
+    """Write the golden output of a champion from a parsed page."""
+    path = fixtures_dir / f"{champion}.golden.json"
+    path.write_text(json.dumps(page_to_golden(page), indent=2) + "\n", encoding="utf-8")
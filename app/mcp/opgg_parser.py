@@ -0,0 +1,161 @@
+"""
+OP.GG Build Parser
+
+Deterministic extractor for the item build tables on an OP.GG champion build
+page. Each table is classified from its caption/header text (starter items,
+core items, boots or situational 4th/5th/last items), and every row yields
+the item names and ids (from the item images' alt text and src) with the
+row's pick rate, win rate and game count.
+
+The result is only trusted when it passes `is_confident_build`; otherwise
+the caller falls back to LLM extraction.
+
+Pages are parsed with lxml (a pinned requirement; or the backend named by
+OPGG_HTML_PARSER), falling back to Python's built-in html.parser when it is
+not installed, and only the regions the tools read are turned into a tree.
+"""
+
+import os
+import re
+from typing import List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+from app.models.builds import ChampionBuild, ItemBuildOption
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_HTML_PARSER = "lxml"
+except ImportError:
+    DEFAULT_HTML_PARSER = "html.parser"
+
+HTML_PARSER = os.getenv("OPGG_HTML_PARSER", DEFAULT_HTML_PARSER)
+
+# Page regions read by the tools: the champion title, the stats header and the main content
+PAGE_REGION_IDS = ("content-header", "content-container")
+
+# Minimum number of core builds / boot options for a parse to be trusted
+MIN_CORE_OPTIONS = 2
+MIN_BOOT_OPTIONS = 1
+
+PERCENT_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*%')
+ITEM_ID_PATTERN = re.compile(r'/item/(\d+)\.')
+GAMES_PATTERN = re.compile(r'(?<![\d.,])(\d{1,3}(?:,\d{3})+|\d{3,})(?![\d.,%])')
+
+# Keywords identifying each table, checked in order (boots before core: "Core boots" are boots)
+TABLE_CATEGORIES = [
+    ("starter_items", ("starter", "starting")),
+    ("boots", ("boots",)),
+    ("core_items", ("core",)),
+    ("situational_items", ("4th", "5th", "6th", "last item", "situational")),
+]
+
+
+def _is_page_region(name: str, attrs: dict) -> bool:
+    return name == 'h1' or attrs.get('id') in PAGE_REGION_IDS
+
+
+PAGE_REGIONS = SoupStrainer(_is_page_region)
+
+
+def parse_page_regions(html_content: str) -> BeautifulSoup:
+    """Parse only the regions of an OP.GG page the tools read, or the whole page if its layout is unexpected."""
+    soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=PAGE_REGIONS)
+    if soup.find(id='content-container') is None:
+        soup = BeautifulSoup(html_content, HTML_PARSER)
+    return soup
+
+
+def classify_table(table: Tag) -> Optional[str]:
+    """Classify an item table from its caption, header cells or nearest preceding heading."""
+    header_parts = []
+    caption = table.find('caption')
+    if caption:
+        header_parts.append(caption.get_text(" "))
+    header_parts.extend(th.get_text(" ") for th in table.find_all('th'))
+    if not header_parts:
+        heading = table.find_previous(['h2', 'h3', 'h4', 'h5'])
+        if heading:
+            header_parts.append(heading.get_text(" "))
+    
+    header_text = " ".join(header_parts).lower()
+    for category, keywords in TABLE_CATEGORIES:
+        if any(keyword in header_text for keyword in keywords):
+            return category
+    return None
+
+
+def _win_rate_first(table: Tag) -> bool:
+    """Check whether the table lists the win rate column before the pick rate column."""
+    headers = [th.get_text(" ").lower() for th in table.find_all('th')]
+    pick_index = next((i for i, text in enumerate(headers) if 'pick' in text), None)
+    win_index = next((i for i, text in enumerate(headers) if 'win' in text), None)
+    return pick_index is not None and win_index is not None and win_index < pick_index
+
+
+def parse_item_row(row: Tag, win_rate_first: bool = False) -> Optional[ItemBuildOption]:
+    """Parse one table row into an item build option, or None if it is not an item row."""
+    images = [img for img in row.find_all('img') if img.get('alt', '').strip()]
+    if not images:
+        return None
+    
+    items = [img['alt'].strip() for img in images]
+    id_matches = [ITEM_ID_PATTERN.search(img.get('src', '')) for img in images]
+    # Only keep ids when every item has one, so they line up with the names
+    item_ids = [int(match.group(1)) for match in id_matches] if all(id_matches) else []
+    
+    row_text = row.get_text(" ")
+    percentages = [float(value) for value in PERCENT_PATTERN.findall(row_text)]
+    if len(percentages) < 2:
+        return None
+    
+    pick_rate, win_rate = percentages[0], percentages[1]
+    if win_rate_first:
+        pick_rate, win_rate = win_rate, pick_rate
+    
+    games_match = GAMES_PATTERN.search(PERCENT_PATTERN.sub(" ", row_text))
+    games = int(games_match.group(1).replace(',', '')) if games_match else None
+    
+    return ItemBuildOption(items=items, item_ids=item_ids, pick_rate=pick_rate, win_rate=win_rate, games=games)
+
+
+def parse_champion_build(root: Tag, champion: str) -> ChampionBuild:
+    """Extract every recognised item build table below `root` into a typed build."""
+    build = ChampionBuild(champion=champion)
+    
+    for table in root.find_all('table'):
+        category = classify_table(table)
+        if category is None:
+            continue
+        
+        win_rate_first = _win_rate_first(table)
+        body = table.find('tbody') or table
+        options: List[ItemBuildOption] = getattr(build, category)
+        for row in body.find_all('tr'):
+            option = parse_item_row(row, win_rate_first)
+            if option:
+                options.append(option)
+    
+    # Most popular first, as OP.GG lists them
+    for category, _ in TABLE_CATEGORIES:
+        getattr(build, category).sort(key=lambda option: option.pick_rate, reverse=True)
+    
+    return build
+
+
+def parse_champion_build_html(html_content: str, champion: str) -> ChampionBuild:
+    """Parse item builds from raw OP.GG HTML."""
+    return parse_champion_build(BeautifulSoup(html_content, HTML_PARSER), champion)
+
+
+def is_confident_build(build: ChampionBuild) -> bool:
+    """Check that a parsed build is complete and plausible enough to skip LLM extraction."""
+    if len(build.core_items) < MIN_CORE_OPTIONS or len(build.boots) < MIN_BOOT_OPTIONS:
+        return False
+    
+    options = build.starter_items + build.core_items + build.boots + build.situational_items
+    if not all(0 < option.pick_rate <= 100 and 0 <= option.win_rate <= 100 for option in options):
+        return False
+    
+    # Pick rates of alternatives in one table cannot add up to more than 100%
+    return sum(option.pick_rate for option in build.core_items) <= 100.5
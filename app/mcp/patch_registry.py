@@ -0,0 +1,128 @@
+"""
+Patch Registry
+
+Tracks the current League of Legends patch, as reported by scraped OP.GG
+pages ("Version: 14.23") or by Data Dragon's version list ("14.23.1").
+Champion data caches are keyed by patch, and listeners registered with
+`on_rollover` are told when a newer patch is seen so they can drop the old
+patch's entries and re-warm the most popular champions.
+"""
+
+import re
+from collections import Counter
+from typing import Callable, List, Optional, Tuple
+
+import httpx
+
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+from app.utils.static_data import DDRAGON_VERSIONS_URL
+
+logger = get_logger("patch_registry")
+
+PATCH_PATTERN = re.compile(r'(\d+)\.(\d+)')
+
+RolloverListener = Callable[[Optional[str], str], None]
+
+
+def normalize_patch(version: Optional[str]) -> Optional[str]:
+    """Reduce a game version ("14.23.1", "Version: 14.23") to its patch ("14.23")."""
+    if not version:
+        return None
+    match = PATCH_PATTERN.search(version)
+    return f"{int(match.group(1))}.{int(match.group(2))}" if match else None
+
+
+def _patch_key(patch: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in patch.split('.'))
+
+
+class PatchRegistry:
+    """
+    The current game patch, plus lookup counts used to pick champions to re-warm.
+
+    Patches only move forward: an older patch (e.g. from an OP.GG page that has
+    not caught up with a new Data Dragon release yet) never replaces a newer one.
+    """
+
+    def __init__(self, current: Optional[str] = None):
+        self.current = normalize_patch(current)
+        self._listeners: List[RolloverListener] = []
+        self._lookups: Counter = Counter()
+
+    def on_rollover(self, listener: RolloverListener) -> None:
+        """Register a callback run with (old_patch, new_patch) when the patch changes."""
+        self._listeners.append(listener)
+
+    def observe(self, version: Optional[str], source: str = "opgg") -> bool:
+        """Record a patch seen in scraped data or Data Dragon.
+
+        Args:
+            version: Game version or patch string
+            source: Where the version came from, for logging
+
+        Returns:
+            True if the version was a newer patch and a rollover happened
+        """
+        patch = normalize_patch(version)
+        if patch is None or patch == self.current:
+            return False
+        if self.current is not None and _patch_key(patch) < _patch_key(self.current):
+            return False
+
+        previous, self.current = self.current, patch
+        if previous is None:
+            logger.info(f"Current patch is {patch} (from {source})")
+            return False
+
+        logger.info(f"Patch rollover {previous} -> {patch} (from {source})")
+        metrics.increment("patches.rollovers")
+        for listener in self._listeners:
+            try:
+                listener(previous, patch)
+            except Exception as e:
+                logger.error(f"Patch rollover listener failed: {e}")
+        return True
+
+    def is_outdated(self, patch: Optional[str]) -> bool:
+        """Check whether data for `patch` is older than the current patch."""
+        patch = normalize_patch(patch)
+        if patch is None or self.current is None:
+            return False
+        return _patch_key(patch) < _patch_key(self.current)
+
+    def cache_key(self, key: str) -> Tuple[str, str]:
+        """Key cached data by the current patch."""
+        return (self.current or "unknown", key)
+
+    def record_lookup(self, champion: str) -> None:
+        """Count a lookup of a champion, to know which ones to re-warm on rollover."""
+        self._lookups[champion] += 1
+
+    def popular_champions(self, limit: int) -> List[str]:
+        """Get the most looked-up champions, most popular first."""
+        return [champion for champion, _ in self._lookups.most_common(limit)]
+
+    async def refresh_from_ddragon(self, client: Optional[httpx.AsyncClient] = None) -> Optional[str]:
+        """Fetch the latest game version from Data Dragon and record its patch.
+
+        Returns:
+            The current patch after the refresh
+        """
+        try:
+            if client is None:
+                async with httpx.AsyncClient(timeout=10.0) as own_client:
+                    response = await own_client.get(DDRAGON_VERSIONS_URL)
+            else:
+                response = await client.get(DDRAGON_VERSIONS_URL)
+            response.raise_for_status()
+            versions = response.json()
+            if versions:
+                self.observe(versions[0], source="ddragon")
+        except Exception as e:
+            logger.warning(f"Could not refresh the current patch from Data Dragon: {e}")
+        return self.current
+
+
+# Create a singleton instance
+patch_registry = PatchRegistry()
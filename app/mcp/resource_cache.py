@@ -0,0 +1,164 @@
+"""
+MCP Resource Cache
+
+The league-mcp server's ddragon:// and constants:// resources are static for
+a game version, but reading one costs a round trip through an MCP session
+(and, for Data Dragon, a download on the server side). ResourceCache keeps
+their contents in memory:
+
+- The known resource URIs are preloaded in the background at startup
+- Entries are keyed by the current patch from the patch registry and never
+  expire otherwise; a patch rollover drops them and preloads them again
+- Concurrent reads of an uncached resource share a single MCP read
+"""
+
+import asyncio
+import re
+import weakref
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from app.mcp.patch_registry import PatchRegistry, patch_registry
+from app.utils.cache import AsyncTTLCache
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+
+logger = get_logger("resource_cache")
+
+# Resources of the league-mcp server that only change with the game version
+STATIC_RESOURCE_URIS = (
+    "ddragon://versions",
+    "ddragon://languages",
+    "ddragon://champions",
+    "ddragon://champion_data",
+    "ddragon://items",
+    "ddragon://summoner_spells",
+    "constants://queues",
+    "constants://maps",
+    "constants://game_modes",
+    "constants://game_types",
+    "constants://seasons",
+    "constants://ranked_tiers",
+    "constants://routing",
+)
+
+CACHED_SCHEMES = ("ddragon://", "constants://")
+
+RESOURCE_URI_PATTERN = re.compile(r'\b(?:ddragon|constants)://[\w.-]+')
+
+PRELOAD_CONCURRENCY = 2
+
+ResourceLoader = Callable[[str], Awaitable[Optional[str]]]
+
+
+class ResourceNotFoundError(LookupError):
+    """Raised when the MCP server returns no content for a resource."""
+
+
+def find_resource_uri(text: str) -> Optional[str]:
+    """Get the first ddragon:// or constants:// URI in a text, if any."""
+    match = RESOURCE_URI_PATTERN.search(text)
+    return match.group(0) if match else None
+
+
+class ResourceCache:
+    """
+    In-memory cache of static MCP resources, invalidated when the patch changes.
+    """
+
+    def __init__(self, loader: ResourceLoader, registry: PatchRegistry = patch_registry, maxsize: int = 64):
+        """
+        Args:
+            loader: Reads a resource from the MCP server; returns None if it is empty
+            registry: Patch registry whose current patch keys the cached entries
+            maxsize: Maximum number of cached resources
+        """
+        self._loader = loader
+        self._registry = registry
+        self._cache: AsyncTTLCache[str] = AsyncTTLCache(
+            "mcp_resources", maxsize=maxsize, ttl=float("inf"), stale_ttl=0
+        )
+        self._preload_tasks: Set[asyncio.Task] = set()
+        _caches.add(self)
+
+    @staticmethod
+    def is_cacheable(uri: str) -> bool:
+        return uri.startswith(CACHED_SCHEMES)
+
+    async def _load(self, uri: str) -> str:
+        content = await self._loader(uri)
+        if not content:
+            # Not cached, so the resource is read again next time
+            raise ResourceNotFoundError(uri)
+        return content
+
+    async def get(self, uri: str) -> str:
+        """
+        Get a resource's content, reading it from the MCP server on a miss.
+
+        Raises:
+            ResourceNotFoundError: If the server has no content for the resource
+        """
+        return await self._cache.get_or_load(self._registry.cache_key(uri), lambda: self._load(uri))
+
+    def cached(self, uri: str) -> Optional[str]:
+        """Get a resource's content if it is cached for the current patch."""
+        return self._cache.get(self._registry.cache_key(uri))
+
+    async def preload(self, uris: Iterable[str] = STATIC_RESOURCE_URIS) -> Dict[str, str]:
+        """
+        Read resources into the cache, a few at a time.
+
+        Returns:
+            The error of each resource that could not be read
+        """
+        semaphore = asyncio.Semaphore(PRELOAD_CONCURRENCY)
+        errors: Dict[str, str] = {}
+
+        async def load(uri: str) -> None:
+            async with semaphore:
+                try:
+                    await self.get(uri)
+                    metrics.increment("mcp_resources.preloaded")
+                except Exception as e:
+                    errors[uri] = str(e) or type(e).__name__
+
+        await asyncio.gather(*(load(uri) for uri in uris))
+        if errors:
+            logger.warning(f"Could not preload {len(errors)} MCP resources: {', '.join(sorted(errors))}")
+        return errors
+
+    def schedule_preload(self, uris: Iterable[str] = STATIC_RESOURCE_URIS) -> Optional[asyncio.Task]:
+        """Preload resources in the background; None if there is no running event loop."""
+        try:
+            task = asyncio.get_running_loop().create_task(self.preload(list(uris)))
+        except RuntimeError:
+            return None
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._preload_tasks.add(task)
+        task.add_done_callback(self._preload_tasks.discard)
+        return task
+
+    def invalidate_outdated(self, current_patch: str) -> int:
+        """Drop every resource that is not from `current_patch`."""
+        return self._cache.invalidate_where(lambda key: key[0] != current_patch)
+
+    def close(self) -> None:
+        """Cancel background preloads and drop every cached resource."""
+        for task in list(self._preload_tasks):
+            task.cancel()
+        self._cache.clear()
+        _caches.discard(self)
+
+
+# Caches to refresh on patch rollover, without keeping closed ones alive
+_caches: "weakref.WeakSet[ResourceCache]" = weakref.WeakSet()
+
+
+def _on_patch_rollover(previous_patch: Optional[str], current_patch: str) -> None:
+    for cache in list(_caches):
+        dropped = cache.invalidate_outdated(current_patch)
+        metrics.increment("mcp_resources.rollover_invalidations", dropped)
+        cache.schedule_preload()
+
+
+patch_registry.on_rollover(_on_patch_rollover)
@@ -0,0 +1,322 @@
+"""
+MCP Session Pool
+
+Tools returned by MultiServerMCPClient.get_tools() open a new session for
+every call, which for a stdio server means spawning a fresh server process
+and repeating the MCP initialize handshake. MCPSessionPool instead keeps a
+fixed number of initialized sessions alive for one server and hands them out
+to callers in FIFO order.
+
+- Sessions are health checked in the background with MCP pings
+- A session that fails its health check (e.g. the server process crashed)
+  is respawned before it is handed out again
+- Tools, resources and prompts are all served from pooled sessions
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from langchain_core.documents.base import Blob
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.prompts import load_mcp_prompt
+from langchain_mcp_adapters.resources import load_mcp_resources
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import ClientSession
+from mcp.types import CallToolResult, TextContent
+
+from app.utils.logger import get_logger
+from app.utils.match_encoding import alias_puuids, resolve_aliases
+from app.utils.metrics import metrics
+
+logger = get_logger("mcp_session_pool")
+
+
+def convert_call_tool_result(result: CallToolResult) -> Tuple[str | List[str], Optional[List[Any]]]:
+    """
+    Convert an MCP tool result into LangChain (content, artifact) form.
+
+    Text blocks become the content, one string if there is a single block, with
+    player PUUIDs replaced by their aliases; other blocks (images, embedded
+    resources) are returned as the artifact.
+
+    Raises:
+        ToolException: If the server reported the call as failed
+    """
+    texts = [alias_puuids(block.text) for block in result.content if isinstance(block, TextContent)]
+    artifact = [block for block in result.content if not isinstance(block, TextContent)]
+    content: str | List[str] = texts[0] if len(texts) == 1 else (texts or "")
+
+    if result.isError:
+        raise ToolException(content)
+    return content, artifact or None
+
+
+class PooledSession:
+    """
+    A single MCP session kept open by a dedicated owner task.
+
+    The MCP transports are built on anyio task groups, which must be entered
+    and exited by the same task, so each session lives inside its own task
+    for its whole lifetime.
+    """
+
+    def __init__(self, client: MultiServerMCPClient, server_name: str, index: int):
+        self.client = client
+        self.server_name = server_name
+        self.index = index
+        self.session: Optional[ClientSession] = None
+        self.needs_check = False
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def is_alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """
+        Open the session and wait until it is initialized.
+        """
+        ready = asyncio.get_running_loop().create_future()
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(
+            self._run(ready, self._stop),
+            name=f"mcp-session-{self.server_name}-{self.index}"
+        )
+        await ready
+
+    async def _run(self, ready: asyncio.Future, stop: asyncio.Event) -> None:
+        try:
+            async with self.client.session(self.server_name) as session:
+                self.session = session
+                ready.set_result(None)
+                await stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"MCP session {self.index} for {self.server_name} exited: {e}")
+        finally:
+            self.session = None
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Close the session and wait for its owner task to finish.
+        """
+        if self._task is None:
+            return
+
+        self._stop.set()
+        try:
+            # wait_for cancels the owner task if it does not exit in time
+            await asyncio.wait_for(self._task, timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Error closing MCP session {self.index} for {self.server_name}: {e}")
+        finally:
+            self._task = None
+            self.session = None
+
+    async def restart(self) -> None:
+        """
+        Replace the session with a freshly spawned one.
+        """
+        logger.warning(f"Respawning MCP session {self.index} for {self.server_name}")
+        await self.stop()
+        await self.start()
+        metrics.increment("mcp_pool.respawns")
+
+    async def ping(self, timeout: float) -> bool:
+        """
+        Check that the server still answers on this session.
+        """
+        if not self.is_alive:
+            return False
+
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"Health check failed for MCP session {self.index} of {self.server_name}: {e}")
+            return False
+
+
+class MCPSessionPool:
+    """
+    Pool of long-lived sessions to a single MCP server.
+    """
+
+    def __init__(
+        self,
+        client: MultiServerMCPClient,
+        server_name: str,
+        size: int = 2,
+        health_check_interval: float = 30.0,
+        checkout_timeout: float = 30.0,
+        ping_timeout: float = 5.0
+    ):
+        self.client = client
+        self.server_name = server_name
+        self.size = max(1, size)
+        self.health_check_interval = health_check_interval
+        self.checkout_timeout = checkout_timeout
+        self.ping_timeout = ping_timeout
+
+        self._slots: List[PooledSession] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        """
+        Spawn and initialize all sessions of the pool.
+
+        Raises:
+            Exception: If any session fails to start; sessions that did start
+                are closed again.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._idle = asyncio.Queue()
+        self._slots = [PooledSession(self.client, self.server_name, i) for i in range(self.size)]
+
+        results = await asyncio.gather(*(slot.start() for slot in self._slots), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            await asyncio.gather(*(slot.stop() for slot in self._slots))
+            raise errors[0]
+
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+
+        if self.health_check_interval > 0:
+            self._health_task = asyncio.create_task(self._health_check_loop())
+
+        logger.info(f"Started {self.size} pooled MCP sessions for {self.server_name}")
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[ClientSession]:
+        """
+        Check out a session for exclusive use.
+
+        Waiting callers are served in the order they arrived.
+
+        Raises:
+            asyncio.TimeoutError: If no session becomes available in time
+        """
+        idle = self._idle
+        if idle is None:
+            raise RuntimeError(f"MCP session pool for {self.server_name} not started")
+
+        slot = await asyncio.wait_for(idle.get(), timeout=self.checkout_timeout)
+        metrics.increment("mcp_pool.checkouts")
+
+        try:
+            await self._ensure_healthy(slot)
+            yield slot.session
+        except (Exception, asyncio.CancelledError):
+            # The failure may come from a broken transport, and a cancelled
+            # call may leave a response unread; check the session before it
+            # is handed out again
+            slot.needs_check = True
+            raise
+        finally:
+            self._release(idle, slot)
+
+    def _release(self, idle: asyncio.Queue, slot: PooledSession) -> None:
+        # Sessions of a closed (or since restarted) pool are not handed out again
+        if self._idle is idle:
+            idle.put_nowait(slot)
+
+    async def _ensure_healthy(self, slot: PooledSession) -> None:
+        if not slot.is_alive or (slot.needs_check and not await slot.ping(self.ping_timeout)):
+            await slot.restart()
+        slot.needs_check = False
+
+    async def _health_check_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            idle = self._idle
+            if idle is None:
+                return
+
+            # Only check sessions that are idle right now
+            for _ in range(idle.qsize()):
+                try:
+                    slot = idle.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+                try:
+                    slot.needs_check = True
+                    await self._ensure_healthy(slot)
+                except Exception as e:
+                    logger.error(f"Failed to respawn MCP session {slot.index} for {self.server_name}: {e}")
+                finally:
+                    self._release(idle, slot)
+
+    async def get_tools(self) -> List[BaseTool]:
+        """
+        Get the server's tools as LangChain tools that run on pooled sessions.
+        """
+        async with self.session() as session:
+            tools = await load_mcp_tools(session)
+
+        return [self._bind_to_pool(tool) for tool in tools]
+
+    def _bind_to_pool(self, tool: BaseTool) -> BaseTool:
+        async def call_tool(**arguments: Dict[str, Any]):
+            # Player aliases of the current match stand in for PUUIDs in prompts
+            async with self.session() as session:
+                call_tool_result = await session.call_tool(tool.name, resolve_aliases(arguments))
+            return convert_call_tool_result(call_tool_result)
+
+        return StructuredTool(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            coroutine=call_tool,
+            response_format="content_and_artifact",
+            metadata=tool.metadata
+        )
+
+    async def get_resources(self, uris: str | List[str] | None = None) -> List[Blob]:
+        """
+        Load resources from the server on a pooled session.
+        """
+        async with self.session() as session:
+            return await load_mcp_resources(session, uris=uris)
+
+    async def get_prompt(
+        self, prompt_name: str, arguments: Optional[Dict[str, Any]] = None
+    ) -> List[HumanMessage | AIMessage]:
+        """
+        Load a prompt from the server on a pooled session.
+        """
+        async with self.session() as session:
+            return await load_mcp_prompt(session, prompt_name, arguments=arguments)
+
+    async def close(self) -> None:
+        """
+        Stop the health checks and close all sessions.
+
+        May be awaited from any event loop; the sessions are closed on the
+        loop that owns them.
+        """
+        if self._loop is None:
+            return
+
+        if asyncio.get_running_loop() is not self._loop:
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.close(), self._loop))
+            return
+
+        if self._health_task:
+            self._health_task.cancel()
+            self._health_task = None
+
+        await asyncio.gather(*(slot.stop() for slot in self._slots))
+        self._slots = []
+        self._idle = None
+        self._loop = None
+        logger.info(f"Closed pooled MCP sessions for {self.server_name}")
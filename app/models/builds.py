@@ -0,0 +1,46 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class ItemBuildOption(BaseModel):
+    """
+    A single item combination with its OP.GG pick and win rates.
+    """
+    items: List[str]
+    item_ids: List[int] = []
+    pick_rate: float
+    win_rate: float
+    games: Optional[int] = None
+
+class ChampionBuild(BaseModel):
+    """
+    Item builds for a champion, as listed on its OP.GG build page.
+    """
+    champion: str
+    patch: Optional[str] = None
+    source: str = "opgg"  # "opgg" when parsed from the page, "gemini" when extracted by the LLM
+    starter_items: List[ItemBuildOption] = []
+    core_items: List[ItemBuildOption] = []
+    boots: List[ItemBuildOption] = []
+    situational_items: List[ItemBuildOption] = []
+
+class ChampionStats(BaseModel):
+    """
+    Meta statistics for a champion, as shown on its OP.GG build page.
+    """
+    champion: str
+    patch: Optional[str] = None
+    position: Optional[str] = None
+    tier: Optional[int] = None
+    win_rate: Optional[float] = None
+    pick_rate: Optional[float] = None
+    ban_rate: Optional[float] = None
+    games_played: Optional[int] = None
+
+class ChampionReport(BaseModel):
+    """
+    Build and stats for one champion of a bulk lookup, with the errors of the parts that failed.
+    """
+    champion: str
+    build: Optional[ChampionBuild] = None
+    stats: Optional[ChampionStats] = None
+    errors: List[str] = []
@@ -40,19 +40,25 @@ async def generate_chatbot_response_stream(
     """
     request_id = request_metadata.get("request_id", "unknown") if request_metadata else "unknown"
     
+    # Keep a handle on the service stream so it is closed together with this
+    # one; a client disconnect then cancels the agent run right away
+    chatbot_stream = None
+    
     try:
         logger.info(
             f"Generating chatbot response stream for thread {thread_id}",
             extra={"request_id": request_id, "query": query, "model": modelName}
         )
         
-        async for chunk in handle_chatbot_request(
+        chatbot_stream = handle_chatbot_request(
             thread_id=thread_id, 
             query=query, 
             modelName=modelName, 
             match=match or {}, 
             language=language
-        ):
+        )
+        
+        async for chunk in chatbot_stream:
             # Handle the ReACT agent streaming format
             if hasattr(chunk, 'content'):
                 # Direct message object
@@ -78,6 +84,9 @@ async def generate_chatbot_response_stream(
             message="Failed to generate chatbot response", 
             detail={"error": str(e)}
         )
+    finally:
+        if chatbot_stream is not None:
+            await chatbot_stream.aclose()
 
 
 @router.post("/")
@@ -1,16 +1,27 @@
 import asyncio
 import logging
 from typing import Optional, Dict, Any, AsyncGenerator
-import threading
-import queue
 
 from app.agents.chatbot_agent import ChatbotAgent
+from app.config import settings
+from app.mcp.builds_mcp import prefetch_match
+from app.mcp.resource_cache import find_resource_uri
+from app.utils.callbacks import EventChannel, ToolCallLogger
 from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+from app.utils.thread_store import ThreadStore, ToolResult, Turn
 
 logger = get_logger("chatbot_services")
 
 _chatbot_agent: Optional[ChatbotAgent] = None
 
+# Conversation history per thread_id, so clients only send the new query
+thread_store = ThreadStore(
+    max_threads=settings.THREAD_STORE_MAX_THREADS,
+    max_turns=settings.THREAD_STORE_MAX_TURNS,
+    db_path=settings.THREAD_STORE_PATH
+)
+
 
 async def startup_mcp_connection():
     global _chatbot_agent
@@ -19,8 +30,8 @@ async def startup_mcp_connection():
         logger.info("Initializing ChatbotAgent and MCP connection...")
         _chatbot_agent = ChatbotAgent()
         
-        _chatbot_agent._start_event_loop()
-        
+        # The agent runs natively on the server's event loop; the background
+        # loop bridge (_start_event_loop/_run_in_loop) is only used by the CLIs
         await _chatbot_agent.connect_to_server()
         logger.info("MCP connection established successfully")
         
@@ -40,6 +51,8 @@ async def shutdown_mcp_connection():
             logger.info("MCP connection shutdown completed")
     except Exception as e:
         logger.error(f"Error during MCP connection shutdown: {e}")
+    finally:
+        thread_store.close()
 
 
 async def handle_chatbot_request(
@@ -61,42 +74,69 @@ async def handle_chatbot_request(
         yield "❌ Chatbot service not connected. Please try again later."
         return
     
+    run_task = None
+    
     try:
         logger.info(f"Processing chatbot request for thread {thread_id}")
         
-        while not _chatbot_agent.message_queue.empty():
-            try:
-                _chatbot_agent.message_queue.get_nowait()
-            except queue.Empty:
-                break
+        # Raw resource URIs (e.g. "ddragon://items") are answered from the
+        # resource cache without running the agent
+        resource_uri = find_resource_uri(query)
+        if resource_uri:
+            metrics.increment("chatbot.resource_answers")
+            yield await _chatbot_agent.get_resource_content("league-mcp", resource_uri)
+            return
         
-        result_container = {"result": None, "error": None, "completed": False}
+        # Start warming the builds and stats of the match's champions before the
+        # agent gets around to asking for them
+        prefetch_match(match if match is not None else _chatbot_agent.get_default_match_data())
         
-        def run_query_async():
-            try:
-                history = []
-                result = _chatbot_agent._run_in_loop(
-                    _chatbot_agent.process_query_async(query, history, match)
-                )
-                result_container["result"] = result
-                result_container["completed"] = True
-            except Exception as e:
-                result_container["error"] = str(e)
-                result_container["completed"] = True
+        # Each request publishes its run's events to its own channel, so
+        # concurrent chats never see or drop each other's events
+        channel = EventChannel()
+        callback_handler = ToolCallLogger(channel)
         
-        query_thread = threading.Thread(target=run_query_async)
-        query_thread.start()
+        # Earlier turns of the thread, trimmed to the history token budget; with a
+        # checkpointer the agent resumes the thread's graph state instead. Reading
+        # a thread that is not in memory touches SQLite, so it runs off the event loop
+        checkpointed = getattr(_chatbot_agent, "checkpointer", None) is not None
+        history = [] if checkpointed else await asyncio.to_thread(
+            thread_store.history, thread_id, settings.THREAD_HISTORY_MAX_TOKENS
+        )
+        
+        # Run the agent as a task on this loop; concurrency scales with
+        # coroutines rather than threads
+        run_task = asyncio.create_task(
+            _chatbot_agent.process_query_async(
+                query, history, match, callback_handler=callback_handler, thread_id=thread_id
+            )
+        )
+        run_task.add_done_callback(lambda _: channel.close())
+        metrics.increment("chatbot.runs_started")
         
         current_tool = None
+        current_input = ""
+        tool_results = []
         tool_messages_sent = []
+        answer_streaming = False
+        tokens_streamed = False
         
-        while not result_container["completed"]:
+        # Relay events as they arrive; the channel is closed once the run has
+        # finished and every event it published has been forwarded
+        async for message_type, *args in channel:
             try:
-                message_type, *args = _chatbot_agent.message_queue.get(timeout=0.5)
+                if message_type == "token":
+                    if tool_messages_sent and not answer_streaming:
+                        yield "\n" + "="*50 + "\n"
+                    answer_streaming = True
+                    tokens_streamed = True
+                    yield args[0]
                 
-                if message_type == "tool_start":
+                elif message_type == "tool_start":
                     tool_name, input_str = args
                     current_tool = tool_name
+                    current_input = input_str
+                    answer_streaming = False
                     import json
                     try:
                         input_data = json.loads(input_str)
@@ -111,6 +151,7 @@ async def handle_chatbot_request(
                 elif message_type == "tool_end":
                     output = args[0]
                     if current_tool:
+                        tool_results.append(ToolResult(current_tool, current_input, output))
                         import json
                         try:
                             output_data = json.loads(output)
@@ -132,36 +173,44 @@ async def handle_chatbot_request(
                         yield tool_msg
                         current_tool = None
             
-            except queue.Empty:
-                continue
             except Exception as e:
                 logger.error(f"Error processing tool message: {e}")
                 continue
         
-        query_thread.join(timeout=30)
+        try:
+            result = await run_task
+        except Exception as e:
+            yield f"\n❌ Error processing request: {str(e)}"
+            return
+        
+        failed = bool(result) and result.startswith(("❌", "Error processing query"))
+        if not checkpointed and result and not failed:
+            thread_store.append_turn(thread_id, Turn(query, result, tool_results))
         
-        if result_container["error"]:
-            yield f"\n❌ Error processing request: {result_container['error']}"
+        if tokens_streamed and not failed:
             return
         
-        if not result_container["result"]:
+        if not result:
             yield "\n❌ No response generated."
             return
         
-        final_response = result_container["result"]
-        
-        if tool_messages_sent:
+        # Nothing was streamed, or the run failed after streaming part of an
+        # answer, so send the final response (or the error) in one piece
+        if tool_messages_sent or tokens_streamed:
             yield "\n" + "="*50 + "\n"
-        
-        chunk_size = 100
-        for i in range(0, len(final_response), chunk_size):
-            chunk = final_response[i:i + chunk_size]
-            yield chunk
-            await asyncio.sleep(0.01)
+        yield result
             
     except Exception as e:
         logger.error(f"Error processing chatbot request: {e}")
         yield f"❌ Error processing request: {str(e)}"
+    finally:
+        # The stream was closed or cancelled before the run finished (the
+        # client disconnected). Cancelling the run task also cancels its
+        # pending tool coroutines and their outstanding HTTP requests.
+        if run_task is not None and not run_task.done():
+            run_task.cancel()
+            metrics.increment("chatbot.runs_cancelled")
+            logger.info(f"Client disconnected, cancelled chatbot run for thread {thread_id}")
 
 
 def get_chatbot_agent() -> Optional[ChatbotAgent]:
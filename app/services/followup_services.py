@@ -4,6 +4,7 @@ from langchain_core.prompts import PromptTemplate
 from app.llm.llm import llm
 from app.llm.llm_manager import LLMOptions
 from app.utils.logger import get_logger
+from app.utils.match_encoding import encode_match
 from app.utils.error_handler import ServiceUnavailableError
 
 # Get module logger
@@ -52,7 +53,7 @@ def handle_followup_suggestions_request(
         
         # Prepare variables
         context_block = f"Context:\n{context}\n\n" if context else ""
-        match_block = f"Match info:\n{match}\n\n" if match else ""
+        match_block = f"Match info:\n{encode_match(match).text}\n\n" if match else ""
         
         # Create LLM model with structured output
         model = llm.get(model_name).with_structured_output(FollowUpSuggestions)
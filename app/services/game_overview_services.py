@@ -4,6 +4,7 @@ from langchain_core.prompts import PromptTemplate
 from app.llm.llm import llm
 from app.llm.llm_manager import LLMOptions
 from app.utils.logger import get_logger
+from app.utils.match_encoding import encode_match
 from app.utils.error_handler import ServiceUnavailableError
 
 # Get module logger
@@ -64,7 +65,7 @@ def handle_game_overview_request(
         )
         
         # Prepare match information
-        match_block = f"Match information:\n{match}\n\n" if match else ""
+        match_block = f"Match information:\n{encode_match(match).text}\n\n" if match else ""
         
         # Create LLM model with structured output
         model = llm.get(model_name).with_structured_output(GameOverviewMLResponse)
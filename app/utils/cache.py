@@ -0,0 +1,202 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, Hashable, Optional, Set, TypeVar
+
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+from app.utils.singleflight import SingleFlight
+
+logger = get_logger("cache")
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheEntry(Generic[V]):
+    value: V
+    fresh_until: float
+    stale_until: float
+
+
+class AsyncTTLCache(Generic[V]):
+    """
+    Bounded LRU cache for values produced by async loaders.
+
+    Entries are served directly while fresh. Once their TTL has passed they
+    are still served until `stale_ttl` runs out, while a single background
+    refresh replaces them (stale-while-revalidate). Expired entries and
+    misses wait for the loader, and concurrent loads of the same key share a
+    single loader call. Loader exceptions are never cached.
+
+    Hits, stale hits and misses are recorded as `cache.<name>.*` metrics.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 256,
+        ttl: float = 3600.0,
+        stale_ttl: float = 86400.0,
+        clock: Callable[[], float] = time.monotonic,
+        ttl_for: Optional[Callable[[V], Optional[float]]] = None
+    ):
+        """
+        Args:
+            name: Cache name used for logging and metrics
+            maxsize: Maximum number of entries before the least recently
+                used one is evicted
+            ttl: Seconds an entry is served without refreshing it
+            stale_ttl: Seconds after expiry during which a stale entry is
+                still served while it is refreshed in the background
+            clock: Monotonic time source
+            ttl_for: Optional per-value TTL for loaded values (e.g. shorter for
+                data that is known to be outdated); None falls back to `ttl`
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._ttl_for = ttl_for
+        self._entries: "OrderedDict[Hashable, CacheEntry[V]]" = OrderedDict()
+        self._refreshing: Set[Hashable] = set()
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self._loads: SingleFlight[V] = SingleFlight(f"cache.{name}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, allow_stale: bool = False) -> Optional[V]:
+        """
+        Get a cached value without loading it.
+
+        Args:
+            key: Cache key
+            allow_stale: Also return entries past their TTL (but still within
+                their stale window)
+
+        Returns:
+            The cached value, or None if there is no usable entry
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        now = self._clock()
+        if now < entry.fresh_until or (allow_stale and now < entry.stale_until):
+            self._entries.move_to_end(key)
+            return entry.value
+        return None
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entries if needed.
+        """
+        now = self._clock()
+        fresh_until = now + (self.ttl if ttl is None else ttl)
+        self._entries[key] = CacheEntry(value, fresh_until, fresh_until + self.stale_ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            metrics.increment(f"cache.{self.name}.evictions")
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        """
+        Get a value from the cache, loading it on a miss.
+
+        Args:
+            key: Cache key
+            loader: Coroutine factory producing the value for `key`
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        entry = self._entries.get(key)
+        now = self._clock()
+
+        if entry is not None and now < entry.fresh_until:
+            self._entries.move_to_end(key)
+            metrics.increment(f"cache.{self.name}.hits")
+            return entry.value
+
+        if entry is not None and now < entry.stale_until:
+            self._entries.move_to_end(key)
+            metrics.increment(f"cache.{self.name}.stale_hits")
+            self._schedule_refresh(key, loader)
+            return entry.value
+
+        metrics.increment(f"cache.{self.name}.misses")
+        return await self._loads.do(key, lambda: self._load(key, loader))
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        value = await loader()
+        self.set(key, value, self._ttl_for(value) if self._ttl_for else None)
+        return value
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> None:
+        if key in self._refreshing:
+            return
+
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, loader))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> None:
+        try:
+            await self._loads.do(key, lambda: self._load(key, loader))
+            metrics.increment(f"cache.{self.name}.refreshes")
+        except Exception as e:
+            # Keep serving the stale entry until it runs out
+            logger.warning(f"Background refresh of {self.name} cache entry {key!r} failed: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop a single entry.
+        """
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Drop every entry whose key matches `predicate`.
+
+        Returns:
+            The number of dropped entries
+        """
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """
+        Drop all entries.
+        """
+        self._entries.clear()
+
+    def keys(self) -> list:
+        """
+        Get the cached keys, least recently used first.
+        """
+        return list(self._entries.keys())
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the size and hit counters of the cache.
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": metrics.get(f"cache.{self.name}.hits"),
+            "stale_hits": metrics.get(f"cache.{self.name}.stale_hits"),
+            "misses": metrics.get(f"cache.{self.name}.misses"),
+        }
@@ -1,17 +1,69 @@
+import asyncio
 import logging
 import queue
-from typing import Optional
+from typing import Any, Optional, Union
 from langchain_core.callbacks import BaseCallbackHandler
 
 logger = logging.getLogger(__name__)
 
+class EventChannel:
+    """Async event channel owned by a single agent run
+    
+    Events may be published from any thread; they are delivered in order on
+    the event loop that created the channel. Iteration ends once the channel
+    is closed and every queued event has been consumed.
+    """
+    
+    _CLOSED = object()
+    
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop or asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+    
+    def put(self, event: tuple) -> None:
+        """Publish an event to the channel"""
+        self._put(event)
+    
+    def close(self) -> None:
+        """Mark the end of the event stream"""
+        self._put(self._CLOSED)
+    
+    def _put(self, item: Any) -> None:
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        
+        if running_loop is self.loop:
+            self._queue.put_nowait(item)
+        else:
+            self.loop.call_soon_threadsafe(self._queue.put_nowait, item)
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> tuple:
+        item = await self._queue.get()
+        if item is self._CLOSED:
+            raise StopAsyncIteration
+        return item
+
 class ToolCallLogger(BaseCallbackHandler):
-    """Custom callback handler to log tool calls"""
+    """Custom callback handler to log tool calls and stream LLM tokens"""
     
-    def __init__(self, message_queue: Optional[queue.Queue] = None):
+    # Run callbacks on the event loop thread so token and tool events reach
+    # the queue in the order they happen instead of via a thread pool
+    run_inline = True
+    
+    def __init__(self, message_queue: Optional[Union[queue.Queue, EventChannel]] = None):
         super().__init__()
         self.message_queue = message_queue
     
+    def on_llm_new_token(self, token: str, **kwargs) -> None:
+        """Forward each streamed LLM token"""
+        if self.message_queue and token:
+            self.message_queue.put(("token", token))
+    
     def on_tool_start(self, serialized: dict, input_str: str, **kwargs) -> None:
         """Log when a tool starts executing"""
         tool_name = serialized.get("name", "Unknown")
@@ -21,8 +73,11 @@ class ToolCallLogger(BaseCallbackHandler):
         
         logger.info(f"Tool started: {tool_name} with input: {input_str}")
     
-    def on_tool_end(self, output: str, **kwargs) -> None:
+    def on_tool_end(self, output: Any, **kwargs) -> None:
         """Log when a tool finishes executing"""
+        # Tools invoked by the agent report a ToolMessage rather than a string
+        output = str(getattr(output, "content", output))
+        
         if self.message_queue:
             self.message_queue.put(("tool_end", output))
             
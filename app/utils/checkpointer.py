@@ -0,0 +1,356 @@
+import asyncio
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+
+logger = get_logger("checkpointer")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    checkpoint_type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    task_path TEXT NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+# Write-behind operations, applied by the writer thread in batches
+Operation = Tuple[str, tuple]
+
+
+class SQLiteCheckpointSaver(InMemorySaver):
+    """
+    LangGraph checkpointer persisting thread state to a SQLite database.
+
+    Threads are served from memory (an LRU of recently used threads) and
+    written to SQLite behind the request path: `put` and `put_writes` only
+    queue their rows, and a writer thread applies them in batched transactions.
+    The database uses WAL, so several processes on one host can share it -
+    before a run, a thread is reloaded if another process wrote a newer
+    checkpoint for it.
+
+    Only the newest `keep_checkpoints` checkpoints of each thread are kept
+    (older ones, their pending writes and unreferenced channel values are
+    compacted away), since conversations only ever resume from the latest one.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_threads: int = 1000,
+        keep_checkpoints: int = 2,
+        batch_size: int = 256,
+        flush_interval: float = 0.05
+    ):
+        """
+        Args:
+            path: SQLite database file
+            max_threads: Maximum number of threads kept in memory
+            keep_checkpoints: Checkpoints kept per thread and namespace (at least 2,
+                so the parent of the latest checkpoint is still available)
+            batch_size: Maximum number of queued operations written per transaction
+            flush_interval: Seconds the writer waits to gather a batch
+        """
+        super().__init__()
+        self.path = path
+        self.max_threads = max_threads
+        self.keep_checkpoints = max(keep_checkpoints, 2)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._lock = threading.RLock()
+        self._threads: "OrderedDict[str, None]" = OrderedDict()
+        self._thread_blobs: Dict[Tuple[str, str], Set[tuple]] = {}
+        self._queue: "queue.Queue[Optional[Operation]]" = queue.Queue()
+
+        self._reader = self._connect()
+        self._reader.executescript(SCHEMA)
+        self._writer = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30.0)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    # Reads
+
+    def _latest_in_memory(self, thread_id: str, checkpoint_ns: str) -> Optional[str]:
+        checkpoints = self.storage.get(thread_id, {}).get(checkpoint_ns)
+        return max(checkpoints) if checkpoints else None
+
+    def _ensure_loaded(self, config: RunnableConfig) -> None:
+        """Load a thread from the database if it is not in memory or another process has moved it on."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        with self._lock:
+            row = self._reader.execute(
+                "SELECT MAX(checkpoint_id) FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, checkpoint_ns)
+            ).fetchone()
+            latest_stored = row[0] if row else None
+            latest_in_memory = self._latest_in_memory(thread_id, checkpoint_ns)
+
+            if thread_id in self._threads:
+                self._threads.move_to_end(thread_id)
+                if latest_stored is None or (latest_in_memory is not None and latest_stored <= latest_in_memory):
+                    return
+            elif latest_stored is None:
+                return
+
+        # Rows of this process still waiting in the queue must be in the database first
+        self.flush()
+        with self._lock:
+            self._load_thread(thread_id)
+        metrics.increment("checkpointer.thread_loads")
+
+    def _load_thread(self, thread_id: str) -> None:
+        self._forget_thread(thread_id)
+
+        for ns, cid, parent, ctype, checkpoint, mtype, metadata in self._reader.execute(
+            "SELECT checkpoint_ns, checkpoint_id, parent_checkpoint_id, checkpoint_type, checkpoint, "
+            "metadata_type, metadata FROM checkpoints WHERE thread_id = ?", (thread_id,)
+        ):
+            self.storage[thread_id][ns][cid] = ((ctype, checkpoint), (mtype, metadata), parent)
+
+        for ns, channel, version, vtype, blob in self._reader.execute(
+            "SELECT checkpoint_ns, channel, version, type, blob FROM blobs WHERE thread_id = ?", (thread_id,)
+        ):
+            key = (thread_id, ns, channel, version)
+            self.blobs[key] = (vtype, blob)
+            self._thread_blobs.setdefault((thread_id, ns), set()).add(key)
+
+        for ns, cid, task_id, idx, channel, vtype, value, task_path in self._reader.execute(
+            "SELECT checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path "
+            "FROM writes WHERE thread_id = ?", (thread_id,)
+        ):
+            self.writes[(thread_id, ns, cid)][(task_id, idx)] = (task_id, channel, (vtype, value), task_path)
+
+        self._touch(thread_id)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        self._ensure_loaded(config)
+        with self._lock:
+            return super().get_tuple(config)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        # Loading a thread touches the database, so it happens off the event loop
+        await asyncio.to_thread(self._ensure_loaded, config)
+        with self._lock:
+            return super().get_tuple(config)
+
+    def list(self, config: Optional[RunnableConfig], **kwargs: Any):
+        """List checkpoints of a thread (or of the threads in memory if `config` is None)."""
+        if config:
+            self._ensure_loaded(config)
+        with self._lock:
+            return iter(list(super().list(config, **kwargs)))
+
+    # Writes
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self._lock:
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+            (ctype, stored), (mtype, stored_metadata), parent = self.storage[thread_id][checkpoint_ns][checkpoint["id"]]
+
+            self._queue.put(("checkpoint", (
+                thread_id, checkpoint_ns, checkpoint["id"], parent, ctype, stored, mtype, stored_metadata
+            )))
+            for channel, version in new_versions.items():
+                key = (thread_id, checkpoint_ns, channel, version)
+                vtype, blob = self.blobs[key]
+                self._thread_blobs.setdefault((thread_id, checkpoint_ns), set()).add(key)
+                self._queue.put(("blob", (thread_id, checkpoint_ns, channel, str(version), vtype, blob)))
+
+            self._compact(thread_id, checkpoint_ns)
+            self._touch(thread_id)
+        return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self._lock:
+            super().put_writes(config, writes, task_id, task_path)
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+            checkpoint_id = config["configurable"]["checkpoint_id"]
+            for (write_task_id, idx), (_, channel, (vtype, value), path) in self.writes[
+                (thread_id, checkpoint_ns, checkpoint_id)
+            ].items():
+                if write_task_id == task_id:
+                    self._queue.put(("write", (
+                        thread_id, checkpoint_ns, checkpoint_id, write_task_id, idx, channel, vtype, value, path
+                    )))
+
+    async def aput(self, config, checkpoint, metadata, new_versions) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path: str = "") -> None:
+        self.put_writes(config, writes, task_id, task_path)
+
+    # Compaction and eviction
+
+    def _compact(self, thread_id: str, checkpoint_ns: str) -> None:
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) <= self.keep_checkpoints:
+            return
+
+        dropped = sorted(checkpoints)[:-self.keep_checkpoints]
+        for checkpoint_id in dropped:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+        referenced: Set[tuple] = set()
+        for stored, _, _ in checkpoints.values():
+            for channel, version in self.serde.loads_typed(stored)["channel_versions"].items():
+                referenced.add((thread_id, checkpoint_ns, channel, version))
+
+        thread_blobs = self._thread_blobs.get((thread_id, checkpoint_ns), set())
+        unreferenced = [key for key in thread_blobs if key not in referenced]
+        for key in unreferenced:
+            thread_blobs.discard(key)
+            self.blobs.pop(key, None)
+
+        self._queue.put(("compact", (
+            thread_id, checkpoint_ns, dropped,
+            [(channel, str(version)) for _, _, channel, version in unreferenced]
+        )))
+        metrics.increment("checkpointer.checkpoints_compacted", len(dropped))
+
+    def _touch(self, thread_id: str) -> None:
+        self._threads[thread_id] = None
+        self._threads.move_to_end(thread_id)
+        while len(self._threads) > self.max_threads:
+            evicted, _ = self._threads.popitem(last=False)
+            self._forget_thread(evicted)
+            metrics.increment("checkpointer.threads_evicted")
+
+    def _forget_thread(self, thread_id: str) -> None:
+        """Drop a thread from memory (it stays in the database)."""
+        self._threads.pop(thread_id, None)
+        for checkpoint_ns, checkpoints in self.storage.pop(thread_id, {}).items():
+            for checkpoint_id in checkpoints:
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            for key in self._thread_blobs.pop((thread_id, checkpoint_ns), set()):
+                self.blobs.pop(key, None)
+
+    # Write-behind
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        running = True
+        while running:
+            batch: List[Optional[Operation]] = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            operations = [operation for operation in batch if operation is not None]
+            running = len(operations) == len(batch)
+            try:
+                started = time.perf_counter()
+                with connection:
+                    for kind, row in operations:
+                        self._apply(connection, kind, row)
+                metrics.increment("checkpointer.batches_written")
+                metrics.increment("checkpointer.operations_written", len(operations))
+                metrics.increment("checkpointer.write_seconds", time.perf_counter() - started)
+            except Exception as e:
+                metrics.increment("checkpointer.write_errors")
+                logger.error(f"Failed to write {len(operations)} checkpoint operations: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        connection.close()
+
+    @staticmethod
+    def _apply(connection: sqlite3.Connection, kind: str, row: tuple) -> None:
+        if kind == "checkpoint":
+            connection.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+        elif kind == "blob":
+            connection.execute("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", row)
+        elif kind == "write":
+            connection.execute("INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+        elif kind == "compact":
+            thread_id, checkpoint_ns, checkpoint_ids, blob_keys = row
+            connection.executemany(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                [(thread_id, checkpoint_ns, checkpoint_id) for checkpoint_id in checkpoint_ids]
+            )
+            connection.executemany(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                [(thread_id, checkpoint_ns, checkpoint_id) for checkpoint_id in checkpoint_ids]
+            )
+            connection.executemany(
+                "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                [(thread_id, checkpoint_ns, channel, version) for channel, version in blob_keys]
+            )
+
+    def flush(self) -> None:
+        """Wait until every queued write is in the database."""
+        if self._writer.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write everything still queued and close the database."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        with self._lock:
+            self._reader.close()
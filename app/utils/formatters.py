@@ -1,95 +1,20 @@
+from app.utils.match_encoding import encode_match
+
+
 def format_match_for_llm(match_data):
     """
-    Format match data for LLM analysis as human-readable text.
+    Format match data for LLM analysis as compact text.
+    
+    Players are named by alias (B1..B5, R1..R5) instead of their PUUIDs; use
+    `encode_match` directly when the alias -> PUUID map is needed as well.
     
     Args:
         match_data (dict): The raw match data from the API
         
     Returns:
-        str: Human-readable match summary for LLM analysis
+        str: Compact match summary for LLM analysis
     """
-    # Extract the match object (could be nested under 'match' or 'context.game')
-    if 'match' in match_data:
-        match = match_data['match']
-    elif 'context' in match_data and 'game' in match_data['context']:
-        match = match_data['context']['game']
-    else:
-        match = match_data
-    
-    # Get searched summoner info for labeling
-    searched_summoner = match.get('searchedSummoner', {})
-    searched_puuid = searched_summoner.get('puuid')
-    
-    # Build the formatted text
-    output = []
-    
-    # Game Info
-    queue_type = 'Ranked Solo/Duo' if match.get('gameQueueConfigId') == 420 else 'Other Queue'
-    game_length_min = match.get('gameLength', 0) // 60
-    game_length_sec = match.get('gameLength', 0) % 60
-    
-    output.append(f"=== MATCH SUMMARY ===")
-    output.append(f"Game Mode: {match.get('gameMode')} ({queue_type})")
-    output.append(f"Game Length: {game_length_min}:{game_length_sec:02d}")
-    output.append(f"Platform: {match.get('platformId')}")
-    output.append(f"Region: {match.get('region')}")
-    output.append("")
-    
-    # Separate teams
-    team_100_players = []
-    team_200_players = []
-    
-    for participant in match.get('participants', []):
-        is_searched_user = participant.get('puuid') == searched_puuid
-        
-        # Clean up summoner spell names
-        spell1 = participant.get('summonerSpell1Name', '').replace('Summoner', '')
-        spell2 = participant.get('summonerSpell2Name', '').replace('Summoner', '')
-        
-        player_info = {
-            'name': participant.get('riotId', 'Unknown'),
-            'champion': participant.get('championName'),
-            'spells': f"{spell1}/{spell2}",
-            'is_me': is_searched_user,
-            'puuid': participant.get('puuid')
-        }
-        
-        if participant.get('teamId') == 100:
-            team_100_players.append(player_info)
-        else:
-            team_200_players.append(player_info)
-    
-    # Format teams
-    output.append("=== TEAM 100 (Blue Side) ===")
-    for player in team_100_players:
-        name_display = f"**{player['name']} (YOU)**" if player['is_me'] else player['name']
-        output.append(f"• {name_display} - {player['champion']} ({player['spells']})")
-        output.append(f"  PUUID: {player['puuid']}")
-    
-    output.append("")
-    output.append("=== TEAM 200 (Red Side) ===")
-    for player in team_200_players:
-        name_display = f"**{player['name']} (YOU)**" if player['is_me'] else player['name']
-        output.append(f"• {name_display} - {player['champion']} ({player['spells']})")
-        output.append(f"  PUUID: {player['puuid']}")
-    
-    # Banned Champions
-    if match.get('bannedChampions'):
-        output.append("")
-        output.append("=== BANNED CHAMPIONS ===")
-        
-        # Group bans by team
-        team_100_bans = [ban for ban in match.get('bannedChampions', []) if ban.get('teamId') == 100]
-        team_200_bans = [ban for ban in match.get('bannedChampions', []) if ban.get('teamId') == 200]
-        
-        output.append("Blue Team Bans: " + ", ".join([f"Champion ID {ban.get('championId')}" for ban in team_100_bans]))
-        output.append("Red Team Bans: " + ", ".join([f"Champion ID {ban.get('championId')}" for ban in team_200_bans]))
-    
-    # Note about the searched player
-    output.append("")
-    output.append(f"NOTE: The player marked with **(YOU)** is {searched_summoner.get('riotId', 'the searched player')} - this is the current user you are analyzing for.")
-    
-    return "\n".join(output)
+    return encode_match(match_data).text
 
 
 # Test data
@@ -0,0 +1,70 @@
+import re
+
+from bs4 import BeautifulSoup
+
+# Elements that never carry text worth sending to a model
+DROP_TAGS = ["script", "style", "noscript", "svg", "iframe", "link", "meta", "head", "button", "form", "template"]
+
+# Elements whose content starts on a new line
+BLOCK_TAGS = [
+    "div", "section", "article", "header", "footer", "nav", "aside", "main",
+    "p", "ul", "ol", "li", "dl", "dt", "dd", "h1", "h2", "h3", "h4", "h5", "h6",
+    "caption", "br", "hr"
+]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _collapse(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def compact_html(html_content: str) -> str:
+    """
+    Reduce HTML to a minimal plain-text representation for LLM prompts.
+
+    Scripts, styles, SVGs and other non-content elements are dropped along
+    with every attribute. Images are replaced by their alt text (OP.GG names
+    items only in the alt text of their icons), tables are rendered as one
+    `cell | cell` line per row, and whitespace is collapsed with one line per
+    block element.
+
+    Args:
+        html_content: Raw or prettified HTML
+
+    Returns:
+        Compact text keeping the page's text content and tabular structure
+    """
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    for tag in soup.find_all(DROP_TAGS):
+        tag.decompose()
+
+    for img in soup.find_all("img"):
+        alt = _collapse(img.get("alt", ""))
+        if alt:
+            img.replace_with(f" [{alt}] ")
+        else:
+            img.decompose()
+
+    # Innermost tables first, so nested tables are already flattened into their cells
+    for table in reversed(soup.find_all("table")):
+        rows = []
+        for row in table.find_all("tr"):
+            cells = [_collapse(cell.get_text(" ")) for cell in row.find_all(["th", "td"])]
+            cells = [cell for cell in cells if cell]
+            if cells:
+                rows.append(" | ".join(cells))
+        table.replace_with("\n" + "\n".join(rows) + "\n")
+
+    for tag in soup.find_all(BLOCK_TAGS):
+        tag.insert_before("\n")
+        tag.insert_after("\n")
+
+    lines = []
+    for line in soup.get_text(" ").split("\n"):
+        line = _collapse(line)
+        # Drop empty lines and repeated labels
+        if line and (not lines or lines[-1] != line):
+            lines.append(line)
+    return "\n".join(lines)
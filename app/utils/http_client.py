@@ -0,0 +1,163 @@
+import asyncio
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+
+logger = get_logger("http_client")
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Every client created, so they can all be closed on shutdown
+_clients: "weakref.WeakSet[ManagedHTTPClient]" = weakref.WeakSet()
+
+
+class ManagedHTTPClient:
+    """
+    Lazily created, shared `httpx.AsyncClient` with connection pooling.
+
+    The client keeps connections alive between requests, caps the total
+    number of connections and the number of concurrent requests per host, and
+    negotiates HTTP/2 when it is requested and the `h2` package is installed.
+
+    An httpx client is bound to the event loop it was first used on, so a new
+    one is created if the client is used from a different loop (e.g. after a
+    CLI `asyncio.run` call). Each client is closed on its own loop before that
+    loop shuts down, so its pooled connections are not left open.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30.0,
+        http2: bool = True,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        max_per_host: int = 8,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Args:
+            name: Client name used for logging and metrics
+            headers: Default headers sent with every request
+            timeout: Default request timeout in seconds
+            http2: Use HTTP/2 when the `h2` package is installed
+            max_connections: Maximum number of open connections
+            max_keepalive_connections: Maximum number of idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept open
+            max_per_host: Maximum number of concurrent requests to a single host
+            transport: Custom transport (e.g. `httpx.MockTransport` in tests),
+                which replaces the pooled one
+        """
+        self.name = name
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning(f"HTTP/2 requested for the {name} HTTP client but h2 is not installed; using HTTP/1.1")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.max_per_host = max_per_host
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closer: Optional[asyncio.Task] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        _clients.add(self)
+
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared client for the running event loop, creating it if needed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            if self._client is not None and not self._client.is_closed and self._loop is not loop:
+                self._discard(self._client, self._loop)
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self.transport
+            )
+            self._loop = loop
+            self._host_slots = {}
+            # asyncio.run cancels pending tasks before closing the loop, which
+            # closes the client while its connections can still be shut down
+            self._closer = loop.create_task(
+                self._close_on_shutdown(self._client), name=f"http-client-closer-{self.name}"
+            )
+            metrics.increment(f"http.{self.name}.clients_created")
+        return self._client
+
+    @staticmethod
+    async def _close_on_shutdown(client: httpx.AsyncClient) -> None:
+        try:
+            await asyncio.Event().wait()
+        finally:
+            if not client.is_closed:
+                await client.aclose()
+
+    def _discard(self, client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Drop a client of another event loop, closing it on that loop if it still runs."""
+        logger.debug(f"Recreating {self.name} HTTP client for a new event loop")
+        metrics.increment(f"http.{self.name}.clients_discarded")
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a GET request through the shared client, respecting the per-host limit.
+        """
+        client = self.get_client()
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+
+        async with slot:
+            metrics.increment(f"http.{self.name}.requests")
+            return await client.get(url, **kwargs)
+
+    async def aclose(self) -> None:
+        """
+        Close the shared client and its connections.
+        """
+        client, self._client = self._client, None
+        closer, self._closer = self._closer, None
+        if client is None or client.is_closed:
+            return
+
+        try:
+            if self._loop is asyncio.get_running_loop():
+                await client.aclose()
+                if closer is not None:
+                    closer.cancel()
+            else:
+                self._discard(client, self._loop)
+        finally:
+            self._loop = None
+
+
+async def close_http_clients() -> None:
+    """
+    Close every managed HTTP client (used on application and MCP server shutdown).
+    """
+    for client in list(_clients):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing {client.name} HTTP client: {e}")
@@ -74,4 +74,15 @@ def get_logger(name: str = None):
     Returns:
         A configured logger instance
     """
-    return Logger().get_logger(name) 
\ No newline at end of file
+    return Logger().get_logger(name) 
+
+def log_to_stderr():
+    """
+    Send console logging to stderr instead of stdout.
+    
+    Used by processes whose stdout is a protocol stream, such as the stdio MCP
+    servers, where a log line on stdout would corrupt the JSON-RPC messages.
+    """
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.StreamHandler) and getattr(handler, "stream", None) is sys.stdout:
+            handler.setStream(sys.stderr)
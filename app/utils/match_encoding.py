@@ -0,0 +1,254 @@
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from app.utils.static_data import StaticData, static_data_store
+
+# Fallback names for when no Data Dragon static data snapshot is available
+SUMMONER_SPELLS = {
+    1: "Cleanse", 3: "Exhaust", 4: "Flash", 6: "Ghost", 7: "Heal", 11: "Smite",
+    12: "Teleport", 13: "Clarity", 14: "Ignite", 21: "Barrier", 32: "Mark",
+}
+
+RUNE_STYLES = {
+    8000: "Precision", 8100: "Domination", 8200: "Sorcery", 8300: "Inspiration", 8400: "Resolve",
+}
+
+KEYSTONES = {
+    8005: "Press the Attack", 8008: "Lethal Tempo", 8010: "Conqueror", 8021: "Fleet Footwork",
+    8112: "Electrocute", 8124: "Predator", 8128: "Dark Harvest", 9923: "Hail of Blades",
+    8214: "Summon Aery", 8229: "Arcane Comet", 8230: "Phase Rush",
+    8351: "Glacial Augment", 8360: "Unsealed Spellbook", 8369: "First Strike",
+    8437: "Grasp of the Undying", 8439: "Aftershock", 8465: "Guardian",
+}
+
+TEAM_PREFIXES = {100: "B", 200: "R"}
+
+ALIAS_NOTE = (
+    "Players are named by alias (B1-B5 blue side, R1-R5 red side). "
+    "Pass an alias wherever a tool needs a player's puuid."
+)
+
+# Alias -> PUUID map of the match the current request is about, so tool calls
+# made while answering it can be given an alias instead of the real PUUID
+match_aliases: ContextVar[Dict[str, str]] = ContextVar("match_aliases", default={})
+
+
+@dataclass
+class EncodedMatch:
+    """
+    A match rendered for an LLM prompt, with the PUUID behind each player alias.
+    """
+    text: str
+    aliases: Dict[str, str] = field(default_factory=dict)
+
+
+def unwrap_match(match_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get the match object out of a request payload (nested under 'match',
+    'context.game' or, for Riot match-v5 payloads, 'info').
+    """
+    if 'match' in match_data:
+        return match_data['match']
+    if 'context' in match_data and 'game' in match_data['context']:
+        return match_data['context']['game']
+    if 'info' in match_data and 'participants' in match_data['info']:
+        return match_data['info']
+    return match_data
+
+
+def _player_name(participant: Dict[str, Any]) -> str:
+    if participant.get('riotId'):
+        return participant['riotId']
+    if participant.get('riotIdGameName'):
+        tagline = participant.get('riotIdTagline')
+        return f"{participant['riotIdGameName']}#{tagline}" if tagline else participant['riotIdGameName']
+    return participant.get('summonerName') or "Unknown"
+
+
+def _spells(participant: Dict[str, Any], data: Optional[StaticData]) -> str:
+    names = []
+    for number in (1, 2):
+        # Data Dragon spell keys differ from the in-game names (SummonerDot is Ignite)
+        spell_id = participant.get(f'spell{number}Id', participant.get(f'summoner{number}Id'))
+        name = (
+            (data.spell_name(spell_id) if data else None)
+            or SUMMONER_SPELLS.get(spell_id)
+            or participant.get(f'summonerSpell{number}Name', '').replace('Summoner', '')
+        )
+        if not name and spell_id is not None:
+            name = str(spell_id)
+        if name:
+            names.append(name)
+    return "/".join(names)
+
+
+def _rune_name(rune_id: Any, data: Optional[StaticData], fallback: Dict[int, str]) -> Optional[str]:
+    return (data.rune_name(rune_id) if data else None) or fallback.get(rune_id)
+
+
+def _runes(participant: Dict[str, Any], data: Optional[StaticData]) -> str:
+    perks = participant.get('perks') or {}
+    if 'perkIds' in perks:
+        keystone_id = perks['perkIds'][0] if perks['perkIds'] else None
+        primary, secondary = perks.get('perkStyle'), perks.get('perkSubStyle')
+    elif 'styles' in perks:
+        # match-v5 layout
+        styles = perks['styles']
+        selections = styles[0].get('selections', []) if styles else []
+        keystone_id = selections[0].get('perk') if selections else None
+        primary = styles[0].get('style') if styles else None
+        secondary = styles[1].get('style') if len(styles) > 1 else None
+    else:
+        return ""
+
+    keystone = _rune_name(keystone_id, data, KEYSTONES) or ""
+    trees = "/".join(filter(None, (_rune_name(style, data, RUNE_STYLES) for style in (primary, secondary))))
+    return f"{keystone} ({trees})" if keystone and trees else keystone or trees
+
+
+def _performance(participant: Dict[str, Any], data: Optional[StaticData]) -> str:
+    """Post-game stats, for match-v5 payloads that carry them."""
+    if 'kills' not in participant:
+        return ""
+
+    parts = [f"{participant.get('kills', 0)}/{participant.get('deaths', 0)}/{participant.get('assists', 0)}"]
+    cs = participant.get('totalMinionsKilled', 0) + participant.get('neutralMinionsKilled', 0)
+    parts.append(f"{cs} CS")
+    if 'goldEarned' in participant:
+        parts.append(f"{participant['goldEarned']:,} gold")
+    if 'totalDamageDealtToChampions' in participant:
+        parts.append(f"{participant['totalDamageDealtToChampions']:,} dmg")
+    if 'visionScore' in participant:
+        parts.append(f"vision {participant['visionScore']}")
+    items = [
+        (data.item_name(participant[f'item{slot}']) if data else None) or str(participant[f'item{slot}'])
+        for slot in range(7) if participant.get(f'item{slot}')
+    ]
+    if items:
+        parts.append(f"items {', '.join(items)}")
+    return ", ".join(parts)
+
+
+def _champion_name(champion_id: Any, data: Optional[StaticData], known: Dict[Any, str]) -> str:
+    return known.get(champion_id) or (data.champion_name(champion_id) if data else None) or f"Champion ID {champion_id}"
+
+
+def encode_match(match_data: Dict[str, Any], data: Optional[StaticData] = None) -> EncodedMatch:
+    """
+    Encode a match compactly for an LLM prompt.
+
+    Players are named by alias (B1..B5 blue side, R1..R5 red side) instead of
+    their PUUIDs, summoner spells and runes are named, and fields the model has
+    no use for (perk id arrays, customization objects, icon ids) are dropped.
+
+    Args:
+        match_data: The match payload (spectator or match-v5, optionally nested)
+        data: Static data to name champions, spells, runes and items with
+            (the current Data Dragon snapshot by default)
+
+    Returns:
+        The encoded text and the alias -> PUUID map of its players
+    """
+    match = unwrap_match(match_data)
+    data = data if data is not None else static_data_store.current()
+    searched_puuid = (match.get('searchedSummoner') or {}).get('puuid')
+    champion_names = {
+        participant.get('championId'): participant['championName']
+        for participant in match.get('participants', []) if participant.get('championName')
+    }
+
+    queue = 'Ranked Solo/Duo' if (match.get('gameQueueConfigId') or match.get('queueId')) == 420 else 'Other Queue'
+    header = [f"{match.get('gameMode', 'Unknown mode')} {queue}"]
+    seconds = match.get('gameLength') or match.get('gameDuration') or 0
+    if seconds:
+        header.append(f"{seconds // 60}:{seconds % 60:02d}")
+    region = match.get('region') or match.get('platformId')
+    if region:
+        header.append(region)
+
+    lines = [" | ".join(header)]
+    aliases: Dict[str, str] = {}
+    you: Optional[str] = None
+
+    for team_id, prefix in TEAM_PREFIXES.items():
+        team = [participant for participant in match.get('participants', []) if participant.get('teamId') == team_id]
+        if not team:
+            continue
+
+        result = ""
+        for team_info in match.get('teams', []):
+            if team_info.get('teamId') == team_id and 'win' in team_info:
+                result = " - won" if team_info['win'] else " - lost"
+        lines.append(f"{'Blue' if team_id == 100 else 'Red'} side{result}:")
+
+        for number, participant in enumerate(team, start=1):
+            alias = f"{prefix}{number}"
+            if participant.get('puuid'):
+                aliases[alias] = participant['puuid']
+                if participant['puuid'] == searched_puuid:
+                    you = alias
+
+            position = participant.get('teamPosition') or participant.get('individualPosition')
+            fields = [
+                f"{alias} {_player_name(participant)}",
+                participant.get('championName') or _champion_name(participant.get('championId'), data, champion_names),
+                position if position and position != "Invalid" else "",
+                _spells(participant, data),
+                _runes(participant, data),
+                _performance(participant, data),
+            ]
+            lines.append(" | ".join(value for value in fields if value))
+
+    bans = match.get('bannedChampions') or []
+    if bans:
+        for team_id, side in ((100, "Blue"), (200, "Red")):
+            names = [
+                _champion_name(ban.get('championId'), data, champion_names)
+                for ban in bans if ban.get('teamId') == team_id and ban.get('championId', -1) != -1
+            ]
+            if names:
+                lines.append(f"{side} bans: {', '.join(names)}")
+
+    if you:
+        lines.append(f"The user is {you}.")
+    if aliases:
+        lines.append(ALIAS_NOTE)
+
+    return EncodedMatch("\n".join(lines), aliases)
+
+
+def resolve_aliases(arguments: Dict[str, Any], aliases: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Replace player aliases in tool call arguments with the PUUIDs they stand for.
+
+    Args:
+        arguments: Tool call arguments
+        aliases: Alias -> PUUID map (the current request's map by default)
+
+    Returns:
+        The arguments, with every string value that is an alias replaced
+    """
+    aliases = match_aliases.get() if aliases is None else aliases
+    if not aliases:
+        return arguments
+
+    def resolve(value: Any) -> Any:
+        if isinstance(value, str):
+            return aliases.get(value.strip(), value)
+        if isinstance(value, list):
+            return [resolve(item) for item in value]
+        return value
+
+    return {name: resolve(value) for name, value in arguments.items()}
+
+
+def alias_puuids(text: str, aliases: Optional[Dict[str, str]] = None) -> str:
+    """
+    Replace the PUUIDs of the current match's players in a text with their aliases.
+    """
+    aliases = match_aliases.get() if aliases is None else aliases
+    for alias, puuid in aliases.items():
+        text = text.replace(puuid, alias)
+    return text
+
@@ -0,0 +1,66 @@
+import threading
+from collections import defaultdict
+from typing import Dict
+
+
+class Metrics:
+    """
+    In-process registry of named counters and gauges.
+
+    Values are created on first use and are safe to update from any thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            name: Dotted counter name (e.g. "chatbot.runs_cancelled")
+            value: Amount to add
+        """
+        with self._lock:
+            self._counters[name] += value
+
+    def set(self, name: str, value: float) -> None:
+        """
+        Set a gauge-style value (e.g. a ratio derived from other counters).
+        """
+        with self._lock:
+            self._counters[name] = value
+
+    def get(self, name: str) -> float:
+        """
+        Get the current value of a counter (0 if it was never updated).
+        """
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def ratio(self, numerator: str, denominator: str) -> float:
+        """
+        Get the ratio between two counters, or 0.0 if the denominator is 0.
+        """
+        with self._lock:
+            total = self._counters.get(denominator, 0)
+            return self._counters.get(numerator, 0) / total if total else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Get a copy of all counters.
+        """
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def reset(self) -> None:
+        """
+        Reset all counters.
+        """
+        with self._lock:
+            self._counters.clear()
+
+
+# Create a singleton instance
+metrics = Metrics()
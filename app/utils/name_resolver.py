@@ -0,0 +1,235 @@
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.utils.metrics import metrics
+from app.utils.static_data import StaticData, normalize_name, static_data_store
+
+# Names below this confidence are not resolved (callers report suggestions instead)
+MIN_CONFIDENCE = 0.8
+
+# Candidates scored in full per query, picked by shared trigrams
+MAX_CANDIDATES = 20
+
+# Spellings that share few trigrams with the champion's name, by OP.GG slug.
+# Names that normalize to their slug ("Kai'Sa" -> "kaisa") need no entry.
+CHAMPION_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "monkeyking": ("wukong", "wu", "monkey king"),
+    "nunu": ("nunu & willump", "nunu and willump", "willump"),
+    "renata": ("renata glasc", "glasc"),
+    "missfortune": ("mf",),
+    "twistedfate": ("tf",),
+    "aurelionsol": ("asol", "aurelion"),
+    "jarvaniv": ("j4", "jarvan", "jarvan 4"),
+    "gangplank": ("gp",),
+    "drmundo": ("mundo", "dr mundo"),
+    "masteryi": ("yi", "master yi"),
+    "leesin": ("lee",),
+    "kogmaw": ("kog",),
+    "tahmkench": ("tahm", "kench"),
+    "xinzhao": ("xin",),
+    "heimerdinger": ("heimer", "donger"),
+    "mordekaiser": ("morde",),
+    "nautilus": ("naut",),
+    "nocturne": ("noc",),
+    "cassiopeia": ("cass",),
+    "caitlyn": ("cait",),
+    "ezreal": ("ez",),
+    "blitzcrank": ("blitz",),
+    "fiddlesticks": ("fiddle", "fid"),
+    "kassadin": ("kass",),
+    "malphite": ("malph",),
+    "tryndamere": ("trynd",),
+    "velkoz": ("vel koz",),
+    "belveth": ("bel veth",),
+    "ksante": ("k sante",),
+}
+
+
+def trigrams(key: str) -> Set[str]:
+    """
+    Get the character trigrams of a normalized name, padded so short names and prefixes match.
+    """
+    padded = f"  {key} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+@dataclass
+class Resolution:
+    """
+    A name resolved to a canonical entry, with how confident the match is (0-1).
+    """
+    query: str
+    key: str
+    name: str
+    confidence: float
+
+    @property
+    def exact(self) -> bool:
+        return self.confidence == 1.0
+
+
+class NameResolver:
+    """
+    Maps any spelling of a name to its canonical key.
+
+    Every name and alias is indexed by its normalized form for exact matches
+    and by its trigrams for fuzzy ones. A fuzzy query only scores the entries
+    sharing the most trigrams with it, so resolving stays a few dictionary
+    lookups and a handful of string comparisons however many names there are.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Iterable[str]]]):
+        """
+        Args:
+            entries: (canonical key, display name, aliases) of every entry
+        """
+        self._exact: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._names: List[str] = []
+        self._spellings: List[str] = []
+        self._spelling_entry: List[int] = []
+        self._trigrams: Dict[str, List[int]] = {}
+
+        for entry, (key, name, aliases) in enumerate(entries):
+            self._keys.append(key)
+            self._names.append(name)
+            for spelling in {normalize_name(key), normalize_name(name), *map(normalize_name, aliases)}:
+                if not spelling or spelling in self._exact:
+                    continue
+                self._exact[spelling] = entry
+                spelling_index = len(self._spellings)
+                self._spellings.append(spelling)
+                self._spelling_entry.append(entry)
+                for trigram in trigrams(spelling):
+                    self._trigrams.setdefault(trigram, []).append(spelling_index)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _resolution(self, query: str, entry: int, confidence: float) -> Resolution:
+        return Resolution(query, self._keys[entry], self._names[entry], round(confidence, 3))
+
+    def candidates(self, query: str, limit: int = 3) -> List[Resolution]:
+        """
+        Get the entries that best match a spelling, most confident first.
+
+        Args:
+            query: Name as typed by a user or an LLM
+            limit: Maximum number of entries returned
+
+        Returns:
+            One resolution per entry, at most `limit`
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        if normalized in self._exact:
+            return [self._resolution(query, self._exact[normalized], 1.0)]
+
+        shared = Counter(
+            spelling for trigram in trigrams(normalized) for spelling in self._trigrams.get(trigram, ())
+        )
+        spellings = [spelling for spelling, _ in shared.most_common(MAX_CANDIDATES)]
+        # A prefix of only one name ("heimer", "tryn") is almost certainly that name
+        prefixed = {
+            self._spelling_entry[spelling] for spelling in spellings
+            if self._spellings[spelling].startswith(normalized)
+        }
+        best: Dict[int, float] = {}
+        for spelling in spellings:
+            candidate = self._spellings[spelling]
+            entry = self._spelling_entry[spelling]
+            confidence = SequenceMatcher(None, normalized, candidate).ratio()
+            if len(normalized) >= 3 and prefixed == {entry} and candidate.startswith(normalized):
+                confidence = max(confidence, 0.85 + 0.1 * len(normalized) / len(candidate))
+            best[entry] = max(best.get(entry, 0.0), min(confidence, 0.99))
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [self._resolution(query, entry, confidence) for entry, confidence in ranked]
+
+    def resolve(self, query: str, min_confidence: float = MIN_CONFIDENCE) -> Optional[Resolution]:
+        """
+        Resolve a spelling to its entry, if one matches with at least `min_confidence`.
+        """
+        candidates = self.candidates(query, limit=1)
+        if not candidates or candidates[0].confidence < min_confidence:
+            metrics.increment("name_resolver.misses")
+            return None
+        metrics.increment("name_resolver.exact" if candidates[0].exact else "name_resolver.fuzzy")
+        return candidates[0]
+
+
+def build_champion_resolver(data: Optional[StaticData]) -> NameResolver:
+    """
+    Index champions by OP.GG slug: every Data Dragon champion when static data is available,
+    otherwise only the champions of CHAMPION_ALIASES.
+    """
+    if data is None:
+        return NameResolver((slug, slug, aliases) for slug, aliases in CHAMPION_ALIASES.items())
+    return NameResolver(
+        (slug, data.champion_names[key], CHAMPION_ALIASES.get(slug, ()))
+        for key, slug in data.champion_slugs.items()
+    )
+
+
+def build_item_resolver(data: StaticData) -> NameResolver:
+    """
+    Index items by id (as a string).
+    """
+    return NameResolver((str(item_id), name, ()) for item_id, name in data.items.items())
+
+
+class _ResolverCache:
+    """Resolvers built for the current static data, rebuilt when it changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Optional[StaticData] = None
+        self._champions: Optional[NameResolver] = None
+        self._items: Optional[NameResolver] = None
+
+    def get(self) -> Tuple[NameResolver, Optional[NameResolver]]:
+        data = static_data_store.current()
+        with self._lock:
+            if self._champions is None or data is not self._data:
+                self._data = data
+                self._champions = build_champion_resolver(data)
+                self._items = build_item_resolver(data) if data is not None else None
+            return self._champions, self._items
+
+
+_resolvers = _ResolverCache()
+
+
+def resolve_champion(name: str, min_confidence: float = MIN_CONFIDENCE) -> Optional[Resolution]:
+    """
+    Resolve a champion as spelled by a user or an LLM to its OP.GG slug.
+
+    Args:
+        name: Champion name, nickname or misspelling (e.g. "Nunu & Willump", "Wukong", "yasou")
+        min_confidence: Lowest confidence accepted
+
+    Returns:
+        The resolution, or None if no champion matches confidently
+    """
+    champions, _ = _resolvers.get()
+    return champions.resolve(name, min_confidence)
+
+
+def suggest_champions(name: str, limit: int = 3) -> List[str]:
+    """
+    Get the names of the champions closest to a spelling, for error messages.
+    """
+    champions, _ = _resolvers.get()
+    return [candidate.name for candidate in champions.candidates(name, limit) if candidate.confidence >= 0.5]
+
+
+def resolve_item(name: str, min_confidence: float = MIN_CONFIDENCE) -> Optional[Resolution]:
+    """
+    Resolve an item name to its id (needs the Data Dragon static data).
+    """
+    _, items = _resolvers.get()
+    return items.resolve(name, min_confidence) if items is not None else None
@@ -0,0 +1,72 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+from app.utils.metrics import metrics
+
+V = TypeVar("V")
+
+
+@dataclass
+class _Call(Generic[V]):
+    task: "asyncio.Task[V]"
+    waiters: int = 0
+
+
+class SingleFlight(Generic[V]):
+    """
+    Coalesce concurrent calls for the same key into a single execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is in flight wait for that same task, and its result or error is
+    fanned out to all of them. The work is cancelled only when every waiter
+    has been cancelled (e.g. all their clients disconnected).
+
+    Calls and coalesced calls are recorded as `singleflight.<name>.*` metrics,
+    together with the resulting coalescing ratio.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call[V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> V:
+        """
+        Run `fn` for `key`, or join the execution already in flight for it.
+
+        Args:
+            key: Identity of the work (e.g. a URL)
+            fn: Coroutine factory doing the work
+
+        Returns:
+            The result shared by every caller for this execution
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            metrics.increment(f"singleflight.{self.name}.coalesced")
+
+        metrics.increment(f"singleflight.{self.name}.calls")
+        metrics.set(
+            f"singleflight.{self.name}.coalescing_ratio",
+            metrics.ratio(f"singleflight.{self.name}.coalesced", f"singleflight.{self.name}.calls")
+        )
+
+        call.waiters += 1
+        try:
+            # Shield the shared task so one cancelled waiter does not cancel it for the others
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: _Call[V]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
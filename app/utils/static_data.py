@@ -0,0 +1,333 @@
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+
+logger = get_logger("static_data")
+
+# Bump when the snapshot file layout changes incompatibly
+STATIC_DATA_SCHEMA_VERSION = 1
+
+DDRAGON_BASE = "https://ddragon.leagueoflegends.com"
+DDRAGON_VERSIONS_URL = f"{DDRAGON_BASE}/api/versions.json"
+
+# Data Dragon files a snapshot is built from
+DDRAGON_FILES = {
+    "champions": "champion.json",
+    "items": "item.json",
+    "runes": "runesReforged.json",
+    "spells": "summoner.json",
+}
+
+NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]')
+
+
+def normalize_name(name: str) -> str:
+    """
+    Reduce a champion, item or spell name to lowercase letters and digits
+    ("Kai'Sa" -> "kaisa", "Nunu & Willump" -> "nunuwillump").
+    """
+    return NON_ALPHANUMERIC.sub('', name.lower())
+
+
+def build_static_data(version: str, ddragon: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce Data Dragon files to the compact snapshot payload: ids and names only.
+
+    Args:
+        version: Data Dragon version the files are from (e.g. "14.23.1")
+        ddragon: Parsed JSON of each file in DDRAGON_FILES, by its key
+
+    Returns:
+        The snapshot payload, as written by `write_static_data`
+    """
+    champions = [
+        [int(champion["key"]), champion["id"], champion["name"]]
+        for champion in ddragon["champions"]["data"].values()
+    ]
+    items = {item_id: item["name"] for item_id, item in ddragon["items"]["data"].items()}
+    runes: Dict[str, str] = {}
+    for style in ddragon["runes"]:
+        runes[str(style["id"])] = style["name"]
+        for slot in style.get("slots", []):
+            for rune in slot.get("runes", []):
+                runes[str(rune["id"])] = rune["name"]
+    spells = {spell["key"]: spell["name"] for spell in ddragon["spells"]["data"].values()}
+
+    return {
+        "schema_version": STATIC_DATA_SCHEMA_VERSION,
+        "version": version,
+        "created_at": time.time(),
+        "champions": sorted(champions),
+        "items": items,
+        "runes": runes,
+        "spells": spells,
+    }
+
+
+def write_static_data(path: str, payload: Dict[str, Any]) -> None:
+    """
+    Write a snapshot file atomically, so readers never see a partial file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+
+async def _fetch_ddragon(
+    version: Optional[str],
+    filenames: List[str],
+    client: Optional[httpx.AsyncClient],
+    build: Callable[[str, List[Any]], Any]
+) -> Any:
+    """
+    Download Data Dragon files of a version (the latest by default) and pass them to `build`.
+    """
+    async def fetch(http: httpx.AsyncClient) -> Any:
+        nonlocal version
+        if version is None:
+            response = await http.get(DDRAGON_VERSIONS_URL)
+            response.raise_for_status()
+            version = response.json()[0]
+
+        async def get(filename: str) -> Any:
+            response = await http.get(f"{DDRAGON_BASE}/cdn/{version}/data/en_US/{filename}")
+            response.raise_for_status()
+            return response.json()
+
+        return build(version, await asyncio.gather(*(get(filename) for filename in filenames)))
+
+    if client is not None:
+        return await fetch(client)
+    async with httpx.AsyncClient(timeout=30.0) as own_client:
+        return await fetch(own_client)
+
+
+async def fetch_static_data(version: Optional[str] = None, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+    """
+    Download the Data Dragon files of a version (the latest by default) and build a snapshot payload.
+    """
+    return await _fetch_ddragon(
+        version, list(DDRAGON_FILES.values()), client,
+        lambda version, files: build_static_data(version, dict(zip(DDRAGON_FILES, files)))
+    )
+
+
+async def fetch_champion_slugs(version: Optional[str] = None, client: Optional[httpx.AsyncClient] = None) -> List[str]:
+    """
+    Get the OP.GG slugs of every champion from Data Dragon (latest version by default).
+    """
+    # Data Dragon ids (e.g. "MonkeyKing", "KogMaw") are what OP.GG uses in its URLs
+    return await _fetch_ddragon(
+        version, [DDRAGON_FILES["champions"]], client,
+        lambda version, files: sorted(champion_id.lower() for champion_id in files[0]["data"])
+    )
+
+
+def _read_only(mapping: Dict) -> Mapping:
+    return MappingProxyType(mapping)
+
+
+@dataclass(frozen=True)
+class StaticData:
+    """
+    Id -> name and name -> id indexes of one Data Dragon version.
+
+    Indexes are read-only mappings built once per snapshot file, so lookups
+    are dictionary reads and the instance can be shared by every request.
+    Names are looked up by `normalize_name`, and champions by both their
+    display name and their Data Dragon id ("Wukong" and "MonkeyKing").
+    """
+    version: str
+    champion_names: Mapping[int, str]
+    champion_slugs: Mapping[int, str]
+    items: Mapping[int, str]
+    runes: Mapping[int, str]
+    spells: Mapping[int, str]
+    champion_keys: Mapping[str, int]
+    item_ids: Mapping[str, int]
+    spell_ids: Mapping[str, int]
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "StaticData":
+        """
+        Build the indexes of a snapshot payload.
+
+        Raises:
+            ValueError: If the payload was written with another schema version
+        """
+        if payload.get("schema_version") != STATIC_DATA_SCHEMA_VERSION:
+            raise ValueError(f"unsupported static data schema version {payload.get('schema_version')}")
+
+        champion_names: Dict[int, str] = {}
+        champion_slugs: Dict[int, str] = {}
+        champion_keys: Dict[str, int] = {}
+        for key, champion_id, name in payload["champions"]:
+            champion_names[key] = name
+            # Data Dragon ids (e.g. "MonkeyKing", "KogMaw") are what OP.GG uses in its URLs
+            champion_slugs[key] = champion_id.lower()
+            champion_keys[normalize_name(champion_id)] = key
+            champion_keys[normalize_name(name)] = key
+
+        items = {int(item_id): name for item_id, name in payload["items"].items()}
+        spells = {int(spell_id): name for spell_id, name in payload["spells"].items()}
+        # Several items share a name (e.g. Ornn upgrades, arena variants); keep the lowest id
+        item_ids: Dict[str, int] = {}
+        for item_id in sorted(items):
+            item_ids.setdefault(normalize_name(items[item_id]), item_id)
+
+        return cls(
+            version=payload["version"],
+            champion_names=_read_only(champion_names),
+            champion_slugs=_read_only(champion_slugs),
+            items=_read_only(items),
+            runes=_read_only({int(rune_id): name for rune_id, name in payload["runes"].items()}),
+            spells=_read_only(spells),
+            champion_keys=_read_only(champion_keys),
+            item_ids=_read_only(item_ids),
+            spell_ids=_read_only({normalize_name(name): spell_id for spell_id, name in spells.items()}),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "StaticData":
+        """
+        Read a snapshot file.
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls.from_payload(json.load(f))
+
+    def champion_name(self, key: Any) -> Optional[str]:
+        """Get a champion's name from its numeric key ("266" or 266 -> "Aatrox")."""
+        try:
+            return self.champion_names.get(int(key))
+        except (TypeError, ValueError):
+            return None
+
+    def champion_key(self, name: str) -> Optional[int]:
+        """Get a champion's numeric key from its name or Data Dragon id."""
+        return self.champion_keys.get(normalize_name(name))
+
+    def champion_slug(self, name: str) -> Optional[str]:
+        """Get the OP.GG slug of a champion from its name ("Wukong" -> "monkeyking")."""
+        key = self.champion_key(name)
+        return self.champion_slugs[key] if key is not None else None
+
+    def item_name(self, item_id: Any) -> Optional[str]:
+        return self._name(self.items, item_id)
+
+    def rune_name(self, rune_id: Any) -> Optional[str]:
+        return self._name(self.runes, rune_id)
+
+    def spell_name(self, spell_id: Any) -> Optional[str]:
+        return self._name(self.spells, spell_id)
+
+    def item_id(self, name: str) -> Optional[int]:
+        return self.item_ids.get(normalize_name(name))
+
+    def spell_id(self, name: str) -> Optional[int]:
+        return self.spell_ids.get(normalize_name(name))
+
+    @staticmethod
+    def _name(index: Mapping[int, str], value: Any) -> Optional[str]:
+        try:
+            return index.get(int(value))
+        except (TypeError, ValueError):
+            return None
+
+
+class StaticDataStore:
+    """
+    Serves the static data snapshot at a path, reloading it when the file is replaced.
+
+    The file is checked for changes at most every `check_interval` seconds,
+    so lookups stay in-memory reads. Without a snapshot file `current()`
+    returns None and callers fall back to showing raw ids.
+    """
+
+    def __init__(self, path: str, check_interval: float = 30.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._data: Optional[StaticData] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = float("-inf")
+
+    def current(self) -> Optional[StaticData]:
+        """Get the current static data, or None if there is no usable snapshot file."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._data
+        self._checked_at = now
+
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            self._data, self._mtime = None, None
+            return None
+
+        if mtime != self._mtime:
+            try:
+                self._data = StaticData.load(self.path)
+                metrics.increment("static_data.loads")
+                logger.info(f"Loaded Data Dragon static data {self._data.version} from {self.path}")
+            except Exception as e:
+                logger.warning(f"Could not load static data {self.path}: {e}")
+                self._data = None
+            self._mtime = mtime
+        return self._data
+
+    def use(self, data: Optional[StaticData]) -> None:
+        """Serve the given static data instead of the file's (until the file changes)."""
+        self._data = data
+        self._checked_at = time.monotonic()
+        try:
+            self._mtime = os.stat(self.path).st_mtime
+        except OSError:
+            self._mtime = None
+
+    async def sync(self, version: Optional[str] = None) -> StaticData:
+        """
+        Download a Data Dragon version (the latest by default), write it as the snapshot and serve it.
+        """
+        payload = await fetch_static_data(version)
+        write_static_data(self.path, payload)
+        data = StaticData.from_payload(payload)
+        self.use(data)
+        metrics.increment("static_data.syncs")
+        logger.info(f"Synced Data Dragon static data {data.version} to {self.path}")
+        return data
+
+    async def sync_if_outdated(self, patch: Optional[str]) -> Optional[StaticData]:
+        """
+        Sync the latest version when there is no snapshot or it is from an older patch than `patch`.
+
+        Failures are logged rather than raised, so this can run as a background task.
+        """
+        data = self.current()
+        if data is not None and (patch is None or _patch_of(data.version) >= _patch_of(patch)):
+            return data
+        try:
+            return await self.sync()
+        except Exception as e:
+            logger.warning(f"Could not sync Data Dragon static data: {e}")
+            return data
+
+
+def _patch_of(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r'\d+', version)[:2])
+
+
+# Create a singleton instance
+static_data_store = StaticDataStore(settings.STATIC_DATA_PATH)
@@ -0,0 +1,331 @@
+import json
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+from app.utils.tokens import count_tokens, truncate_to_tokens
+
+logger = get_logger("thread_store")
+
+# Split on sentence ends for extractive summaries
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+# First line of the message that replaces older turns with their summary
+SUMMARY_HEADER = "Summary of the earlier conversation:"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS thread_turns (
+    thread_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (thread_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class ToolResult:
+    name: str
+    input: str
+    output: str
+
+
+@dataclass
+class Turn:
+    """A user query, the tool results gathered while answering it, and the answer."""
+    query: str
+    answer: str
+    tool_results: List[ToolResult] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Turn":
+        tool_results = [ToolResult(**result) for result in data.get("tool_results", [])]
+        return cls(data["query"], data["answer"], tool_results, data.get("created_at", 0.0))
+
+
+def first_sentence(text: str, max_chars: int) -> str:
+    """
+    Get the first sentence of a text on one line, cut to `max_chars` characters.
+    """
+    text = " ".join(text.split())
+    sentence = SENTENCE_END.split(text, maxsplit=1)[0]
+    return sentence if len(sentence) <= max_chars else sentence[:max_chars - 3].rstrip() + "..."
+
+
+def summarize_turn(turn: Turn) -> str:
+    """
+    Summarize a turn in one line, extractively: the first sentence of the query
+    and of the answer, plus the tools that were used.
+    """
+    line = f"- User: {first_sentence(turn.query, 150)} | Assistant: {first_sentence(turn.answer, 200)}"
+    if turn.tool_results:
+        tools = ", ".join(dict.fromkeys(result.name for result in turn.tool_results))
+        line += f" (used {tools})"
+    return line
+
+
+def render_turn(turn: Turn) -> List[Dict[str, str]]:
+    """
+    Render a turn as chat messages; tool results are kept in front of the answer
+    so follow-up questions can reuse them without calling the tools again.
+    """
+    answer = turn.answer
+    if turn.tool_results:
+        results = "\n\n".join(
+            f"[{result.name} result for {result.input}]\n{result.output}" for result in turn.tool_results
+        )
+        answer = f"{results}\n\n{answer}"
+    return [{"role": "user", "content": turn.query}, {"role": "assistant", "content": answer}]
+
+
+class ThreadStore:
+    """
+    Server-side conversation memory keyed by thread id.
+
+    Threads are kept in an in-memory LRU and, when a database path is given,
+    persisted to SQLite so they survive restarts and LRU evictions. Writes are
+    queued and applied by a writer thread, so appending a turn never waits on
+    the database. `history`
+    returns the most recent turns that fit a token budget, with the older ones
+    condensed into an extractive summary instead of being resent verbatim.
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 1000,
+        max_turns: int = 100,
+        max_tool_result_tokens: int = 1000,
+        db_path: Optional[str] = None
+    ):
+        """
+        Args:
+            max_threads: Maximum number of threads kept in memory
+            max_turns: Maximum number of turns kept per thread (oldest dropped first)
+            max_tool_result_tokens: Tool outputs are truncated to this many tokens
+            db_path: SQLite database used to persist threads (memory only if None)
+        """
+        self.max_threads = max_threads
+        self.max_turns = max_turns
+        self.max_tool_result_tokens = max_tool_result_tokens
+        self.db_path = db_path
+        self._threads: "OrderedDict[str, List[Turn]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._queue: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        # Queued operations per thread id, and a condition notified as they are written
+        self._pending: Counter = Counter()
+        self._written = threading.Condition(self._lock)
+
+        if db_path:
+            self._db = self._connect()
+            self._db.executescript(SCHEMA)
+            self._writer = threading.Thread(target=self._write_loop, name="thread-store-writer", daemon=True)
+            self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def _turns(self, thread_id: str) -> List[Turn]:
+        turns = self._threads.get(thread_id)
+        if turns is not None:
+            self._threads.move_to_end(thread_id)
+            return turns
+
+        turns = self._load(thread_id)
+        self._threads[thread_id] = turns
+        while len(self._threads) > self.max_threads:
+            self._threads.popitem(last=False)
+            metrics.increment("thread_store.evictions")
+        return turns
+
+    def _load(self, thread_id: str) -> List[Turn]:
+        if self._db is None:
+            return []
+        # This thread's turns still waiting in the queue must be in the database first
+        while self._pending[thread_id] and self._writer is not None and self._writer.is_alive():
+            self._written.wait()
+        rows = self._db.execute(
+            "SELECT payload FROM thread_turns WHERE thread_id = ? ORDER BY seq DESC LIMIT ?",
+            (thread_id, self.max_turns)
+        ).fetchall()
+        return [Turn.from_dict(json.loads(payload)) for (payload,) in reversed(rows)]
+
+    def get_turns(self, thread_id: str) -> List[Turn]:
+        """
+        Get a copy of the stored turns of a thread, oldest first.
+        """
+        with self._lock:
+            return list(self._turns(thread_id))
+
+    def append_turn(self, thread_id: str, turn: Turn) -> None:
+        """
+        Add a completed turn to a thread.
+
+        Args:
+            thread_id: Conversation thread id
+            turn: The query, its tool results and the answer
+        """
+        for result in turn.tool_results:
+            result.output = truncate_to_tokens(result.output, self.max_tool_result_tokens)
+
+        with self._lock:
+            turns = self._turns(thread_id)
+            turns.append(turn)
+            del turns[:-self.max_turns]
+            self._enqueue("append", (thread_id, json.dumps(asdict(turn)), self.max_turns))
+        metrics.increment("thread_store.turns_appended")
+
+    def history(self, thread_id: str, max_tokens: int) -> List[Dict[str, str]]:
+        """
+        Get the history of a thread as chat messages, trimmed to a token budget.
+
+        The newest turns are kept verbatim for as long as they fit. Older turns
+        are replaced by a summary message (up to a quarter of the budget, the
+        most recent summary lines kept first).
+
+        Args:
+            thread_id: Conversation thread id
+            max_tokens: Token budget of the returned messages
+
+        Returns:
+            Messages with "role" ("user" or "assistant") and "content", oldest first
+        """
+        turns = self.get_turns(thread_id)
+        if not turns:
+            return []
+
+        summary_budget = max_tokens // 4
+        verbatim_budget = max_tokens - summary_budget
+        kept: List[List[Dict[str, str]]] = []
+        used = 0
+
+        for turn in reversed(turns):
+            messages = render_turn(turn)
+            cost = sum(count_tokens(message["content"]) for message in messages)
+            if used + cost > verbatim_budget:
+                break
+            kept.append(messages)
+            used += cost
+
+        older = turns[:len(turns) - len(kept)]
+        history: List[Dict[str, str]] = []
+
+        if older:
+            lines: List[str] = []
+            summary_tokens = 0
+            for turn in reversed(older):
+                line = summarize_turn(turn)
+                line_tokens = count_tokens(line)
+                if summary_tokens + line_tokens > summary_budget:
+                    break
+                lines.insert(0, line)
+                summary_tokens += line_tokens
+
+            if lines:
+                history.append({
+                    "role": "user",
+                    "content": SUMMARY_HEADER + "\n" + "\n".join(lines)
+                })
+            metrics.increment("thread_store.turns_summarized", len(older))
+            used += summary_tokens
+
+        for messages in reversed(kept):
+            history.extend(messages)
+
+        metrics.increment("thread_store.history_tokens", used)
+        return history
+
+    def clear(self, thread_id: str) -> None:
+        """
+        Forget a thread.
+        """
+        with self._lock:
+            self._threads.pop(thread_id, None)
+            self._enqueue("clear", (thread_id,))
+
+    # Write-behind
+
+    def _enqueue(self, kind: str, row: tuple) -> None:
+        # Called with the lock held, so close() cannot stop the writer in between
+        if self._writer is not None:
+            self._pending[row[0]] += 1
+            self._queue.put((kind, row))
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        running = True
+        while running:
+            # Write whatever has queued up meanwhile in the same transaction
+            batch: List[Optional[Tuple[str, tuple]]] = [self._queue.get()]
+            while batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            operations = [operation for operation in batch if operation is not None]
+            running = len(operations) == len(batch)
+            try:
+                with connection:
+                    for kind, row in operations:
+                        self._apply(connection, kind, row)
+                metrics.increment("thread_store.batches_written")
+            except Exception as e:
+                metrics.increment("thread_store.write_errors")
+                logger.error(f"Failed to write {len(operations)} thread store operations: {e}")
+            finally:
+                with self._lock:
+                    for _, row in operations:
+                        self._pending[row[0]] -= 1
+                        if not self._pending[row[0]]:
+                            del self._pending[row[0]]
+                    self._written.notify_all()
+                for _ in batch:
+                    self._queue.task_done()
+        connection.close()
+
+    @staticmethod
+    def _apply(connection: sqlite3.Connection, kind: str, row: tuple) -> None:
+        if kind == "append":
+            thread_id, payload, max_turns = row
+            seq = connection.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM thread_turns WHERE thread_id = ?", (thread_id,)
+            ).fetchone()[0]
+            connection.execute("INSERT INTO thread_turns VALUES (?, ?, ?)", (thread_id, seq, payload))
+            connection.execute(
+                "DELETE FROM thread_turns WHERE thread_id = ? AND seq <= ?", (thread_id, seq - max_turns)
+            )
+        elif kind == "clear":
+            connection.execute("DELETE FROM thread_turns WHERE thread_id = ?", row)
+
+    def flush(self) -> None:
+        """
+        Wait until every queued write is in the database.
+        """
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """
+        Write everything still queued and close the SQLite connection, if any.
+        """
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,213 @@
+from typing import Any, Callable, Dict, List, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+from app.utils.thread_store import SUMMARY_HEADER, ToolResult, Turn, summarize_turn
+from app.utils.tokens import count_message_tokens, count_tokens, truncate_to_tokens
+
+logger = get_logger("token_budget")
+
+# Prompt components recorded per model call
+COMPONENTS = ("system", "history", "match", "query", "tools")
+
+# Marker the agents put in front of the match context of a query
+MATCH_CONTEXT_PREFIX = "CURRENT MATCH CONTEXT:"
+QUERY_MARKER = "USER QUERY:"
+
+TRUNCATED_SUFFIX = "\n[truncated to fit the prompt budget]"
+
+
+def measure_prompt(messages: Sequence[BaseMessage]) -> Dict[str, int]:
+    """
+    Count the tokens of each component of an agent prompt.
+
+    The last human message is the current query (split into its match context
+    and the query itself); messages before it are conversation history, and
+    messages after it are the tool calls and results of the current run.
+
+    Args:
+        messages: Prompt messages, system prompt first
+
+    Returns:
+        Tokens per component (see COMPONENTS)
+    """
+    usage = dict.fromkeys(COMPONENTS, 0)
+    last_human = _last_human_index(messages)
+
+    for index, message in enumerate(messages):
+        if isinstance(message, SystemMessage):
+            usage["system"] += count_message_tokens(message)
+        elif index < last_human:
+            usage["history"] += count_message_tokens(message)
+        elif index > last_human:
+            usage["tools"] += count_message_tokens(message)
+        else:
+            content = str(message.content)
+            if content.startswith(MATCH_CONTEXT_PREFIX) and QUERY_MARKER in content:
+                match_context, query = content.split(QUERY_MARKER, 1)
+                usage["match"] += count_tokens(match_context)
+                usage["query"] += count_tokens(query)
+            else:
+                usage["query"] += count_tokens(content)
+    return usage
+
+
+def _last_human_index(messages: Sequence[BaseMessage]) -> int:
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            return index
+    return len(messages)
+
+
+def _truncate(message: BaseMessage, max_tokens: int) -> BaseMessage:
+    content = str(message.content)
+    if content.startswith(MATCH_CONTEXT_PREFIX) and QUERY_MARKER in content:
+        # Only the match context is cut; the user's question is always kept whole
+        match_context, query = content.split(QUERY_MARKER, 1)
+        query = QUERY_MARKER + query
+        match_tokens = max(max_tokens - count_tokens(query), 0)
+        content = truncate_to_tokens(match_context, match_tokens) + TRUNCATED_SUFFIX + "\n\n" + query
+    else:
+        content = truncate_to_tokens(content, max_tokens) + TRUNCATED_SUFFIX
+    return message.model_copy(update={"content": content})
+
+
+def _as_turn(messages: List[BaseMessage]) -> Turn:
+    query = str(messages[0].content)
+    if query.startswith(MATCH_CONTEXT_PREFIX) and QUERY_MARKER in query:
+        query = query.split(QUERY_MARKER, 1)[1]
+    answers = [message for message in messages if isinstance(message, AIMessage) and message.content]
+    answer = str(answers[-1].content) if answers else "(no answer)"
+    tool_results = [
+        ToolResult(tool_call["name"], "", "")
+        for message in messages for tool_call in getattr(message, "tool_calls", None) or []
+    ]
+    return Turn(query, answer, tool_results)
+
+
+def _summarize_turns(turns: List[List[BaseMessage]]) -> HumanMessage:
+    # Same extractive summary as the thread store's history
+    lines = [summarize_turn(_as_turn(turn)) for turn in turns]
+    return HumanMessage(content=SUMMARY_HEADER + "\n" + "\n".join(lines))
+
+
+class PromptBudget:
+    """
+    Keeps agent prompts within a token budget and records their token usage.
+
+    Every model call of an agent goes through `fit`, which records the tokens of
+    each prompt component as `tokens.<stage>.<component>` metrics and, when the
+    prompt is over budget, trims its lowest-value parts first:
+
+    1. Tool results from earlier steps are cut to `max_tool_result_tokens`
+    2. The oldest conversation turns are replaced by an extractive summary
+    3. The largest remaining messages (current tool results, then the query
+       with its match context) are truncated
+
+    The system prompt is never trimmed.
+    """
+
+    def __init__(self, stage: str, max_tokens: int, max_tool_result_tokens: int = 2000):
+        """
+        Args:
+            stage: Name used in the metrics (e.g. "chatbot", "builds")
+            max_tokens: Token budget of a whole prompt
+            max_tool_result_tokens: Token cap of tool results from earlier steps
+        """
+        self.stage = stage
+        self.max_tokens = max_tokens
+        self.max_tool_result_tokens = max_tool_result_tokens
+
+    def fit(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        """
+        Trim a prompt to the budget.
+
+        Args:
+            messages: Prompt messages, system prompt first
+
+        Returns:
+            The messages themselves if they fit, otherwise trimmed copies
+        """
+        usage = measure_prompt(messages)
+        total = sum(usage.values())
+        metrics.increment(f"tokens.{self.stage}.calls")
+        for component, tokens in usage.items():
+            metrics.increment(f"tokens.{self.stage}.{component}", tokens)
+        metrics.set(f"tokens.{self.stage}.last_prompt", total)
+
+        if total <= self.max_tokens:
+            return list(messages)
+
+        trimmed = self._trim(list(messages))
+        trimmed_total = sum(count_message_tokens(message) for message in trimmed)
+        metrics.increment(f"tokens.{self.stage}.trimmed_calls")
+        metrics.increment(f"tokens.{self.stage}.trimmed_tokens", total - trimmed_total)
+        logger.info(f"Trimmed {self.stage} prompt from {total} to {trimmed_total} tokens (budget {self.max_tokens})")
+        return trimmed
+
+    def _trim(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        counts = [count_message_tokens(message) for message in messages]
+        excess = sum(counts) - self.max_tokens
+        last_human = _last_human_index(messages)
+
+        # 1. Tool results of earlier turns
+        for index in range(last_human):
+            if excess <= 0:
+                return messages
+            if isinstance(messages[index], ToolMessage) and counts[index] > self.max_tool_result_tokens:
+                messages[index] = _truncate(messages[index], self.max_tool_result_tokens)
+                new_count = count_message_tokens(messages[index])
+                excess -= counts[index] - new_count
+                counts[index] = new_count
+
+        # 2. Oldest turns, replaced by a summary
+        if excess > 0:
+            start = 1 if messages and isinstance(messages[0], SystemMessage) else 0
+            turn_starts = [
+                index for index in range(start, last_human) if isinstance(messages[index], HumanMessage)
+            ]
+            dropped_until = start
+            for turn_start, next_start in zip(turn_starts, turn_starts[1:] + [last_human]):
+                if excess <= 0:
+                    break
+                excess -= sum(counts[turn_start:next_start])
+                dropped_until = next_start
+
+            if dropped_until > start:
+                turns = [
+                    messages[turn_start:next_start]
+                    for turn_start, next_start in zip(turn_starts, turn_starts[1:] + [last_human])
+                    if next_start <= dropped_until
+                ]
+                summary = _summarize_turns(turns)
+                excess += count_message_tokens(summary)
+                messages = messages[:start] + [summary] + messages[dropped_until:]
+                counts = [count_message_tokens(message) for message in messages]
+                metrics.increment(f"tokens.{self.stage}.turns_summarized", len(turns))
+
+        # 3. Largest remaining messages
+        for index in sorted(range(len(messages)), key=lambda i: counts[i], reverse=True):
+            if excess <= 0:
+                break
+            if isinstance(messages[index], SystemMessage) or getattr(messages[index], "tool_calls", None):
+                continue
+            # Leave room for the truncation marker
+            keep = max(counts[index] - excess - count_tokens(TRUNCATED_SUFFIX) - 2, min(counts[index], 200))
+            if keep < counts[index]:
+                messages[index] = _truncate(messages[index], keep)
+                excess -= counts[index] - count_message_tokens(messages[index])
+
+        return messages
+
+    def prompt(self, system_prompt: str) -> Callable[[Dict[str, Any]], List[BaseMessage]]:
+        """
+        Build a `create_react_agent` prompt that prepends the system prompt and fits the budget.
+        """
+        system_message = SystemMessage(content=system_prompt)
+
+        def budgeted_prompt(state: Dict[str, Any]) -> List[BaseMessage]:
+            return self.fit([system_message] + list(state["messages"]))
+
+        return budgeted_prompt
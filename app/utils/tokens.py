@@ -0,0 +1,77 @@
+from functools import lru_cache
+from typing import Any, Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger("tokens")
+
+# Rough characters-per-token ratio used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def get_encoding(name: str = "cl100k_base") -> Optional[Any]:
+    """
+    Load a tiktoken encoding, or None if tiktoken or its encoding file is unavailable.
+
+    The encoding file is downloaded on first use, so this fails on machines
+    without network access unless it is already in the tiktoken cache.
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning(f"tiktoken encoding {name} unavailable, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a text (estimated from its length if no tokenizer is available).
+    """
+    encoding = get_encoding()
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut a text down to at most `max_tokens` tokens.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Maximum number of tokens to keep
+
+    Returns:
+        The text itself if it fits, otherwise its longest prefix that does
+    """
+    encoding = get_encoding()
+    if encoding is None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        return text if len(text) <= max_chars else text[:max_chars]
+
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def count_message_tokens(message: Any) -> int:
+    """
+    Count the tokens of a chat message's content, including tool call arguments.
+
+    Args:
+        message: A LangChain message (or anything with a `content` attribute)
+
+    Returns:
+        The number of tokens in the message text
+    """
+    content = getattr(message, "content", message)
+    if isinstance(content, list):
+        content = " ".join(part if isinstance(part, str) else str(part.get("text", "")) for part in content)
+    tokens = count_tokens(str(content))
+
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += count_tokens(f"{tool_call.get('name', '')} {tool_call.get('args', '')}")
+    return tokens
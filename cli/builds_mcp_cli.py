@@ -12,7 +12,10 @@ from typing import Optional
 # Add the app directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from app.mcp.builds_mcp import get_champion_build, get_champion_stats
+from app.utils.static_data import fetch_champion_slugs
+from app.mcp.builds_mcp import SNAPSHOT_PATH, crawl_snapshot, get_champion_build, get_champion_stats
+from app.utils.http_client import close_http_clients
+from app.utils.static_data import static_data_store
 
 
 async def get_build_info(champion: str, output_file: Optional[str] = None) -> str:
@@ -63,6 +66,28 @@ async def get_champion_statistics(champion: str) -> str:
         return error_msg
 
 
+async def create_snapshot(path: str, champions: Optional[list[str]], concurrency: int, delay: float) -> None:
+    """Crawl every champion (or the given ones) and write a build snapshot."""
+    if not champions:
+        print("📚 Fetching the champion list from Data Dragon...")
+        champions = await fetch_champion_slugs()
+    
+    print(f"🕸️ Crawling {len(champions)} champions ({concurrency} at a time, {delay:.1f}s apart)...")
+    written, errors = await crawl_snapshot(champions, path, concurrency=concurrency, delay=delay)
+    
+    for champion, error in sorted(errors.items()):
+        print(f"⚠️ {champion}: {error}")
+    print(f"\n💾 Wrote {written} champions to {path} ({len(errors)} with errors)")
+
+
+async def sync_static_data(version: Optional[str]) -> None:
+    """Download Data Dragon champion, item, rune and spell names into the static data snapshot."""
+    print(f"📚 Downloading Data Dragon static data ({version or 'latest version'})...")
+    data = await static_data_store.sync(version)
+    print(f"\n💾 Wrote {len(data.champion_names)} champions, {len(data.items)} items, "
+          f"{len(data.runes)} runes and {len(data.spells)} spells ({data.version}) to {static_data_store.path}")
+
+
 async def main():
     """Main CLI function."""
     parser = argparse.ArgumentParser(
@@ -74,11 +99,15 @@ Examples:
   python builds_mcp_cli.py yasuo --stats          # Get stats for Yasuo
   python builds_mcp_cli.py ahri --output ahri.txt # Save build info to file
   python builds_mcp_cli.py jinx --both            # Get both build info and stats
+  python builds_mcp_cli.py --snapshot             # Snapshot every champion (e.g. nightly)
+  python builds_mcp_cli.py --snapshot --champions jinx,ahri --delay 2
+  python builds_mcp_cli.py --static-data          # Sync Data Dragon names (latest version)
         """
     )
     
     parser.add_argument(
         "champion",
+        nargs="?",
         help="Champion name (e.g., jinx, yasuo, ahri)"
     )
     
@@ -99,6 +128,48 @@ Examples:
         help="Save output to specified file"
     )
     
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Crawl builds and stats for every champion and write a snapshot file"
+    )
+    
+    parser.add_argument(
+        "--snapshot-path",
+        default=SNAPSHOT_PATH,
+        help=f"Snapshot file to write (default: {SNAPSHOT_PATH})"
+    )
+    
+    parser.add_argument(
+        "--champions",
+        help="Comma-separated champions to snapshot (default: all champions from Data Dragon)"
+    )
+    
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Champions crawled at once in snapshot mode"
+    )
+    
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=1.0,
+        help="Minimum seconds between OP.GG page fetches in snapshot mode"
+    )
+    
+    parser.add_argument(
+        "--static-data",
+        action="store_true",
+        help=f"Download Data Dragon champion, item, rune and spell names to {static_data_store.path}"
+    )
+    
+    parser.add_argument(
+        "--ddragon-version",
+        help="Data Dragon version to download with --static-data (default: latest)"
+    )
+    
     parser.add_argument(
         "--version", "-v",
         action="version",
@@ -107,13 +178,26 @@ Examples:
     
     args = parser.parse_args()
     
-    # Normalize champion name
-    champion = args.champion.lower().strip()
+    if not args.snapshot and not args.static_data and not args.champion:
+        parser.error("a champion is required unless --snapshot or --static-data is used")
     
     print("🎮 League of Legends Builds MCP CLI")
     print("=" * 50)
     
     try:
+        if args.static_data:
+            await sync_static_data(args.ddragon_version)
+            if not args.snapshot:
+                return
+        
+        if args.snapshot:
+            champions = [name.strip() for name in args.champions.split(",") if name.strip()] if args.champions else None
+            await create_snapshot(args.snapshot_path, champions, args.concurrency, args.delay)
+            return
+        
+        # Normalize champion name
+        champion = args.champion.lower().strip()
+        
         if args.both:
             # Get both build info and stats
             print("📋 Getting both build information and statistics...\n")
@@ -142,6 +226,8 @@ Examples:
     except Exception as e:
         print(f"\n❌ Unexpected error: {str(e)}")
         sys.exit(1)
+    finally:
+        await close_http_clients()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the OP.GG scraping pipeline.
+
+Runs the builds MCP parsing pipeline over the recorded corpus of OP.GG build
+pages (see app/mcp/opgg_benchmark.py) and reports, per champion, the parse
+latency, the peak parse memory, the extraction accuracy against the golden
+outputs and the prompt tokens the Gemini fallback would send.
+
+The corpus can also be served over HTTP, so the MCP server or the builds CLI
+can run against it by pointing OPGG_BASE_URL at the stand-in.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict
+
+import httpx
+
+# Add the parent directory to the Python path so we can import from app
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.mcp import builds_mcp
+from app.mcp.builds_mcp import parse_champion_page
+from app.mcp.opgg_benchmark import (
+    benchmark_champion, fixture_transport, load_corpus, load_golden, write_golden
+)
+from app.mcp.opgg_parser import HTML_PARSER
+from app.utils.http_client import close_http_clients
+
+# Synthetic OP.GG-style pages checked in with the tests; --record adds real ones
+FIXTURES_DIR = project_root / "tests" / "fixtures" / "opgg"
+
+
+def serve_fixtures(port: int, fixtures_dir: Path = FIXTURES_DIR) -> None:
+    """Serve the corpus over HTTP on localhost until interrupted."""
+    transport = fixture_transport(fixtures_dir)
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            response = transport.handle_request(httpx.Request("GET", f"http://localhost{self.path}"))
+            body = response.read()
+            self.send_response(response.status_code)
+            self.send_header("Content-Type", response.headers.get("Content-Type", "text/plain"))
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), FixtureHandler)
+    print(f"🌐 Serving {fixtures_dir} at http://127.0.0.1:{port} (set OPGG_BASE_URL to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+async def record_pages(champions: list[str], fixtures_dir: Path = FIXTURES_DIR) -> None:
+    """Record live OP.GG pages into the corpus, with golden outputs from the current parser."""
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        for champion in champions:
+            slug = builds_mcp.normalize_champion_name(champion)
+            html_content = await builds_mcp.make_opgg_request(f"{builds_mcp.OPGG_BASE}/lol/champions/{slug}/build")
+            if not html_content:
+                print(f"❌ Could not fetch the OP.GG page for {champion}")
+                continue
+
+            (fixtures_dir / f"{slug}.html").write_text(html_content, encoding="utf-8")
+            write_golden(slug, parse_champion_page(html_content, slug), fixtures_dir)
+            print(f"💾 Recorded {slug} - review {slug}.golden.json before committing it")
+    finally:
+        await close_http_clients()
+
+
+def print_report(results: list[Dict[str, Any]]) -> None:
+    """Print the benchmark results as a table."""
+    columns = ["champion", "page_kb", "parse_ms", "peak_kb", "confident", "accuracy", "raw_tokens", "prompt_tokens"]
+    rows = [[str(result[column]) for column in columns] for result in results]
+    widths = [max(len(column), *(len(row[i]) for row in rows)) for i, column in enumerate(columns)]
+
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    print("  ".join("-" * width for width in widths))
+    for row in rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+
+
+def main():
+    """Main CLI function."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the OP.GG scraping pipeline against a recorded page corpus",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python opgg_benchmark_cli.py                      # Benchmark every recorded page
+  python opgg_benchmark_cli.py jinx ahri --runs 20  # Benchmark selected champions
+  python opgg_benchmark_cli.py --json               # Machine-readable results
+  python opgg_benchmark_cli.py --record jinx yasuo  # Record live pages into the corpus
+  python opgg_benchmark_cli.py --update-golden      # Rewrite golden outputs from the current parser
+  python opgg_benchmark_cli.py --serve 8765         # Serve the corpus as an OP.GG stand-in
+        """
+    )
+
+    parser.add_argument("champions", nargs="*", help="Champion slugs to benchmark (default: the whole corpus)")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="Corpus directory")
+    parser.add_argument("--runs", type=int, default=5, help="Parse runs per page (the median is reported)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--record", action="store_true", help="Record live OP.GG pages for the given champions")
+    parser.add_argument("--update-golden", action="store_true", help="Rewrite golden outputs from the current parser")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="Serve the corpus over HTTP on PORT")
+
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_fixtures(args.serve, args.fixtures)
+        return
+
+    if args.record:
+        if not args.champions:
+            parser.error("--record needs at least one champion")
+        asyncio.run(record_pages(args.champions, args.fixtures))
+        return
+
+    corpus = load_corpus(args.fixtures)
+    champions = [builds_mcp.normalize_champion_name(champion) for champion in args.champions] or list(corpus)
+    missing = [champion for champion in champions if champion not in corpus]
+    if missing:
+        parser.error(f"No recorded page for: {', '.join(missing)}")
+
+    if args.update_golden:
+        for champion in champions:
+            write_golden(champion, parse_champion_page(corpus[champion], champion), args.fixtures)
+            print(f"💾 Updated {champion}.golden.json")
+        return
+
+    results = [
+        benchmark_champion(champion, corpus[champion], load_golden(champion, args.fixtures), args.runs)
+        for champion in champions
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"📊 OP.GG pipeline benchmark ({len(results)} pages, parser: {HTML_PARSER})\n")
+        print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,10 @@ import functools
 from fastapi import FastAPI
 from typing import Callable, Any, Dict, List
 import importlib
+from pathlib import Path
+
+# Synthetic OP.GG build pages and their golden outputs (see app/mcp/opgg_benchmark.py)
+OPGG_FIXTURES_DIR = Path(__file__).parent / "fixtures" / "opgg"
 
 def import_module_function(import_path: str) -> Callable:
     """
@@ -0,0 +1,62 @@
+import asyncio
+import time
+import pytest
+from app.mcp import builds_mcp
+from app.mcp.build_snapshot import BuildSnapshot, SnapshotStore
+from app.mcp.opgg_benchmark import fixture_transport
+from tests.helpers import OPGG_FIXTURES_DIR
+from app.mcp.patch_registry import patch_registry
+from app.utils.http_client import ManagedHTTPClient
+
+
+def _use_fixtures(monkeypatch):
+    monkeypatch.setattr(builds_mcp, "opgg_http", ManagedHTTPClient("opgg_fixtures", transport=fixture_transport(OPGG_FIXTURES_DIR)))
+    monkeypatch.setattr(patch_registry, "current", None)
+    for cache in (builds_mcp.page_cache, builds_mcp.build_cache, builds_mcp.stats_cache):
+        cache.clear()
+
+
+def test_crawl_writes_a_snapshot_with_errors_reported(monkeypatch, tmp_path):
+    """
+    Test that the crawl writes every fetchable champion and reports the ones that fail.
+    """
+    _use_fixtures(monkeypatch)
+    path = str(tmp_path / "snapshot.sqlite")
+
+    written, errors = asyncio.run(builds_mcp.crawl_snapshot(["Jinx", "ahri", "notachampion"], path, delay=0))
+
+    snapshot = BuildSnapshot.load(path)
+    assert written == 2
+    assert list(errors) == ["notachampion"]
+    assert sorted(snapshot.entries) == ["ahri", "jinx"]
+    assert snapshot.get("jinx").build.source == "opgg"
+    assert snapshot.get("jinx").stats.champion == snapshot.get("jinx").build.champion
+
+
+def test_tools_serve_from_the_snapshot_and_go_live_when_expired(monkeypatch, tmp_path):
+    """
+    Test that lookups read fresh snapshot entries without fetching, and fetch expired ones live.
+    """
+    _use_fixtures(monkeypatch)
+    path = str(tmp_path / "snapshot.sqlite")
+    asyncio.run(builds_mcp.crawl_snapshot(["jinx"], path, delay=0))
+    monkeypatch.setattr(builds_mcp, "snapshot_store", SnapshotStore(path))
+
+    fetched = []
+
+    async def fake_fetch(url):
+        fetched.append(url)
+        return None
+
+    monkeypatch.setattr(builds_mcp, "_fetch_opgg_page", fake_fetch)
+    builds_mcp.page_cache.clear()
+
+    build = asyncio.run(builds_mcp.get_cached_build("Jinx"))
+    stats = asyncio.run(builds_mcp.get_cached_stats("jinx"))
+    assert build.core_items and stats.win_rate is not None
+    assert fetched == []
+
+    builds_mcp.snapshot_store.get("jinx").fetched_at = time.time() - builds_mcp.SNAPSHOT_MAX_AGE_SECONDS - 1
+    with pytest.raises(builds_mcp.ChampionDataError):
+        asyncio.run(builds_mcp.get_cached_stats("jinx"))
+    assert fetched == ["https://op.gg/lol/champions/jinx/build"]
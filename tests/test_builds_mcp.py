@@ -0,0 +1,244 @@
+import asyncio
+import json
+import pytest
+from app.mcp import builds_mcp
+from app.models.builds import ChampionBuild, ItemBuildOption
+from app.utils.http_client import ManagedHTTPClient
+from app.mcp.opgg_benchmark import fixture_transport, load_corpus, load_golden, score_extraction
+from tests.helpers import OPGG_FIXTURES_DIR
+from tests.test_opgg_parser import JINX_BUILD_PAGE
+
+
+JINX_PAGE = """
+<html><body>
+<h1>Jinx</h1>
+<div id="content-container">
+<p>Version: 14.23</p><p>Jinx build for Bottom</p><p>125,847 games</p>
+<p>1 Tier</p><p>Win rate 52.97%</p><p>Pick rate 8.45%</p><p>Ban rate 2.10%</p>
+<section><a href="/lol/champions/jinx/items">Item builds</a><span>Yun Tal Wildarrows</span></section>
+</div>
+</body></html>
+"""
+
+
+def test_build_and_stats_share_one_page_fetch(monkeypatch):
+    """
+    Test that the build and stats tools download and parse the champion page once.
+    """
+    fetched = []
+    extracted = []
+
+    async def fake_fetch(url):
+        fetched.append(url)
+        await asyncio.sleep(0.01)
+        return JINX_PAGE
+
+    async def fake_extract(page_content, champion):
+        extracted.append(page_content)
+        return ChampionBuild(champion=champion, core_items=[
+            ItemBuildOption(items=["Yun Tal Wildarrows"], pick_rate=50.0, win_rate=55.0)
+        ])
+
+    monkeypatch.setattr(builds_mcp, "_fetch_opgg_page", fake_fetch)
+    monkeypatch.setattr(builds_mcp, "_extract_build_info_with_gemini", fake_extract)
+    for cache in (builds_mcp.page_cache, builds_mcp.build_cache, builds_mcp.stats_cache):
+        cache.clear()
+
+    async def run():
+        return await asyncio.gather(
+            builds_mcp.get_champion_build("Jinx"),
+            builds_mcp.get_champion_stats("jinx")
+        )
+
+    build, stats = asyncio.run(run())
+
+    assert fetched == ["https://op.gg/lol/champions/jinx/build"]
+    assert "Yun Tal Wildarrows (50.00% pick, 55.00% win)" in build
+    assert "Yun Tal Wildarrows" in extracted[0]
+    assert stats == (
+        "Jinx stats | patch 14.23 | Bottom\n"
+        "Tier 1 | Win 52.97% | Pick 8.45% | Ban 2.10% | 125,847 games"
+    )
+
+
+def test_build_tool_skips_gemini_for_parsable_pages(monkeypatch):
+    """
+    Test that a page with parsable item tables is answered without Gemini.
+    """
+    extracted = []
+
+    async def fake_fetch(url):
+        return JINX_BUILD_PAGE
+
+    async def fake_extract(page_content, champion):
+        extracted.append(page_content)
+        return ChampionBuild(champion=champion)
+
+    monkeypatch.setattr(builds_mcp, "_fetch_opgg_page", fake_fetch)
+    monkeypatch.setattr(builds_mcp, "_extract_build_info_with_gemini", fake_extract)
+    for cache in (builds_mcp.page_cache, builds_mcp.build_cache):
+        cache.clear()
+
+    build = asyncio.run(builds_mcp.get_champion_build("jinx"))
+
+    assert extracted == []
+    assert "Core:\n- Yun Tal Wildarrows > Infinity Edge > Phantom Dancer (34.19% pick, 60.58% win" in build
+    assert "Boots:\n- Berserker's Greaves (89.70% pick, 52.40% win, 39,210 games)" in build
+
+
+def use_fixture_corpus(monkeypatch):
+    """Serve OP.GG requests from the recorded corpus and start from empty caches."""
+    monkeypatch.setattr(builds_mcp, "opgg_http", ManagedHTTPClient("opgg_fixtures", transport=fixture_transport(OPGG_FIXTURES_DIR)))
+    for cache in (builds_mcp.page_cache, builds_mcp.build_cache, builds_mcp.stats_cache):
+        cache.clear()
+
+
+@pytest.mark.parametrize("champion", sorted(load_corpus(OPGG_FIXTURES_DIR)))
+def test_corpus_pages_match_golden_outputs(champion):
+    """
+    Test that every recorded OP.GG page is still parsed into its golden output.
+    """
+    page = builds_mcp.parse_champion_page(load_corpus(OPGG_FIXTURES_DIR)[champion], champion)
+
+    assert score_extraction(page, load_golden(champion, OPGG_FIXTURES_DIR)) == 1.0
+
+
+def test_stats_tool_reads_recorded_page(monkeypatch):
+    """
+    Test the stats tool end to end against the local OP.GG stand-in.
+    """
+    use_fixture_corpus(monkeypatch)
+
+    stats = asyncio.run(builds_mcp.get_champion_stats("Ahri", output_format="json"))
+
+    assert json.loads(stats) == load_golden("ahri", OPGG_FIXTURES_DIR)["stats"]
+
+
+def test_build_tool_falls_back_to_gemini_for_unknown_layouts(monkeypatch):
+    """
+    Test that a page the parser is not confident about is sent to Gemini as compact text.
+    """
+    use_fixture_corpus(monkeypatch)
+    extracted = []
+
+    async def fake_extract(page_content, champion):
+        extracted.append(page_content)
+        return ChampionBuild(champion=champion, source="gemini", core_items=[
+            ItemBuildOption(items=["Kraken Slayer", "Infinity Edge"], pick_rate=21.4, win_rate=54.9, games=5018)
+        ])
+
+    monkeypatch.setattr(builds_mcp, "_extract_build_info_with_gemini", fake_extract)
+
+    build = asyncio.run(builds_mcp.get_champion_build("kindred", output_format="json"))
+
+    assert json.loads(build)["source"] == "gemini"
+    assert json.loads(build)["patch"] == "14.23"
+    assert "[Kraken Slayer] [Infinity Edge]" in extracted[0]
+    assert "<" not in extracted[0]
+
+
+def test_unknown_champion_reports_fetch_error(monkeypatch):
+    """
+    Test that a champion without an OP.GG page returns a readable error.
+    """
+    use_fixture_corpus(monkeypatch)
+
+    result = asyncio.run(builds_mcp.get_champion_stats("notachampion"))
+
+    assert result.startswith("Unable to fetch OP.GG data for notachampion")
+
+
+def test_tools_reject_unknown_output_formats():
+    """
+    Test that an unsupported output format is reported instead of fetching data.
+    """
+    result = asyncio.run(builds_mcp.get_champion_build("jinx", output_format="xml"))
+
+    assert result.startswith("Unsupported output_format 'xml'")
+
+
+def test_batch_lookup_returns_partial_results_with_errors(monkeypatch):
+    """
+    Test that a bulk lookup returns every champion it could fetch plus an error for the rest.
+    """
+    monkeypatch.setattr(builds_mcp, "opgg_http", ManagedHTTPClient("opgg_fixtures", transport=fixture_transport(OPGG_FIXTURES_DIR)))
+    for cache in (builds_mcp.page_cache, builds_mcp.build_cache, builds_mcp.stats_cache):
+        cache.clear()
+
+    reports = json.loads(asyncio.run(builds_mcp.get_champions_builds(
+        ["Jinx", "notachampion", "ahri", "jinx"], output_format="json"
+    )))
+
+    assert [report["champion"] for report in reports] == ["Jinx", "notachampion", "ahri"]
+    assert reports[0]["build"]["core_items"] and reports[0]["stats"]["win_rate"]
+    assert "build" not in reports[1] and "stats" not in reports[1]
+    assert len(reports[1]["errors"]) == 2
+    assert reports[2]["errors"] == []
+
+
+def test_batch_lookup_takes_the_champions_of_a_match():
+    """
+    Test that every participant's champion of a match is looked up.
+    """
+    from app.utils.formatters import match_data
+
+    assert builds_mcp.champions_in_match({"match": match_data}) == [
+        "Zed", "Aurelion Sol", "Xayah", "Lux", "Vladimir", "Ryze", "Sona", "Talon", "Veigar", "Irelia"
+    ]
+
+
+def test_prefetched_entries_are_served_and_counted_as_used(monkeypatch):
+    """
+    Test that prefetching a match warms the caches and that later lookups are counted as prefetch uses.
+    """
+    monkeypatch.setattr(builds_mcp, "opgg_http", ManagedHTTPClient("opgg_fixtures", transport=fixture_transport(OPGG_FIXTURES_DIR)))
+    for cache in (builds_mcp.page_cache, builds_mcp.build_cache, builds_mcp.stats_cache):
+        cache.clear()
+    builds_mcp._prefetched.clear()
+    used_before = builds_mcp.metrics.get("builds.prefetch.used")
+
+    match = {"participants": [{"championName": "Jinx"}, {"championName": "Ahri"}]}
+
+    async def run():
+        await builds_mcp.prefetch_match(match)
+        builds_mcp.page_cache.clear()
+
+        async def no_fetch(url):
+            raise AssertionError(f"unexpected fetch of {url}")
+
+        monkeypatch.setattr(builds_mcp, "_fetch_opgg_page", no_fetch)
+        return await builds_mcp.get_cached_build("jinx"), await builds_mcp.get_cached_stats("ahri")
+
+    build, stats = asyncio.run(run())
+
+    assert build.core_items and stats.champion
+    assert builds_mcp.metrics.get("builds.prefetch.used") - used_before == 2
+    assert len(builds_mcp._prefetched) == 2
+
+
+def test_prefetch_waits_for_interactive_lookups_without_counting_snapshot_misses(monkeypatch):
+    """
+    Test that a prefetch starts only once interactive lookups finish and that its skip check leaves the snapshot metrics alone.
+    """
+    use_fixture_corpus(monkeypatch)
+    builds_mcp._prefetched.clear()
+    misses_before = builds_mcp.metrics.get("builds.snapshot_misses")
+    order = []
+
+    async def slow_interactive_fetch(champion):
+        await asyncio.sleep(0.05)
+        order.append("interactive")
+        return champion
+
+    async def run():
+        interactive = asyncio.create_task(builds_mcp._interactive_load(slow_interactive_fetch, "ahri"))
+        await asyncio.sleep(0)
+        await builds_mcp.prefetch_champions(["jinx"])
+        order.append("prefetched")
+        await interactive
+
+    asyncio.run(run())
+
+    assert order == ["interactive", "prefetched"]
+    assert builds_mcp.metrics.get("builds.snapshot_misses") == misses_before
+    assert builds_mcp.build_cache.get(builds_mcp.patch_registry.cache_key("jinx")) is not None
@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+from app.utils.cache import AsyncTTLCache
+
+
+class FakeClock:
+    """Manually advanced time source."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_loader(values, calls):
+    async def loader():
+        calls.append(1)
+        return values.pop(0)
+    return loader
+
+
+def test_cache_serves_fresh_entries_without_loading():
+    """
+    Test that fresh entries are served without calling the loader again.
+    """
+    cache = AsyncTTLCache("test_fresh", ttl=10, stale_ttl=10, clock=FakeClock())
+    calls = []
+
+    async def run():
+        first = await cache.get_or_load("jinx", make_loader(["build v1"], calls))
+        second = await cache.get_or_load("jinx", make_loader(["build v2"], calls))
+        return first, second
+
+    assert asyncio.run(run()) == ("build v1", "build v1")
+    assert len(calls) == 1
+
+
+def test_cache_serves_stale_entries_while_refreshing():
+    """
+    Test that stale entries are served immediately and refreshed in the background.
+    """
+    clock = FakeClock()
+    cache = AsyncTTLCache("test_stale", ttl=10, stale_ttl=10, clock=clock)
+    calls = []
+
+    async def run():
+        await cache.get_or_load("jinx", make_loader(["build v1"], calls))
+        clock.now = 15
+        stale = await cache.get_or_load("jinx", make_loader(["build v2"], calls))
+        # Let the background refresh finish
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        refreshed = await cache.get_or_load("jinx", make_loader(["build v3"], calls))
+        return stale, refreshed
+
+    assert asyncio.run(run()) == ("build v1", "build v2")
+    assert len(calls) == 2
+
+
+def test_cache_evicts_least_recently_used_entries():
+    """
+    Test that the cache stays bounded by evicting the least recently used entry.
+    """
+    cache = AsyncTTLCache("test_lru", maxsize=2, clock=FakeClock())
+    cache.set("jinx", "a")
+    cache.set("yasuo", "b")
+    cache.get("jinx")
+    cache.set("ahri", "c")
+
+    assert cache.keys() == ["jinx", "ahri"]
+
+
+def test_cache_does_not_store_loader_errors():
+    """
+    Test that a failing loader is retried on the next lookup.
+    """
+    cache = AsyncTTLCache("test_errors", clock=FakeClock())
+
+    async def failing_loader():
+        raise RuntimeError("OP.GG unavailable")
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("jinx", failing_loader)
+        return await cache.get_or_load("jinx", make_loader(["build"], []))
+
+    assert asyncio.run(run()) == "build"
+
+
+def test_cache_coalesces_concurrent_misses():
+    """
+    Test that concurrent misses for the same key share a single loader call.
+    """
+    cache = AsyncTTLCache("test_coalesce", clock=FakeClock())
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "build"
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_load("jinx", loader) for _ in range(4)))
+
+    assert asyncio.run(run()) == ["build"] * 4
+    assert len(calls) == 1
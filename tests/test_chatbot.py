@@ -1,6 +1,21 @@
+import asyncio
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 import uuid
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_core.tools import tool
+from langgraph.prebuilt import create_react_agent
+from app.agents.chatbot_agent import ChatbotAgent, ChatbotState
+from app.mcp.patch_registry import PatchRegistry
+from app.mcp.resource_cache import ResourceCache
+from app.services.chatbot_services import handle_chatbot_request
+from app.utils.checkpointer import SQLiteCheckpointSaver
+from app.utils.formatters import match_data
+from app.utils.match_encoding import encode_match, resolve_aliases
+from app.utils.metrics import metrics
 
 def test_chatbot_endpoint_returns_200(client):
     """
@@ -66,4 +81,270 @@ def test_chatbot_handles_custom_language(client):
         assert kwargs["language"] == "fr"
         
         # Verify response status
-        assert response.status_code == 200 
\ No newline at end of file
+        assert response.status_code == 200 
+
+
+class FakeToolCallingModel(GenericFakeChatModel):
+    """Fake chat model that streams its canned responses word by word."""
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def make_chatbot_agent(*responses):
+    """
+    Create a connected ChatbotAgent whose ReAct graph uses canned responses.
+    """
+    with patch("app.agents.chatbot_agent.ChatGoogleGenerativeAI"):
+        agent = ChatbotAgent()
+    
+    model = FakeToolCallingModel(messages=iter([AIMessage(content=r) for r in responses]))
+    agent.agent = create_react_agent(model=model, tools=[], prompt="test")
+    agent.is_connected = True
+    return agent
+
+
+async def collect_chatbot_stream(query):
+    return [
+        chunk async for chunk in handle_chatbot_request(
+            thread_id="thread-1", query=query, modelName="gemini-2.0-flash", match={}
+        )
+    ]
+
+
+def test_chatbot_service_streams_tokens():
+    """
+    Test that the chatbot service streams the answer as the model produces it.
+    """
+    agent = make_chatbot_agent("Build Infinity Edge first")
+    
+    with patch("app.services.chatbot_services._chatbot_agent", agent):
+        chunks = asyncio.run(collect_chatbot_stream("What should Jinx build?"))
+    
+    # The answer arrives token by token rather than as one buffered block
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Build Infinity Edge first"
+
+
+def test_chatbot_service_isolates_concurrent_requests():
+    """
+    Test that concurrent chatbot requests only receive their own events.
+    """
+    agent = make_chatbot_agent("first answer here", "second answer here")
+    
+    async def run_concurrently():
+        return await asyncio.gather(
+            collect_chatbot_stream("query one"),
+            collect_chatbot_stream("query two")
+        )
+    
+    with patch("app.services.chatbot_services._chatbot_agent", agent):
+        streams = asyncio.run(run_concurrently())
+    
+    assert sorted("".join(chunks) for chunks in streams) == ["first answer here", "second answer here"]
+
+
+def test_chatbot_service_cancels_run_on_disconnect():
+    """
+    Test that closing the response stream mid-answer cancels the agent run.
+    """
+    class SlowAgent:
+        is_connected = True
+        cancelled = False
+        
+        async def process_query_async(self, query, history=None, match=None, callback_handler=None, thread_id=None):
+            callback_handler.on_llm_new_token("partial")
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+    
+    agent = SlowAgent()
+    cancelled_before = metrics.get("chatbot.runs_cancelled")
+    
+    async def disconnect_after_first_chunk():
+        stream = handle_chatbot_request(
+            thread_id="thread-1", query="query", modelName="gemini-2.0-flash", match={}
+        )
+        first_chunk = await stream.__anext__()
+        # Simulate the client going away
+        await stream.aclose()
+        await asyncio.sleep(0)
+        return first_chunk
+    
+    with patch("app.services.chatbot_services._chatbot_agent", agent):
+        first_chunk = asyncio.run(disconnect_after_first_chunk())
+    
+    assert first_chunk == "partial"
+    assert agent.cancelled
+    assert metrics.get("chatbot.runs_cancelled") == cancelled_before + 1
+
+
+def test_chatbot_service_reports_errors_after_streamed_tokens():
+    """
+    Test that a run failing after it streamed part of an answer still sends its error to the client.
+    """
+    class FailingAgent:
+        is_connected = True
+        
+        async def process_query_async(self, query, history=None, match=None, callback_handler=None, thread_id=None):
+            callback_handler.on_llm_new_token("Let me check")
+            return "Error processing query with agent: tool call failed"
+    
+    with patch("app.services.chatbot_services._chatbot_agent", FailingAgent()):
+        chunks = asyncio.run(collect_chatbot_stream("What should Jinx build?"))
+    
+    assert chunks[0] == "Let me check"
+    assert chunks[-1] == "Error processing query with agent: tool call failed"
+    assert len(chunks) == 3
+
+
+def test_chatbot_service_remembers_the_thread():
+    """
+    Test that a follow-up on the same thread_id gets the earlier turns as history.
+    """
+    class RecordingAgent:
+        is_connected = True
+        histories = []
+        
+        async def process_query_async(self, query, history=None, match=None, callback_handler=None, thread_id=None):
+            self.histories.append(history)
+            return f"Answer to {query}"
+    
+    agent = RecordingAgent()
+    thread_id = f"thread-{uuid.uuid4()}"
+    
+    async def ask(query):
+        return [
+            chunk async for chunk in handle_chatbot_request(
+                thread_id=thread_id, query=query, modelName="gemini-2.0-flash", match={}
+            )
+        ]
+    
+    with patch("app.services.chatbot_services._chatbot_agent", agent):
+        asyncio.run(ask("What should Jinx build?"))
+        asyncio.run(ask("And against tanks?"))
+    
+    assert agent.histories[0] == []
+    assert agent.histories[1] == [
+        {"role": "user", "content": "What should Jinx build?"},
+        {"role": "assistant", "content": "Answer to What should Jinx build?"},
+    ]
+
+
+def test_chatbot_service_answers_resource_uris_from_the_cache():
+    """
+    Test that a raw resource URI is answered from the resource cache without running the agent.
+    """
+    agent = make_chatbot_agent()
+    agent.mcp_client = MagicMock()
+    reads = []
+    
+    async def load(uri):
+        reads.append(uri)
+        return "420: Ranked Solo/Duo"
+    
+    agent.resource_cache = ResourceCache(load, registry=PatchRegistry("14.23"))
+    
+    with patch("app.services.chatbot_services._chatbot_agent", agent):
+        first = asyncio.run(collect_chatbot_stream("constants://queues"))
+        second = asyncio.run(collect_chatbot_stream("Show me constants://queues"))
+    
+    assert first == second == ["420: Ranked Solo/Duo"]
+    assert reads == ["constants://queues"]
+    assert metrics.get("chatbot.resource_answers") >= 2
+
+
+class FakeStreamingToolCallingModel(FakeToolCallingModel):
+    """Fake chat model that streams each canned response, tool calls included, as one chunk."""
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = next(self.messages)
+        tool_call_chunks = [
+            {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+            for index, call in enumerate(message.tool_calls)
+        ]
+        yield ChatGenerationChunk(message=AIMessageChunk(content=message.content, tool_call_chunks=tool_call_chunks))
+
+
+def test_chatbot_agent_resumes_thread_after_run_cancelled_mid_tool(tmp_path):
+    """
+    Test that a thread whose run was cancelled during a tool call still answers the next query.
+    """
+    @tool
+    async def slow_build_lookup(champion: str) -> str:
+        """Look up a champion build slowly."""
+        await asyncio.sleep(60)
+        return "Infinity Edge"
+    
+    with patch("app.agents.chatbot_agent.ChatGoogleGenerativeAI"):
+        agent = ChatbotAgent()
+    agent.checkpointer = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.sqlite"))
+    model = FakeStreamingToolCallingModel(messages=iter([
+        AIMessage(content="Checking", tool_calls=[{"name": "slow_build_lookup", "args": {"champion": "jinx"}, "id": "call-1"}]),
+        AIMessage(content="Build Infinity Edge"),
+    ]))
+    agent.agent = create_react_agent(model=model, tools=[slow_build_lookup], prompt="test", checkpointer=agent.checkpointer)
+    agent.is_connected = True
+    
+    async def cancel_then_ask_again():
+        run = asyncio.create_task(agent.process_query_async("What should Jinx build?", match={}, thread_id="thread-1"))
+        await asyncio.sleep(0.3)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        answer = await agent.process_query_async("And now?", match={}, thread_id="thread-1")
+        state = await agent.agent.aget_state({"configurable": {"thread_id": "thread-1"}})
+        return answer, state.values["messages"]
+    
+    try:
+        answer, messages = asyncio.run(cancel_then_ask_again())
+    finally:
+        agent.checkpointer.close()
+    
+    assert answer == "Build Infinity Edge"
+    tool_results = [message for message in messages if isinstance(message, ToolMessage)]
+    assert [message.tool_call_id for message in tool_results] == ["call-1"]
+    assert "cancelled" in tool_results[0].content
+
+
+def test_resumed_thread_resolves_match_aliases_on_another_worker(tmp_path):
+    """
+    Test that a thread resumed by another agent instance still resolves the player aliases of its match.
+    """
+    path = str(tmp_path / "checkpoints.sqlite")
+    aliases = encode_match(match_data).aliases
+    resolved = []
+    
+    @tool
+    async def get_summoner_by_puuid(puuid: str) -> str:
+        """Look up a summoner by PUUID."""
+        resolved.append(resolve_aliases({"puuid": puuid})["puuid"])
+        return "Summoner found"
+    
+    def make_worker(*responses):
+        with patch("app.agents.chatbot_agent.ChatGoogleGenerativeAI"):
+            agent = ChatbotAgent()
+        agent.checkpointer = SQLiteCheckpointSaver(path)
+        model = FakeStreamingToolCallingModel(messages=iter(responses))
+        agent.agent = create_react_agent(
+            model=model, tools=[get_summoner_by_puuid], prompt="test",
+            state_schema=ChatbotState, checkpointer=agent.checkpointer
+        )
+        agent.is_connected = True
+        return agent
+    
+    first = make_worker(AIMessage(content="R2 is on the red side"))
+    asyncio.run(first.process_query_async("Who is R2?", match=match_data, thread_id="thread-1"))
+    first.checkpointer.close()
+    
+    second = make_worker(
+        AIMessage(content="Looking up R2", tool_calls=[{"name": "get_summoner_by_puuid", "args": {"puuid": "R2"}, "id": "call-1"}]),
+        AIMessage(content="R2 is level 30"),
+    )
+    try:
+        answer = asyncio.run(second.process_query_async("What level is R2?", match={}, thread_id="thread-1"))
+    finally:
+        second.checkpointer.close()
+    
+    assert answer == "R2 is level 30"
+    assert resolved == [aliases["R2"]]
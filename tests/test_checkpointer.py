@@ -0,0 +1,79 @@
+import asyncio
+import sqlite3
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.prebuilt import create_react_agent
+from app.utils.checkpointer import SQLiteCheckpointSaver
+
+
+class FakeToolCallingModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def make_agent(checkpointer, *responses):
+    model = FakeToolCallingModel(messages=iter([AIMessage(content=r) for r in responses]))
+    return create_react_agent(model=model, tools=[], prompt="test", checkpointer=checkpointer)
+
+
+def test_thread_state_survives_a_restart(tmp_path):
+    """
+    Test that a thread resumed by a new saver on the same database has the earlier messages.
+    """
+    path = str(tmp_path / "checkpoints.sqlite")
+    config = {"configurable": {"thread_id": "thread-1"}}
+
+    saver = SQLiteCheckpointSaver(path)
+    agent = make_agent(saver, "Build Infinity Edge first", "Add Lord Dominik's Regards")
+    asyncio.run(agent.ainvoke({"messages": [HumanMessage("What should Jinx build?")]}, config))
+    asyncio.run(agent.ainvoke({"messages": [HumanMessage("And against tanks?")]}, config))
+    saver.close()
+
+    restarted = SQLiteCheckpointSaver(path)
+    state = make_agent(restarted).get_state(config)
+    restarted.close()
+
+    assert [message.content for message in state.values["messages"]] == [
+        "What should Jinx build?", "Build Infinity Edge first",
+        "And against tanks?", "Add Lord Dominik's Regards",
+    ]
+
+
+def test_old_checkpoints_are_compacted(tmp_path):
+    """
+    Test that only the newest checkpoints of a thread are kept in memory and in the database.
+    """
+    path = str(tmp_path / "checkpoints.sqlite")
+    config = {"configurable": {"thread_id": "thread-1"}}
+
+    saver = SQLiteCheckpointSaver(path, keep_checkpoints=2)
+    agent = make_agent(saver, "one", "two", "three")
+    for query in ("a", "b", "c"):
+        asyncio.run(agent.ainvoke({"messages": [HumanMessage(query)]}, config))
+    saver.flush()
+
+    stored = sqlite3.connect(path).execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+    assert stored == 2
+    assert len(saver.storage["thread-1"][""]) == 2
+    assert len(agent.get_state(config).values["messages"]) == 6
+    saver.close()
+
+
+def test_threads_written_by_another_process_are_reloaded(tmp_path):
+    """
+    Test that a saver picks up a newer checkpoint written to the shared database by another saver.
+    """
+    path = str(tmp_path / "checkpoints.sqlite")
+    config = {"configurable": {"thread_id": "thread-1"}}
+    first, second = SQLiteCheckpointSaver(path), SQLiteCheckpointSaver(path)
+
+    asyncio.run(make_agent(first, "one").ainvoke({"messages": [HumanMessage("a")]}, config))
+    first.flush()
+    assert len(make_agent(second).get_state(config).values["messages"]) == 2
+
+    asyncio.run(make_agent(first, "two").ainvoke({"messages": [HumanMessage("b")]}, config))
+    first.flush()
+    assert len(make_agent(second).get_state(config).values["messages"]) == 4
+
+    first.close()
+    second.close()
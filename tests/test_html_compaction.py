@@ -0,0 +1,46 @@
+from app.utils.html_compaction import compact_html
+from app.utils.tokens import count_tokens, truncate_to_tokens
+
+
+def test_compact_html_keeps_text_and_table_structure():
+    """
+    Test that compaction drops markup noise but keeps item names and table rows.
+    """
+    html = """
+    <section class="css-1 e1" data-key="items">
+        <style>.css-1 { color: red; }</style>
+        <script>window.__DATA__ = {};</script>
+        <h3 class="title">Core Builds</h3>
+        <svg viewBox="0 0 10 10"><path d="M0 0"/></svg>
+        <table class="css-2">
+            <tr><th>Items</th><th>Pick Rate</th><th>Win Rate</th></tr>
+            <tr>
+                <td><img src="/a.png" alt="Yun Tal Wildarrows"><img src="/b.png" alt="Infinity Edge"></td>
+                <td><strong>34.19%</strong> <span>15,044</span></td>
+                <td>60.58%</td>
+            </tr>
+        </table>
+    </section>
+    """
+
+    compact = compact_html(html)
+
+    assert compact == (
+        "Core Builds\n"
+        "Items | Pick Rate | Win Rate\n"
+        "[Yun Tal Wildarrows] [Infinity Edge] | 34.19% 15,044 | 60.58%"
+    )
+    assert count_tokens(compact) < count_tokens(html) / 3
+
+
+def test_truncate_to_tokens_caps_prompt_size():
+    """
+    Test that text over the token cap is cut down to fit it.
+    """
+    text = "Infinity Edge 60.58% " * 500
+
+    truncated = truncate_to_tokens(text, 100)
+
+    assert count_tokens(truncated) <= 100
+    assert text.startswith(truncated)
+    assert truncate_to_tokens("short", 100) == "short"
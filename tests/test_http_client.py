@@ -0,0 +1,48 @@
+import asyncio
+import httpx
+from app.utils.http_client import ManagedHTTPClient
+
+
+def make_transport(requests):
+    def handler(request):
+        requests.append(str(request.url))
+        return httpx.Response(200, text="<html>jinx</html>")
+    return httpx.MockTransport(handler)
+
+
+def test_http_client_is_shared_between_requests():
+    """
+    Test that requests on the same event loop reuse one underlying client.
+    """
+    requests = []
+    http = ManagedHTTPClient("test_shared", transport=make_transport(requests))
+
+    async def run():
+        first = http.get_client()
+        responses = await asyncio.gather(*(http.get(f"https://op.gg/lol/champions/{c}/build") for c in ("jinx", "ahri")))
+        second = http.get_client()
+        await http.aclose()
+        return first is second, [response.text for response in responses]
+
+    shared, texts = asyncio.run(run())
+
+    assert shared
+    assert texts == ["<html>jinx</html>"] * 2
+    assert len(requests) == 2
+
+
+def test_http_client_is_recreated_for_a_new_event_loop():
+    """
+    Test that a client bound to a finished event loop is replaced instead of reused.
+    """
+    http = ManagedHTTPClient("test_loops", transport=make_transport([]))
+
+    async def get_client():
+        return http.get_client()
+
+    first = asyncio.run(get_client())
+    second = asyncio.run(get_client())
+
+    assert first is not second
+    # Each client was closed before its event loop shut down
+    assert first.is_closed and second.is_closed
@@ -0,0 +1,80 @@
+import json
+
+from app.utils.formatters import match_data
+from app.utils.match_encoding import alias_puuids, encode_match, match_aliases, resolve_aliases
+
+
+def test_encoding_is_compact_and_resolves_names():
+    """
+    Test that the encoded match drops PUUIDs and raw ids and is a fraction of the payload size.
+    """
+    encoded = encode_match(match_data)
+
+    assert len(encoded.text) < len(json.dumps(match_data)) / 4
+    assert "B4 DοIphιn Ρμssy#MARA | Lux | Ignite/Flash | Arcane Comet (Sorcery/Domination)" in encoded.text
+    assert "The user is B4." in encoded.text
+    assert "Champion ID 141" in encoded.text
+    assert "perkIds" not in encoded.text
+    assert all(puuid not in encoded.text for puuid in encoded.aliases.values())
+    assert list(encoded.aliases) == ["B1", "B2", "B3", "B4", "B5", "R1", "R2", "R3", "R4", "R5"]
+
+
+def test_nested_layouts_encode_the_same():
+    """
+    Test that matches nested under 'match' or 'context.game' encode like the bare match.
+    """
+    text = encode_match(match_data).text
+
+    assert encode_match({"match": match_data}).text == text
+    assert encode_match({"context": {"game": match_data}}).text == text
+
+
+def test_aliases_round_trip_to_puuids():
+    """
+    Test that aliases in tool arguments resolve to PUUIDs and PUUIDs in tool output map back to aliases.
+    """
+    encoded = encode_match(match_data)
+    puuid = match_data["participants"][5]["puuid"]
+    token = match_aliases.set(encoded.aliases)
+    try:
+        arguments = resolve_aliases({"puuid": "R1", "region": "euw1", "puuids": ["B1", " R1 "]})
+        output = alias_puuids(f'{{"puuid": "{puuid}", "summonerLevel": 300}}')
+    finally:
+        match_aliases.reset(token)
+
+    assert arguments == {"puuid": puuid, "region": "euw1", "puuids": [encoded.aliases["B1"], puuid]}
+    assert output == '{"puuid": "R1", "summonerLevel": 300}'
+    assert resolve_aliases({"puuid": "R1"}) == {"puuid": "R1"}
+
+
+def test_match_v5_payload_includes_results_and_stats():
+    """
+    Test that post-game match-v5 payloads are encoded with team results and player stats.
+    """
+    match = {
+        "info": {
+            "gameMode": "CLASSIC",
+            "queueId": 420,
+            "gameDuration": 1865,
+            "platformId": "EUW1",
+            "participants": [
+                {
+                    "puuid": "puuid-blue", "teamId": 100, "riotIdGameName": "Blue", "riotIdTagline": "EUW",
+                    "championName": "Jinx", "teamPosition": "BOTTOM", "summoner1Id": 4, "summoner2Id": 7,
+                    "kills": 8, "deaths": 2, "assists": 5, "totalMinionsKilled": 210, "neutralMinionsKilled": 12,
+                    "goldEarned": 14250, "item0": 3031, "item1": 0,
+                    "perks": {"styles": [{"style": 8000, "selections": [{"perk": 8008}]}, {"style": 8300}]},
+                },
+                {"puuid": "puuid-red", "teamId": 200, "championName": "Caitlyn", "kills": 1, "deaths": 8, "assists": 2},
+            ],
+            "teams": [{"teamId": 100, "win": True}, {"teamId": 200, "win": False}],
+        }
+    }
+
+    text = encode_match(match).text
+
+    assert "CLASSIC Ranked Solo/Duo | 31:05 | EUW1" in text
+    assert "Blue side - won:" in text
+    assert ("B1 Blue#EUW | Jinx | BOTTOM | Flash/Heal | Lethal Tempo (Precision/Inspiration) | "
+            "8/2/5, 222 CS, 14,250 gold, items 3031") in text
+    assert "Red side - lost:" in text
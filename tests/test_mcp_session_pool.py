@@ -0,0 +1,158 @@
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from mcp.types import CallToolResult, TextContent
+from langchain_core.tools import ToolException
+from app.mcp.session_pool import MCPSessionPool, convert_call_tool_result
+from app.utils.metrics import metrics
+
+
+class FakeSession:
+    """Stand-in for an MCP ClientSession backed by a server process."""
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.alive = True
+
+    async def send_ping(self):
+        if not self.alive:
+            raise ConnectionError("server process exited")
+
+    async def call_tool(self, name, arguments):
+        if not self.alive:
+            raise ConnectionError("server process exited")
+        return CallToolResult(content=[TextContent(type="text", text=f"{name}:{self.session_id}")])
+
+
+class FakeMCPClient:
+    """Stand-in for MultiServerMCPClient that counts spawned sessions."""
+    def __init__(self):
+        self.sessions = []
+
+    @asynccontextmanager
+    async def session(self, server_name):
+        session = FakeSession(len(self.sessions) + 1)
+        self.sessions.append(session)
+        yield session
+
+
+def test_session_pool_reuses_sessions():
+    """
+    Test that checkouts reuse the pooled sessions instead of spawning new ones.
+    """
+    client = FakeMCPClient()
+
+    async def run():
+        pool = MCPSessionPool(client, "league-mcp", size=2, health_check_interval=0)
+        await pool.start()
+        for _ in range(5):
+            async with pool.session() as session:
+                await session.call_tool("get_featured_games", {})
+        await pool.close()
+
+    asyncio.run(run())
+
+    assert len(client.sessions) == 2
+
+
+def test_session_pool_respawns_crashed_session():
+    """
+    Test that a session whose server died is respawned before it is reused.
+    """
+    client = FakeMCPClient()
+    respawns_before = metrics.get("mcp_pool.respawns")
+
+    async def run():
+        pool = MCPSessionPool(client, "league-mcp", size=1, health_check_interval=0)
+        await pool.start()
+
+        client.sessions[0].alive = False
+        with pytest.raises(ConnectionError):
+            async with pool.session() as session:
+                await session.call_tool("get_featured_games", {})
+
+        async with pool.session() as session:
+            result = await session.call_tool("get_featured_games", {})
+        await pool.close()
+        return result
+
+    result = asyncio.run(run())
+
+    assert len(client.sessions) == 2
+    assert result.content[0].text == "get_featured_games:2"
+    assert metrics.get("mcp_pool.respawns") == respawns_before + 1
+
+
+def test_session_pool_serves_waiters_in_order():
+    """
+    Test that callers waiting for a session are served first come, first served.
+    """
+    client = FakeMCPClient()
+    served = []
+
+    async def run():
+        pool = MCPSessionPool(client, "league-mcp", size=1, health_check_interval=0)
+        await pool.start()
+
+        async def call(caller):
+            async with pool.session():
+                served.append(caller)
+                await asyncio.sleep(0.01)
+
+        async with pool.session():
+            waiters = [asyncio.create_task(call(i)) for i in range(4)]
+            await asyncio.sleep(0.01)
+        await asyncio.gather(*waiters)
+        await pool.close()
+
+    asyncio.run(run())
+
+    assert served == [0, 1, 2, 3]
+
+
+def test_session_pool_checks_cancelled_sessions_and_drops_them_once_closed():
+    """
+    Test that a session whose call was cancelled is checked before reuse and that sessions checked out during close are not returned.
+    """
+    client = FakeMCPClient()
+    slots = []
+
+    async def run():
+        pool = MCPSessionPool(client, "league-mcp", size=1, health_check_interval=0)
+        await pool.start()
+        slots.extend(pool._slots)
+
+        async def slow_call():
+            async with pool.session():
+                await asyncio.sleep(60)
+
+        call = asyncio.create_task(slow_call())
+        await asyncio.sleep(0.01)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        needs_check = slots[0].needs_check
+
+        # Closing the pool while a session is checked out must not fail the caller
+        async with pool.session():
+            await pool.close()
+        return needs_check
+
+    needs_check = asyncio.run(run())
+
+    assert needs_check
+    assert len(client.sessions) == 1
+
+
+def test_call_tool_results_are_converted_locally():
+    """
+    Test that MCP tool results become LangChain content and artifacts, and that failed calls raise.
+    """
+    single = CallToolResult(content=[TextContent(type="text", text="one")])
+    several = CallToolResult(content=[TextContent(type="text", text="one"), TextContent(type="text", text="two")])
+    failed = CallToolResult(content=[TextContent(type="text", text="boom")], isError=True)
+
+    assert convert_call_tool_result(single) == ("one", None)
+    assert convert_call_tool_result(several) == (["one", "two"], None)
+    assert convert_call_tool_result(CallToolResult(content=[])) == ("", None)
+    with pytest.raises(ToolException):
+        convert_call_tool_result(failed)
@@ -0,0 +1,116 @@
+import asyncio
+
+from app.mcp import builds_mcp
+from app.models.builds import ChampionBuild, ItemBuildOption
+from app.utils.name_resolver import NameResolver, build_champion_resolver, build_item_resolver, resolve_champion
+from app.utils.static_data import StaticData, build_static_data, static_data_store
+
+CHAMPIONS = [
+    ("MonkeyKing", "Wukong"), ("Nunu", "Nunu & Willump"), ("Renata", "Renata Glasc"), ("Kaisa", "Kai'Sa"),
+    ("Yasuo", "Yasuo"), ("Yone", "Yone"), ("Jinx", "Jinx"), ("Jax", "Jax"), ("Caitlyn", "Caitlyn"),
+    ("MissFortune", "Miss Fortune"), ("TwistedFate", "Twisted Fate"), ("Mordekaiser", "Mordekaiser"),
+    ("Morgana", "Morgana"), ("Leblanc", "LeBlanc"), ("Chogath", "Cho'Gath"), ("KogMaw", "Kog'Maw"),
+    ("Khazix", "Kha'Zix"), ("Vi", "Vi"), ("MasterYi", "Master Yi"), ("Ahri", "Ahri"), ("Akali", "Akali"),
+]
+
+DDRAGON = {
+    "champions": {"data": {
+        champion_id: {"id": champion_id, "key": str(key), "name": name}
+        for key, (champion_id, name) in enumerate(CHAMPIONS, start=1)
+    }},
+    "items": {"data": {"3031": {"name": "Infinity Edge"}, "3153": {"name": "Blade of The Ruined King"}}},
+    "runes": [],
+    "spells": {"data": {}},
+}
+
+
+def make_static_data():
+    return StaticData.from_payload(build_static_data("14.23.1", DDRAGON))
+
+
+def test_resolves_names_aliases_and_typos():
+    """
+    Test that display names, Data Dragon ids, nicknames and typos resolve to OP.GG slugs with confidence scores.
+    """
+    resolver = build_champion_resolver(make_static_data())
+
+    for spelling, slug in [
+        ("Nunu & Willump", "nunu"), ("Wukong", "monkeyking"), ("MonkeyKing", "monkeyking"),
+        ("Renata Glasc", "renata"), ("kai'sa", "kaisa"), ("MF", "missfortune"), ("Cho Gath", "chogath"),
+    ]:
+        resolution = resolver.resolve(spelling)
+        assert (resolution.key, resolution.exact) == (slug, True), spelling
+
+    for spelling, slug in [("yasou", "yasuo"), ("jinxx", "jinx"), ("leblank", "leblanc"), ("mordekai", "mordekaiser"),
+                           ("twisted fat", "twistedfate")]:
+        resolution = resolver.resolve(spelling)
+        assert resolution.key == slug, spelling
+        assert 0.8 <= resolution.confidence < 1.0
+
+    assert resolver.resolve("Notachampion") is None
+    assert resolver.resolve("") is None
+    # Ambiguous prefixes are not resolved, but both names are offered
+    assert resolver.resolve("mor") is None
+    assert {candidate.key for candidate in resolver.candidates("mor", limit=2)} == {"morgana", "mordekaiser"}
+
+
+def test_aliases_resolve_without_static_data():
+    """
+    Test that the tricky champion names resolve from the built-in aliases when there is no Data Dragon snapshot.
+    """
+    resolver = build_champion_resolver(None)
+
+    assert resolver.resolve("Nunu & Willump").key == "nunu"
+    assert resolver.resolve("Wukong").key == "monkeyking"
+    assert resolver.resolve("Renata Glasc").key == "renata"
+    assert resolve_champion("jinx") is None
+
+
+def test_item_resolver_and_custom_entries():
+    """
+    Test that items resolve to their ids and resolvers work over any entries.
+    """
+    items = build_item_resolver(make_static_data())
+    assert items.resolve("blade of the ruined king").key == "3153"
+    assert items.resolve("infinty edge").key == "3031"
+
+    resolver = NameResolver([("a", "Alpha", ["first"]), ("b", "Beta", [])])
+    assert len(resolver) == 2
+    assert resolver.resolve("FIRST").name == "Alpha"
+
+
+def test_builds_tools_suggest_close_champions():
+    """
+    Test that the builds tools resolve misspelled champions and suggest names for unknown ones without scraping.
+    """
+    static_data_store.use(make_static_data())
+    try:
+        assert builds_mcp.normalize_champion_name("Nunu & Willump") == "nunu"
+        assert builds_mcp.normalize_champion_name("yasou") == "yasuo"
+        result = asyncio.run(builds_mcp.get_champion_stats("Akalli Prime"))
+    finally:
+        static_data_store.use(None)
+
+    assert result == "Unknown champion 'Akalli Prime'. Did you mean Akali?"
+
+
+def test_llm_build_items_get_ids_from_the_item_resolver():
+    """
+    Test that build options extracted by the LLM fallback get their item ids when every item name resolves.
+    """
+    build = ChampionBuild(
+        champion="jinx", source="gemini",
+        core_items=[ItemBuildOption(items=["Infinty Edge", "blade of the ruined king"], pick_rate=30.0, win_rate=52.0)],
+        situational_items=[ItemBuildOption(items=["Infinity Edge", "Mystery Item"], pick_rate=5.0, win_rate=50.0)],
+    )
+
+    static_data_store.use(make_static_data())
+    try:
+        resolved = builds_mcp.resolve_build_items(build)
+    finally:
+        static_data_store.use(None)
+
+    assert resolved.core_items[0].items == ["Infinity Edge", "Blade of The Ruined King"]
+    assert resolved.core_items[0].item_ids == [3031, 3153]
+    # Options with an unknown item keep the names as extracted, without ids
+    assert resolved.situational_items[0] == build.situational_items[0]
@@ -0,0 +1,70 @@
+from app.mcp.opgg_parser import is_confident_build, parse_champion_build_html, parse_page_regions
+
+
+def item_row(items, pick_rate, games, win_rate):
+    images = "".join(f'<img src="/item.png" alt="{item}">' for item in items)
+    return f"<tr><td>{images}</td><td><strong>{pick_rate}%</strong><span>{games} Games</span></td><td>{win_rate}%</td></tr>"
+
+
+def item_table(caption, rows):
+    return (
+        f"<table><caption>{caption}</caption>"
+        "<thead><tr><th>Items</th><th>Pick Rate</th><th>Win Rate</th></tr></thead>"
+        f"<tbody>{''.join(rows)}</tbody></table>"
+    )
+
+
+JINX_BUILD_PAGE = "<div id='content-container'><section>" + "".join([
+    item_table("Starter Items", [item_row(["Doran's Blade", "Health Potion"], "88.12", "40,312", "51.02")]),
+    item_table("Core Builds", [
+        item_row(["Yun Tal Wildarrows", "Infinity Edge", "Rapid Firecannon"], "18.40", "8,102", "55.31"),
+        item_row(["Yun Tal Wildarrows", "Infinity Edge", "Phantom Dancer"], "34.19", "15,044", "60.58"),
+    ]),
+    item_table("Boots", [item_row(["Berserker's Greaves"], "89.70", "39,210", "52.40")]),
+    item_table("Last Item", [item_row(["Bloodthirster"], "12.01", "2,210", "63.10")]),
+]) + "</section></div>"
+
+
+def test_parser_extracts_item_build_tables():
+    """
+    Test that item build tables are parsed into typed options, most popular first.
+    """
+    build = parse_champion_build_html(JINX_BUILD_PAGE, "jinx")
+
+    assert [option.items[-1] for option in build.core_items] == ["Phantom Dancer", "Rapid Firecannon"]
+    assert build.core_items[0].pick_rate == 34.19
+    assert build.core_items[0].win_rate == 60.58
+    assert build.core_items[0].games == 15044
+    assert build.boots[0].items == ["Berserker's Greaves"]
+    assert build.starter_items[0].items == ["Doran's Blade", "Health Potion"]
+    assert build.situational_items[0].items == ["Bloodthirster"]
+    assert is_confident_build(build)
+
+
+def test_parser_is_not_confident_without_tables():
+    """
+    Test that a page without recognisable item tables fails the confidence check.
+    """
+    build = parse_champion_build_html("<section><a href='/items'>Item builds</a></section>", "jinx")
+
+    assert build.core_items == []
+    assert not is_confident_build(build)
+
+
+def test_page_parse_is_scoped_to_content_regions():
+    """
+    Test that only the title and content regions of a page are parsed.
+    """
+    html = (
+        "<html><head><script>window.__DATA__ = {}</script></head><body>"
+        "<nav>Champions Tier List</nav><h1>Jinx</h1>"
+        f"<div id='content-container'>{JINX_BUILD_PAGE}</div>"
+        "<footer>Win rate 99.99%</footer></body></html>"
+    )
+
+    soup = parse_page_regions(html)
+
+    assert soup.find('nav') is None
+    assert soup.find('footer') is None
+    assert soup.find('h1').get_text() == "Jinx"
+    assert len(soup.find_all('table')) == 4
@@ -0,0 +1,90 @@
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
+from app.mcp import builds_mcp
+from app.mcp.opgg_benchmark import fixture_transport
+from tests.helpers import OPGG_FIXTURES_DIR
+from app.mcp.patch_registry import PatchRegistry, normalize_patch
+from app.utils.http_client import ManagedHTTPClient
+
+
+def test_normalize_patch_accepts_opgg_and_ddragon_versions():
+    """
+    Test that OP.GG and Data Dragon version strings reduce to the same patch.
+    """
+    assert normalize_patch("Version: 14.23") == "14.23"
+    assert normalize_patch("14.23.1") == "14.23"
+    assert normalize_patch("no version") is None
+
+
+def test_patch_registry_only_rolls_forward():
+    """
+    Test that listeners run for newer patches only, not for the first or an older patch.
+    """
+    registry = PatchRegistry()
+    rollovers = []
+    registry.on_rollover(lambda previous, current: rollovers.append((previous, current)))
+
+    registry.observe("14.23.1", source="ddragon")
+    registry.observe("Version: 14.22")
+    registry.observe("14.24.1", source="ddragon")
+    registry.observe("Version: 14.24")
+
+    assert rollovers == [("14.23", "14.24")]
+    assert registry.current == "14.24"
+    assert registry.is_outdated("14.23")
+
+
+def test_rollover_invalidates_old_patch_and_rewarms_popular_champions(monkeypatch):
+    """
+    Test that a rollover drops the old patch's entries and re-fetches popular champions.
+    """
+    monkeypatch.setattr(builds_mcp, "opgg_http", ManagedHTTPClient("opgg_fixtures", transport=fixture_transport(OPGG_FIXTURES_DIR)))
+    monkeypatch.setattr(builds_mcp.patch_registry, "current", None)
+    monkeypatch.setattr(builds_mcp.patch_registry, "_lookups", Counter())
+    for cache in (builds_mcp.page_cache, builds_mcp.build_cache, builds_mcp.stats_cache):
+        cache.clear()
+
+    async def run():
+        await builds_mcp.get_champion_stats("jinx")
+        await builds_mcp.get_champion_stats("jinx")
+        old_keys = builds_mcp.stats_cache.keys()
+
+        builds_mcp.patch_registry.observe("14.24.1", source="ddragon")
+        assert builds_mcp.stats_cache.keys() == []
+        await asyncio.gather(*builds_mcp._rewarm_tasks)
+        return old_keys, builds_mcp.stats_cache.keys()
+
+    old_keys, new_keys = asyncio.run(run())
+
+    # The first lookup happens before the patch is known
+    assert old_keys == [("unknown", "jinx"), ("14.23", "jinx")]
+    assert new_keys == [("14.24", "jinx")]
+
+
+def test_rewarm_refreshes_stale_entries_with_their_own_fetcher(monkeypatch):
+    """
+    Test that a stale build refreshed in the background by a rewarm is refetched as a build, not as stats.
+    """
+    async def fetch_build(champion):
+        return SimpleNamespace(kind="build", patch=None)
+
+    async def fetch_stats(champion):
+        return SimpleNamespace(kind="stats", patch=None)
+
+    monkeypatch.setattr(builds_mcp, "fetch_champion_build", fetch_build)
+    monkeypatch.setattr(builds_mcp, "fetch_champion_stats", fetch_stats)
+    monkeypatch.setattr(builds_mcp.patch_registry, "popular_champions", lambda limit: ["jinx"])
+    for cache in (builds_mcp.build_cache, builds_mcp.stats_cache):
+        cache.clear()
+    key = builds_mcp.patch_registry.cache_key("jinx")
+    builds_mcp.build_cache.set(key, SimpleNamespace(kind="old build", patch=None), ttl=-1)
+
+    async def run():
+        await builds_mcp.rewarm_popular_champions()
+        await asyncio.gather(*builds_mcp.build_cache._refresh_tasks)
+
+    asyncio.run(run())
+
+    assert builds_mcp.build_cache.get(key).kind == "build"
+    assert builds_mcp.stats_cache.get(key).kind == "stats"
@@ -0,0 +1,105 @@
+import asyncio
+
+from app import main
+from app.mcp import resource_cache
+from app.mcp.patch_registry import PatchRegistry, patch_registry
+from app.mcp.resource_cache import ResourceCache, ResourceNotFoundError, find_resource_uri
+
+
+class CountingLoader:
+    def __init__(self, contents):
+        self.contents = contents
+        self.reads = []
+
+    async def __call__(self, uri):
+        self.reads.append(uri)
+        await asyncio.sleep(0.01)
+        return self.contents.get(uri)
+
+
+def test_resources_are_read_once_per_patch():
+    """
+    Test that concurrent and repeated reads of a resource share one MCP read until the patch changes.
+    """
+    loader = CountingLoader({"constants://queues": "420: Ranked Solo/Duo"})
+    registry = PatchRegistry("14.23")
+    cache = ResourceCache(loader, registry=registry)
+
+    async def read_twice_concurrently():
+        return await asyncio.gather(cache.get("constants://queues"), cache.get("constants://queues"))
+
+    assert asyncio.run(read_twice_concurrently()) == ["420: Ranked Solo/Duo"] * 2
+    assert asyncio.run(cache.get("constants://queues")) == "420: Ranked Solo/Duo"
+    assert loader.reads == ["constants://queues"]
+
+    registry.observe("14.24.1", source="ddragon")
+    assert cache.invalidate_outdated(registry.current) == 1
+    assert cache.cached("constants://queues") is None
+    asyncio.run(cache.get("constants://queues"))
+    assert loader.reads == ["constants://queues"] * 2
+    cache.close()
+
+
+def test_preload_reports_missing_resources_without_caching_them():
+    """
+    Test that preloading caches the resources that exist and reports the ones that do not.
+    """
+    loader = CountingLoader({"ddragon://items": "{...items...}"})
+    cache = ResourceCache(loader, registry=PatchRegistry("14.23"))
+
+    errors = asyncio.run(cache.preload(["ddragon://items", "ddragon://champion_data"]))
+
+    assert cache.cached("ddragon://items") == "{...items...}"
+    assert list(errors) == ["ddragon://champion_data"]
+    try:
+        asyncio.run(cache.get("ddragon://champion_data"))
+        assert False, "expected ResourceNotFoundError"
+    except ResourceNotFoundError:
+        pass
+    assert loader.reads.count("ddragon://champion_data") == 2
+    cache.close()
+
+
+def test_find_resource_uri():
+    """
+    Test that resource URIs are found anywhere in a query.
+    """
+    assert find_resource_uri("Show me ddragon://champions please") == "ddragon://champions"
+    assert find_resource_uri("constants://ranked_tiers") == "constants://ranked_tiers"
+    assert find_resource_uri("What should Jinx build?") is None
+
+
+def test_periodic_patch_refresh_preloads_resources_again(monkeypatch):
+    """
+    Test that a patch released while the app runs is picked up and the static resources are preloaded for it.
+    """
+    monkeypatch.setattr(patch_registry, "current", "14.23")
+    monkeypatch.setattr(patch_registry, "_listeners", [resource_cache._on_patch_rollover])
+    monkeypatch.setattr(main.settings, "STATIC_DATA_AUTO_SYNC", True)
+    versions = iter(["14.23.1", "14.24.1"])
+    synced = []
+
+    async def refresh_from_ddragon():
+        patch_registry.observe(next(versions), source="ddragon")
+        return patch_registry.current
+
+    async def sync_if_outdated(patch):
+        synced.append(patch)
+
+    monkeypatch.setattr(patch_registry, "refresh_from_ddragon", refresh_from_ddragon)
+    monkeypatch.setattr(main.static_data_store, "sync_if_outdated", sync_if_outdated)
+    loader = CountingLoader({"constants://queues": "420: Ranked Solo/Duo"})
+
+    async def run():
+        cache = ResourceCache(loader)
+        await cache.preload(["constants://queues"])
+        refresh = asyncio.create_task(main.refresh_patch_periodically(0.01))
+        while patch_registry.current != "14.24" or cache.cached("constants://queues") is None:
+            await asyncio.sleep(0.01)
+        refresh.cancel()
+        cache.close()
+
+    asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+    assert loader.reads.count("constants://queues") == 2
+    assert synced == ["14.24"]
@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from app.utils.metrics import metrics
+from app.utils.singleflight import SingleFlight
+
+
+def test_singleflight_coalesces_concurrent_calls():
+    """
+    Test that concurrent calls for the same key share a single execution.
+    """
+    flight = SingleFlight("test_coalesce")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "jinx build"
+
+    async def run():
+        return await asyncio.gather(*(flight.do("jinx", fetch) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["jinx build"] * 5
+    assert len(calls) == 1
+    assert len(flight) == 0
+    assert metrics.get("singleflight.test_coalesce.coalescing_ratio") == pytest.approx(0.8)
+
+
+def test_singleflight_fans_out_errors():
+    """
+    Test that an error raised by the shared execution reaches every waiter.
+    """
+    flight = SingleFlight("test_errors")
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("OP.GG unavailable")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("jinx", fetch) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert len(results) == 3
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_singleflight_survives_cancelled_waiter():
+    """
+    Test that cancelling one waiter does not cancel the execution for the others.
+    """
+    flight = SingleFlight("test_cancel")
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "jinx build"
+
+    async def run():
+        first = asyncio.create_task(flight.do("jinx", fetch))
+        second = asyncio.create_task(flight.do("jinx", fetch))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "jinx build"
@@ -0,0 +1,129 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.mcp import builds_mcp
+from app.utils.formatters import match_data
+from app.utils.match_encoding import encode_match
+from app.utils.static_data import (
+    StaticData, StaticDataStore, build_static_data, fetch_champion_slugs, fetch_static_data, static_data_store,
+    write_static_data
+)
+
+DDRAGON = {
+    "champions": {"data": {
+        "MonkeyKing": {"id": "MonkeyKing", "key": "62", "name": "Wukong"},
+        "Nunu": {"id": "Nunu", "key": "20", "name": "Nunu & Willump"},
+        "Kaisa": {"id": "Kaisa", "key": "145", "name": "Kai'Sa"},
+        "Ahri": {"id": "Ahri", "key": "103", "name": "Ahri"},
+        "Lux": {"id": "Lux", "key": "99", "name": "Lux"},
+    }},
+    "items": {"data": {"3031": {"name": "Infinity Edge"}, "6672": {"name": "Kraken Slayer"}}},
+    "runes": [{"id": 8200, "name": "Sorcery", "slots": [{"runes": [{"id": 8229, "name": "Arcane Comet"}]}]}],
+    "spells": {"data": {"SummonerFlash": {"key": "4", "name": "Flash"}, "SummonerDot": {"key": "14", "name": "Ignite"}}},
+}
+
+
+def make_static_data(version="14.23.1"):
+    return StaticData.from_payload(build_static_data(version, DDRAGON))
+
+
+def test_indexes_resolve_ids_and_names():
+    """
+    Test that ids resolve to names and display names or Data Dragon ids resolve to champion keys and slugs.
+    """
+    data = make_static_data()
+
+    assert data.champion_name(62) == "Wukong"
+    assert data.champion_name("20") == "Nunu & Willump"
+    assert data.champion_name(238) is None
+    assert data.champion_slug("wukong") == "monkeyking"
+    assert data.champion_slug("MonkeyKing") == "monkeyking"
+    assert data.champion_slug("Nunu & Willump") == "nunu"
+    assert data.champion_slug("kaisa") == "kaisa"
+    assert data.item_name(3031) == "Infinity Edge"
+    assert data.item_id("infinity edge") == 3031
+    assert data.rune_name(8229) == "Arcane Comet"
+    assert data.spell_name("14") == "Ignite"
+    assert data.spell_id("Flash") == 4
+    with pytest.raises(TypeError):
+        data.items[1] = "read-only"
+
+
+def test_store_reloads_replaced_snapshot(tmp_path):
+    """
+    Test that the store serves the snapshot file and picks up a replaced file.
+    """
+    path = str(tmp_path / "ddragon_static.json")
+    store = StaticDataStore(path, check_interval=0)
+    assert store.current() is None
+
+    write_static_data(path, build_static_data("14.22.1", DDRAGON))
+    assert store.current().version == "14.22.1"
+
+    payload = build_static_data("14.23.1", DDRAGON)
+    write_static_data(path, payload)
+    store._mtime = None  # Same-second rewrites can keep the mtime
+    assert store.current().version == "14.23.1"
+    assert asyncio.run(store.sync_if_outdated("14.23")).version == "14.23.1"
+
+
+def test_match_encoding_names_bans_and_items():
+    """
+    Test that the match encoding names champions from Data Dragon and falls back to ids it does not know.
+    """
+    text = encode_match(match_data, make_static_data()).text
+
+    assert "Blue bans: Champion ID 141, Champion ID 76, Champion ID 68, Champion ID 11, Champion ID 777" in text
+    assert "Red bans: Champion ID 134, Champion ID 119, Champion ID 555, Champion ID 84, Champion ID 114" in text
+
+    match = {"participants": [{"puuid": "p", "teamId": 100, "championId": 103, "item0": 6672}],
+             "bannedChampions": [{"teamId": 200, "championId": 62}]}
+    text = encode_match(match, make_static_data()).text
+
+    assert "B1 Unknown | Ahri" in text
+    assert "Red bans: Wukong" in text
+
+
+def test_builds_tools_use_static_data():
+    """
+    Test that the builds tools map display names to OP.GG slugs and reject unknown champions without scraping.
+    """
+    static_data_store.use(make_static_data())
+    try:
+        assert builds_mcp.normalize_champion_name("Wukong") == "monkeyking"
+        assert builds_mcp.champions_in_match({"participants": [{"championId": 62}, {"championName": "Lux"}]}) == ["Wukong", "Lux"]
+        # Riot match-v5 payloads keep the participants under 'info'
+        assert builds_mcp.champions_in_match({"metadata": {}, "info": {"participants": [{"championId": 99}]}}) == ["Lux"]
+        result = asyncio.run(builds_mcp.get_champion_build("Notachampion"))
+    finally:
+        static_data_store.use(None)
+
+    assert result == "Unknown champion 'Notachampion'. Please check the champion name and try again."
+    assert builds_mcp.normalize_champion_name("Jinx") == "jinx"
+
+
+def test_fetches_snapshot_and_champion_slugs_from_data_dragon():
+    """
+    Test that the snapshot and the champion slugs are built from the latest Data Dragon version's files.
+    """
+    files = {"champion.json": DDRAGON["champions"], "item.json": DDRAGON["items"],
+             "runesReforged.json": DDRAGON["runes"], "summoner.json": DDRAGON["spells"]}
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.path)
+        if request.url.path == "/api/versions.json":
+            return httpx.Response(200, json=["14.23.1", "14.22.1"])
+        return httpx.Response(200, json=files[request.url.path.rsplit("/", 1)[-1]])
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_static_data(client=client), await fetch_champion_slugs(client=client)
+
+    payload, slugs = asyncio.run(run())
+
+    assert StaticData.from_payload(payload).version == "14.23.1"
+    assert slugs == ["ahri", "kaisa", "lux", "monkeyking", "nunu"]
+    assert "/cdn/14.23.1/data/en_US/champion.json" in requested
@@ -0,0 +1,106 @@
+import threading
+import time
+
+from app.utils.thread_store import ThreadStore, ToolResult, Turn
+
+
+def make_turn(i):
+    return Turn(
+        query=f"Question {i} about Jinx builds. Please explain in detail.",
+        answer=f"Answer {i}: build Infinity Edge. " + "More reasoning follows here. " * 20,
+    )
+
+
+def test_history_keeps_recent_turns_and_summarizes_older_ones():
+    """
+    Test that history fits the token budget, keeping the newest turns verbatim and summarizing the rest.
+    """
+    store = ThreadStore()
+    for i in range(10):
+        store.append_turn("thread", make_turn(i))
+
+    history = store.history("thread", max_tokens=800)
+
+    assert history[0]["content"].startswith("Summary of the earlier conversation:")
+    assert "- User: Question 0 about Jinx builds. | Assistant: Answer 0: build Infinity Edge." in history[0]["content"]
+    assert history[-2] == {"role": "user", "content": make_turn(9).query}
+    assert history[-1]["content"] == make_turn(9).answer
+    assert len(history) < 21
+    assert store.history("other-thread", max_tokens=800) == []
+
+
+def test_tool_results_are_kept_with_their_answer():
+    """
+    Test that tool results are replayed in front of the answer that used them.
+    """
+    store = ThreadStore(max_tool_result_tokens=5)
+    store.append_turn("thread", Turn("Jinx build?", "Go Infinity Edge.", [
+        ToolResult("champion_build_tool", '{"champion": "jinx"}', "Jinx build | patch 14.23 | OP.GG " * 10)
+    ]))
+
+    answer = store.history("thread", max_tokens=1000)[1]["content"]
+
+    assert answer.startswith('[champion_build_tool result for {"champion": "jinx"}]\nJinx build')
+    assert answer.endswith("Go Infinity Edge.")
+    assert len(answer) < 120
+
+
+def test_threads_persist_to_sqlite_and_are_capped(tmp_path):
+    """
+    Test that turns survive a restart through SQLite and only the newest ones are kept.
+    """
+    path = str(tmp_path / "threads.sqlite")
+    store = ThreadStore(max_turns=3, db_path=path)
+    for i in range(5):
+        store.append_turn("thread", make_turn(i))
+    store.close()
+
+    reopened = ThreadStore(max_turns=3, db_path=path)
+    assert [turn.query for turn in reopened.get_turns("thread")] == [make_turn(i).query for i in (2, 3, 4)]
+    reopened.close()
+
+
+def test_queued_turns_are_read_back_after_eviction(tmp_path):
+    """
+    Test that a thread evicted from memory is reloaded with turns the writer thread has not written yet.
+    """
+    store = ThreadStore(max_threads=1, db_path=str(tmp_path / "threads.sqlite"))
+    store.append_turn("first", make_turn(0))
+    store.append_turn("second", make_turn(1))
+    store.clear("second")
+
+    assert [turn.query for turn in store.get_turns("first")] == [make_turn(0).query]
+    assert store.get_turns("second") == []
+    store.close()
+    # Appending after close keeps the turn in memory only
+    store.append_turn("first", make_turn(2))
+    assert [turn.query for turn in store.get_turns("first")] == [make_turn(2).query]
+
+
+def test_loading_a_thread_only_waits_for_its_own_writes(tmp_path):
+    """
+    Test that reloading an evicted thread does not wait for other threads' queued writes.
+    """
+    store = ThreadStore(max_threads=1, db_path=str(tmp_path / "threads.sqlite"))
+    store.append_turn("idle", make_turn(0))
+    store.flush()
+
+    release = threading.Event()
+    apply = store._apply
+
+    def slow_apply(connection, kind, row):
+        if row[0] == "busy":
+            release.wait(5)
+        apply(connection, kind, row)
+
+    store._apply = slow_apply
+    store.append_turn("busy", make_turn(1))
+
+    started = time.monotonic()
+    turns = store.get_turns("idle")
+    waited = time.monotonic() - started
+    release.set()
+    store.close()
+
+    assert [turn.query for turn in turns] == [make_turn(0).query]
+    assert waited < 1
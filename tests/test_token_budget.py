@@ -0,0 +1,70 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from app.utils.metrics import metrics
+from app.utils.token_budget import PromptBudget, measure_prompt
+from app.utils.tokens import count_message_tokens
+
+
+def make_prompt():
+    return [
+        SystemMessage("You are a League of Legends assistant."),
+        HumanMessage("What should Jinx build? I play bot lane."),
+        AIMessage("", tool_calls=[{"name": "champion_build_tool", "args": {"champion": "jinx"}, "id": "1"}]),
+        ToolMessage("Jinx build data. " * 400, tool_call_id="1"),
+        AIMessage("Build Infinity Edge first. Then Phantom Dancer."),
+        HumanMessage("And what about Caitlyn? She is my duo."),
+        AIMessage("Caitlyn rushes Infinity Edge too. Then Rapid Firecannon."),
+        HumanMessage("CURRENT MATCH CONTEXT:\n" + "Player line. " * 100 + "\nUSER QUERY: What about tanks?"),
+    ]
+
+
+def test_prompt_components_are_measured():
+    """
+    Test that each prompt component is counted and recorded per stage.
+    """
+    calls_before = metrics.get("tokens.measure-test.calls")
+    usage = measure_prompt(make_prompt())
+
+    assert usage["system"] > 0 and usage["history"] > usage["match"] > usage["query"] > 0
+    assert usage["tools"] == 0
+
+    PromptBudget("measure-test", max_tokens=100000).fit(make_prompt())
+    assert metrics.get("tokens.measure-test.calls") == calls_before + 1
+    assert metrics.get("tokens.measure-test.last_prompt") == sum(usage.values())
+
+
+def test_prompt_within_budget_is_untouched():
+    """
+    Test that a prompt that fits the budget is returned as is.
+    """
+    prompt = make_prompt()
+    assert PromptBudget("test", max_tokens=100000).fit(prompt) == prompt
+
+
+def test_old_tool_results_are_trimmed_first():
+    """
+    Test that old tool results are cut before any conversation turn is dropped.
+    """
+    prompt = make_prompt()
+    budget = sum(count_message_tokens(message) for message in prompt) - 500
+
+    fitted = PromptBudget("test", max_tokens=budget, max_tool_result_tokens=200).fit(prompt)
+
+    assert len(fitted) == len(prompt)
+    assert fitted[3].content.endswith("[truncated to fit the prompt budget]")
+    assert sum(count_message_tokens(message) for message in fitted) <= budget
+
+
+def test_old_turns_are_summarized_when_still_over_budget():
+    """
+    Test that the oldest turns are replaced by a summary and the system prompt and query are kept.
+    """
+    prompt = make_prompt()
+    budget = 400
+
+    fitted = PromptBudget("test", max_tokens=budget, max_tool_result_tokens=200).fit(prompt)
+
+    assert fitted[0] == prompt[0]
+    assert fitted[1].content.startswith("Summary of the earlier conversation:")
+    assert "- User: What should Jinx build? | Assistant: Build Infinity Edge first. (used champion_build_tool)" in fitted[1].content
+    assert fitted[-1].content.endswith("USER QUERY: What about tanks?")
+    assert sum(count_message_tokens(message) for message in fitted) <= budget